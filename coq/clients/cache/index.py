@@ -0,0 +1,120 @@
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import (
+    Iterable,
+    List,
+    MutableMapping,
+    MutableSequence,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from ...shared.fuzzy import char_mask, quick_ratio
+from ...shared.parse import lower
+from ...shared.settings import Options
+from ...shared.sql import BIGGEST_INT
+
+_MAX_CHAR = chr(0x10FFFF)
+
+
+@dataclass(frozen=True)
+class _Entry:
+    lword: str
+    word: str
+    lmask: int
+
+
+@dataclass(frozen=True)
+class _Narrowed:
+    word: str
+    survivors: Sequence[_Entry]
+
+
+def _mask_ok(entry: _Entry, word: str, mask: int, cut_off: float) -> bool:
+    """
+    Bail out early, if `entry` is missing too many of the chars in `word`
+    """
+
+    missing = mask & ~entry.lmask
+    tolerance = len(word) * (1 - cut_off)
+    if len(entry.word) < len(word) or not missing:
+        return True
+    elif tolerance <= 1:
+        return False
+    elif not missing & (missing - 1):
+        return True
+    else:
+        return tolerance > 2
+
+
+class Index:
+    """
+    Cached words, sorted by their lower case
+
+    Candidates of a query are kept, a query that extends it only rescans those
+    """
+
+    def __init__(self) -> None:
+        self._sorted: List[Tuple[str, str]] = []
+        self._entries: MutableMapping[str, _Entry] = {}
+        self._narrowed: Optional[_Narrowed] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._sorted.clear()
+        self._entries.clear()
+        self._narrowed = None
+
+    def insert(self, words: Iterable[str]) -> None:
+        new = {word for word in words if word not in self._entries}
+        for word in new:
+            lword = lower(word)
+            self._entries[word] = _Entry(lword=lword, word=word, lmask=char_mask(lword))
+            self._sorted.append((lword, word))
+        if new:
+            self._sorted.sort()
+            self._narrowed = None
+
+    def _candidates(self, prefix: str, word: str) -> Iterable[_Entry]:
+        narrowed = self._narrowed
+        if narrowed and word.startswith(narrowed.word):
+            return narrowed.survivors
+        else:
+            lo = bisect_left(self._sorted, (prefix,))
+            hi = bisect_left(self._sorted, (prefix + _MAX_CHAR,))
+            return (self._entries[w] for _, w in self._sorted[lo:hi])
+
+    def select(self, opts: Options, word: str, limitless: bool) -> Sequence[str]:
+        if not word:
+            return ()
+        else:
+            lword = lower(word)
+            prefix, mask = lword[: opts.exact_matches], char_mask(lword)
+            limit = BIGGEST_INT if limitless else opts.max_results
+
+            # only conditions that can not pass again for a longer `word`
+            survivors = [
+                entry
+                for entry in self._candidates(prefix, word=word)
+                if entry.word
+                and entry.lword.startswith(prefix)
+                and len(entry.word) + opts.look_ahead >= len(word)
+                and entry.word not in word
+            ]
+            self._narrowed = _Narrowed(word=word, survivors=survivors)
+
+            acc: MutableSequence[str] = []
+            for entry in survivors:
+                if len(acc) >= limit:
+                    break
+                elif _mask_ok(
+                    entry, word=word, mask=mask, cut_off=opts.fuzzy_cutoff
+                ) and (
+                    quick_ratio(lword, entry.lword, look_ahead=opts.look_ahead)
+                    > opts.fuzzy_cutoff
+                ):
+                    acc.append(entry.word)
+            return acc
@@ -1,2 +0,0 @@
-PRAGMA foreign_keys = ON;
-
@@ -1 +0,0 @@
-DELETE FROM words
@@ -1,3 +0,0 @@
-INSERT OR REPLACE INTO words ( word, lword)
-VALUES                       (:word, LOWER(:word))
-
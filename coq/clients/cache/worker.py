@@ -5,7 +5,7 @@ from uuid import UUID, uuid4
 from ...shared.runtime import Supervisor
 from ...shared.timeit import timeit
 from ...shared.types import Completion, Context, Edit, SnippetEdit
-from .database import Database
+from .index import Index
 
 
 @dataclass(frozen=True)
@@ -41,7 +41,7 @@ def sanitize_cached(comp: Completion) -> Completion:
 class CacheWorker:
     def __init__(self, supervisor: Supervisor) -> None:
         self._soup = supervisor
-        self._db = Database(supervisor.pool)
+        self._index = Index()
         self._cache_ctx = _CacheCtx(
             change_id=uuid4(),
             commit_id=uuid4(),
@@ -51,11 +51,11 @@ class CacheWorker:
         )
         self._cached: MutableMapping[str, Completion] = {}
 
-    def _use_cache(
+    def use_cache(
         self, context: Context
     ) -> Tuple[
         bool,
-        Awaitable[Iterator[Completion]],
+        Callable[[], Awaitable[Iterator[Completion]]],
         Callable[[Sequence[Completion]], Awaitable[None]],
     ]:
         cache_ctx = self._cache_ctx
@@ -70,22 +70,20 @@ class CacheWorker:
         use_cache = _use_cache(cache_ctx, ctx=context) and bool(self._cached)
         if not use_cache:
             self._cached.clear()
+            self._index.clear()
 
         async def get() -> Iterator[Completion]:
             with timeit("CACHE -- GET"):
                 match = context.words_before or context.syms_before
-                words = await self._db.select(
-                    not use_cache,
-                    options=self._soup.options,
-                    word=match,
-                    limitless=context.manual,
+                words = self._index.select(
+                    self._soup.options, word=match, limitless=context.manual
                 )
                 comps = (self._cached.get(sort_by) for sort_by in words)
                 return (sanitize_cached(c) for c in comps if c)
 
         async def set(completions: Sequence[Completion]) -> None:
             new_comps = {c.sort_by: c for c in completions}
-            await self._db.insert(new_comps.keys())
+            self._index.insert(new_comps.keys())
             self._cached.update(new_comps)
 
-        return use_cache, get(), set
+        return use_cache, get, set
@@ -1,16 +1,30 @@
 from asyncio import as_completed, gather
+from collections import deque
 from enum import Enum, auto
 from itertools import chain
-from typing import AsyncIterator, Iterator, MutableSequence, Optional, Tuple
+from time import perf_counter
+from typing import (
+    AbstractSet,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Iterator,
+    Mapping,
+    MutableMapping,
+    MutableSequence,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 from std2 import anext
-from std2.aitertools import to_async
 from std2.asyncio import pure
 from std2.itertools import chunk
 
 from ...lsp.requests.completion import request
 from ...lsp.types import LSPcomp
-from ...shared.fuzzy import multi_set_ratio
+from ...shared.fuzzy import FuzzyMemo, multi_set_ratio
 from ...shared.parse import is_word, lower
 from ...shared.runtime import Supervisor
 from ...shared.runtime import Worker as BaseWorker
@@ -19,6 +33,8 @@ from ...shared.sql import BIGGEST_INT
 from ...shared.types import Completion, Context
 from ..cache.worker import CacheWorker, sanitize_cached
 
+_SAMPLES = 100
+
 
 class _Src(Enum):
     from_db = auto()
@@ -26,46 +42,112 @@ class _Src(Enum):
     from_query = auto()
 
 
-class Worker(BaseWorker[LSPClient, None], CacheWorker):
+_Setter = Callable[[Sequence[Completion]], Awaitable[None]]
+
+
+class Worker(BaseWorker[LSPClient, None]):
+    """
+    Each language server gets its own cache
+
+    Every server is asked, unless its cache is still fresh
+    """
+
     def __init__(self, supervisor: Supervisor, options: LSPClient, misc: None) -> None:
-        self._local_cached: MutableSequence[Iterator[Completion]] = []
-        CacheWorker.__init__(self, supervisor=supervisor)
+        self._local_cached: MutableMapping[
+            str, MutableSequence[Iterator[Completion]]
+        ] = {}
+        self._caches: MutableMapping[str, CacheWorker] = {}
+        self._latencies: MutableMapping[str, Deque[float]] = {}
+        self._memo = FuzzyMemo(look_ahead=supervisor.options.look_ahead)
         BaseWorker.__init__(self, supervisor=supervisor, options=options, misc=misc)
 
+    def latencies(self) -> Mapping[str, Sequence[float]]:
+        """
+        Per language server, seconds until its reply arrived
+        """
+
+        return self._latencies
+
     async def work(self, context: Context) -> AsyncIterator[Optional[Completion]]:
+        options = self._supervisor.options
         w_before, sw_before = lower(context.words_before), lower(context.syms_before)
-        limit = BIGGEST_INT if context.manual else self._supervisor.options.max_results
+        limit = BIGGEST_INT if context.manual else options.max_results
+        self._memo.generation(context.change_id)
+
+        def keep(sort_by: str) -> bool:
+            cword = (
+                w_before
+                if is_word(sort_by[:1], unifying_chars=options.unifying_chars)
+                else sw_before
+            )
 
-        use_cache, cached, set_cache = self._use_cache(context)
-        if not use_cache:
-            self._local_cached.clear()
+            def pred() -> bool:
+                ratio = multi_set_ratio(
+                    cword, lower(sort_by), look_ahead=options.look_ahead
+                )
+                return (
+                    ratio >= options.fuzzy_cutoff
+                    and len(sort_by) + options.look_ahead >= len(cword)
+                    and not cword.startswith(sort_by)
+                )
 
-        async def cached_iters() -> Tuple[_Src, LSPcomp]:
-            items = map(sanitize_cached, chain(*self._local_cached))
-            self._local_cached.clear()
-            return _Src.from_stored, LSPcomp(local_cache=True, items=items)
+            # keyed on the raw `sort_by`, as `pred` is case sensitive
+            return self._memo.keep(cword, sort_by, pred=pred)
+
+        caches = {
+            client: cache.use_cache(context) for client, cache in self._caches.items()
+        }
+        fresh = {client for client, (use_cache, _, __) in caches.items() if use_cache}
+        for client in caches.keys() - fresh:
+            self._local_cached.pop(client, None)
+
+        def track(client: str) -> _Setter:
+            # every server that replied gets a cache, even if it is left empty
+            if client not in caches:
+                cache = self._caches[client] = CacheWorker(self._supervisor)
+                caches[client] = cache.use_cache(context)
+            _, __, setter = caches[client]
+            return setter
+
+        async def cached_iters(client: str) -> Tuple[_Src, LSPcomp]:
+            items = map(sanitize_cached, chain(*self._local_cached.pop(client, ())))
+            return _Src.from_stored, LSPcomp(
+                local_cache=True, items=items, client=client
+            )
 
-        async def cached_db_items() -> Tuple[_Src, LSPcomp]:
-            items = await cached
-            return _Src.from_db, LSPcomp(local_cache=False, items=items)
+        async def cached_db_items(client: str) -> Tuple[_Src, LSPcomp]:
+            _, get, __ = caches[client]
+            items = await get()
+            return _Src.from_db, LSPcomp(local_cache=False, items=items, client=client)
+
+        async def timed(skip: AbstractSet[str]) -> AsyncIterator[LSPcomp]:
+            t1 = perf_counter()
+            async for lc in request(
+                self._supervisor.nvim,
+                short_name=self._options.short_name,
+                weight_adjust=self._options.weight_adjust,
+                keep=keep,
+                limit=limit,
+                trim_payload=self._options.trim_payload,
+                prefilter=self._options.prefilter,
+                skip=skip,
+                context=context,
+            ):
+                if lc.client is not None:
+                    latencies = self._latencies.setdefault(
+                        lc.client, deque(maxlen=_SAMPLES)
+                    )
+                    latencies.append(perf_counter() - t1)
+                yield lc
 
         async def stream() -> AsyncIterator[Tuple[_Src, LSPcomp]]:
-            do_ask = context.manual or not use_cache
-            stream = (
-                request(
-                    self._supervisor.nvim,
-                    short_name=self._options.short_name,
-                    weight_adjust=self._options.weight_adjust,
-                    context=context,
-                )
-                if do_ask
-                else to_async(())
-            )
+            # servers without a cache, ie. that never replied, are asked too
+            stream = timed(frozenset() if context.manual else fresh)
 
             for fut in as_completed(
                 (
-                    cached_iters(),
-                    cached_db_items(),
+                    *map(cached_iters, tuple(self._local_cached)),
+                    *map(cached_db_items, tuple(caches)),
                     gather(
                         pure(_Src.from_query),
                         anext(stream, LSPcomp(local_cache=False, items=iter(()))),
@@ -79,43 +161,37 @@ class Worker(BaseWorker[LSPClient, None], CacheWorker):
 
         seen = 0
         async for src, lsp_comps in stream():
-            if lsp_comps.local_cache:
-                self._local_cached.append(lsp_comps.items)
+            if lsp_comps.client is not None:
+                track(lsp_comps.client)
 
-            for chunked in chunk(
-                lsp_comps.items, n=self._supervisor.options.max_results
-            ):
+            cache_as: Optional[str] = (
+                lsp_comps.client if lsp_comps.local_cache else None
+            )
+            if cache_as is not None:
+                self._local_cached.setdefault(cache_as, []).extend(
+                    (lsp_comps.items, lsp_comps.rest)
+                )
+
+            for chunked in chunk(lsp_comps.items, n=options.max_results):
                 if seen <= limit:
                     if src is _Src.from_db:
                         for c in chunked:
                             yield c
                             seen += 1
                     else:
+                        # query results already passed `keep` before being parsed
                         for c in chunked:
-                            if c.primary_edit.new_text:
-                                cword = (
-                                    w_before
-                                    if is_word(
-                                        c.sort_by[:1],
-                                        unifying_chars=self._supervisor.options.unifying_chars,
-                                    )
-                                    else sw_before
-                                )
-                                ratio = multi_set_ratio(
-                                    cword,
-                                    lower(c.sort_by),
-                                    look_ahead=self._supervisor.options.look_ahead,
-                                )
-                                if (
-                                    ratio >= self._supervisor.options.fuzzy_cutoff
-                                    and len(c.sort_by)
-                                    + self._supervisor.options.look_ahead
-                                    >= len(cword)
-                                    and not cword.startswith(c.sort_by)
-                                ):
-                                    yield c
-                                    seen += 1
-
-                if lsp_comps.local_cache and chunked:
-                    await set_cache(chunked)
+                            if c.primary_edit.new_text and (
+                                src is _Src.from_query or keep(c.sort_by)
+                            ):
+                                yield c
+                                seen += 1
+
+                if cache_as is not None and chunked:
+                    await track(cache_as)(chunked)
+                    yield None
+
+            if cache_as is not None:
+                for chunked in chunk(lsp_comps.rest, n=options.max_results):
+                    await track(cache_as)(chunked)
                     yield None
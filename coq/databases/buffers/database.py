@@ -1,20 +1,28 @@
-from asyncio import CancelledError
-from concurrent.futures import Executor
+from collections import Counter
+from itertools import count
 from sqlite3 import Connection, OperationalError
 from sqlite3.dbapi2 import Cursor
 from threading import Lock
-from typing import AbstractSet, Iterator, Mapping, Optional, Sequence, Tuple
-from uuid import uuid4
+from typing import (
+    AbstractSet,
+    Iterable,
+    Iterator,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Protocol,
+    Sequence,
+    Tuple,
+)
 
-from std2.asyncio import run_in_executor
 from std2.sqlite3 import with_transaction
 
 from ...consts import BUFFER_DB, DEBUG
-from ...shared.executor import SingleThreadExecutor
+from ...shared.executor import Lane, SingleThreadExecutor
 from ...shared.parse import coalesce
+from ...shared.rope import Rope
 from ...shared.settings import Options
-from ...shared.sql import BIGGEST_INT, init_db
-from ...shared.timeit import timeit
+from ...shared.sql import BIGGEST_INT, Readers, db_uris, init_db
 from .sql import sql
 
 
@@ -33,23 +41,53 @@ def _ensure_buffer(cursor: Cursor, buf_id: int, filetype: str) -> None:
         )
 
 
-def _init() -> Connection:
-    conn = Connection(BUFFER_DB, isolation_level=None)
+def _init(uri: str) -> Connection:
+    conn = Connection(uri, uri=True, isolation_level=None)
     init_db(conn)
     conn.executescript(sql("create", "pragma"))
     conn.executescript(sql("create", "tables"))
     return conn
 
 
-class BDB:
-    def __init__(self, pool: Executor) -> None:
-        self._lock = Lock()
-        self._ex = SingleThreadExecutor(pool)
-        self._conn: Connection = self._ex.submit(_init)
+class BDB(Protocol):
+    async def vacuum(self, buf_ids: AbstractSet[int]) -> None:
+        ...
 
-    def _interrupt(self) -> None:
-        with self._lock:
-            self._conn.interrupt()
+    async def del_bufs(self, buf_ids: AbstractSet[int]) -> None:
+        ...
+
+    async def ft_update(self, buf_id: int, filetype: str) -> None:
+        ...
+
+    async def set_lines(
+        self,
+        buf_id: int,
+        filetype: str,
+        lo: int,
+        hi: int,
+        lines: Sequence[str],
+        unifying_chars: AbstractSet[str],
+    ) -> None:
+        ...
+
+    def lines(self, buf_id: int, lo: int, hi: int) -> Tuple[int, Iterator[str]]:
+        ...
+
+    async def words(
+        self, opts: Options, filetype: Optional[str], word: str, limitless: int
+    ) -> Iterator[str]:
+        ...
+
+
+class SQLBDB(BDB):
+    def __init__(self) -> None:
+        writer, reader = db_uris(BUFFER_DB)
+        self._lock = Lock()
+        self._ex = SingleThreadExecutor()
+        self._conn: Connection = self._ex.submit(_init, writer)
+        self._readers = Readers(reader)
+        self._ropes: MutableMapping[int, Rope[int]] = {}
+        self._line_ids = count()
 
     async def vacuum(self, buf_ids: AbstractSet[int]) -> None:
         def cont() -> None:
@@ -57,36 +95,40 @@ class BDB:
                 with with_transaction(self._conn.cursor()) as cursor:
                     cursor.execute(sql("select", "buffers"), ())
                     existing = {row["rowid"] for row in cursor.fetchall()}
-                    cursor.execute(
+                    cursor.executemany(
                         sql("delete", "buffers"),
                         ({"buf_id": buf_id} for buf_id in existing - buf_ids),
                     )
-                    cursor.execute(sql("delete", "buffers"), ())
+                    cursor.execute(sql("delete", "words"), ())
+                    for buf_id in existing - buf_ids:
+                        self._ropes.pop(buf_id, None)
             except OperationalError:
                 pass
 
-        await run_in_executor(self._ex.submit, cont)
+        await self._ex.run(cont, lane=Lane.background)
 
     async def del_bufs(self, buf_ids: AbstractSet[int]) -> None:
         def cont() -> None:
             try:
                 with with_transaction(self._conn.cursor()) as cursor:
-                    cursor.execute(
+                    cursor.executemany(
                         sql("delete", "buffers"),
                         ({"buf_id": buf_id} for buf_id in buf_ids),
                     )
-                    cursor.execute(sql("delete", "buffers"), ())
+                    cursor.execute(sql("delete", "words"), ())
+                    for buf_id in buf_ids:
+                        self._ropes.pop(buf_id, None)
             except OperationalError:
                 pass
 
-        await run_in_executor(self._ex.submit, cont)
+        await self._ex.run(cont, lane=Lane.background)
 
     async def ft_update(self, buf_id: int, filetype: str) -> None:
         def cont() -> None:
             with self._lock, with_transaction(self._conn.cursor()) as cursor:
                 _ensure_buffer(cursor, buf_id=buf_id, filetype=filetype)
 
-        await run_in_executor(self._ex.submit, cont)
+        await self._ex.run(cont, lane=Lane.background)
 
     async def set_lines(
         self,
@@ -97,78 +139,107 @@ class BDB:
         lines: Sequence[str],
         unifying_chars: AbstractSet[str],
     ) -> None:
-        def m0() -> Iterator[Tuple[int, str, bytes]]:
-            for line_num, line in enumerate(lines, start=lo):
-                line_id = uuid4().bytes
+        def m0() -> Iterator[Tuple[str, AbstractSet[str]]]:
+            for line in lines:
                 safe_line = line.encode(errors="ignore").decode(errors="ignore")
-                yield line_num, safe_line, line_id
+                words = {*coalesce(safe_line, unifying_chars=unifying_chars)}
+                yield safe_line, words
 
         line_info = tuple(m0())
+        counts = Counter(word for _, words in line_info for word in words)
 
-        def m1() -> Iterator[Mapping]:
-            for line_num, line, line_id in line_info:
+        def m1(line_ids: Sequence[int]) -> Iterator[Mapping]:
+            for line_id, (line, _) in zip(line_ids, line_info):
                 yield {
                     "rowid": line_id,
                     "buffer_id": buf_id,
-                    "line_num": line_num,
                     "line": line if DEBUG else "",
                 }
 
-        def m2() -> Iterator[Mapping]:
-            for line_num, line, line_id in line_info:
-                for word in coalesce(line, unifying_chars=unifying_chars):
-                    yield {"line_id": line_id, "word": word, "line_num": line_num}
+        def m2(line_ids: Sequence[int]) -> Iterator[Mapping]:
+            for line_id, (_, words) in zip(line_ids, line_info):
+                for word in words:
+                    yield {"line_id": line_id, "word": word}
+
+        def drop(cursor: Cursor, line_ids: Iterable[int]) -> None:
+            dead: Counter = Counter()
+            for line_id in line_ids:
+                cursor.execute(sql("select", "line_words"), {"line_id": line_id})
+                dead.update(row["word_id"] for row in cursor.fetchall())
+                cursor.execute(sql("delete", "lines"), {"rowid": line_id})
+
+            cursor.executemany(
+                sql("update", "count_by_id"),
+                (
+                    {"buffer_id": buf_id, "word_id": word_id, "delta": -n}
+                    for word_id, n in dead.items()
+                ),
+            )
+            cursor.executemany(
+                sql("delete", "buffer_words"),
+                ({"buffer_id": buf_id, "word_id": word_id} for word_id in dead),
+            )
+            cursor.executemany(
+                sql("delete", "word"), ({"word_id": word_id} for word_id in dead)
+            )
 
         def cont() -> None:
             with self._lock, with_transaction(self._conn.cursor()) as cursor:
                 _ensure_buffer(cursor, buf_id=buf_id, filetype=filetype)
-                cursor.execute(
-                    sql("delete", "lines"),
-                    {"buffer_id": buf_id, "lo": lo, "hi": hi},
+                rope = self._ropes.setdefault(buf_id, Rope())
+                end = hi if hi >= 0 else len(rope)
+                drop(cursor, line_ids=rope[lo:end])
+
+                line_ids = tuple(next(self._line_ids) for _ in line_info)
+                cursor.executemany(sql("insert", "line"), m1(line_ids))
+                cursor.executemany(
+                    sql("insert", "word"), ({"word": word} for word in counts)
+                )
+                cursor.executemany(
+                    sql("insert", "buffer_word"),
+                    ({"buffer_id": buf_id, "word": word} for word in counts),
                 )
-                shift = len(lines) - (hi - lo)
-                cursor.execute(
-                    sql("update", "lines"),
-                    {"buffer_id": buf_id, "lo": lo, "shift": shift},
+                cursor.executemany(
+                    sql("update", "count_by_word"),
+                    (
+                        {"buffer_id": buf_id, "word": word, "delta": n}
+                        for word, n in counts.items()
+                    ),
                 )
-                cursor.executemany(sql("insert", "line"), m1())
-                cursor.executemany(sql("insert", "word"), m2())
-                cursor.execute(sql("select", "line_count"), {"buffer_id": buf_id})
-                count = cursor.fetchone()["line_count"]
-                if not count:
+                cursor.executemany(sql("insert", "line_word"), m2(line_ids))
+                rope[lo:end] = line_ids
+                if not rope:
+                    line_id = next(self._line_ids)
                     cursor.execute(
                         sql("insert", "line"),
-                        {
-                            "rowid": uuid4().bytes,
-                            "line": "",
-                            "buffer_id": buf_id,
-                            "line_num": 0,
-                        },
+                        {"rowid": line_id, "line": "", "buffer_id": buf_id},
                     )
+                    rope[0:0] = (line_id,)
 
-        await run_in_executor(self._ex.submit, cont)
+        await self._ex.run(cont, lane=Lane.background)
 
     def lines(self, buf_id: int, lo: int, hi: int) -> Tuple[int, Iterator[str]]:
         def cont() -> Tuple[int, Iterator[str]]:
             with self._lock, with_transaction(self._conn.cursor()) as cursor:
-                cursor.execute(sql("select", "line_count"), {"buffer_id": buf_id})
-                count = cursor.fetchone()["line_count"]
-                cursor.execute(
-                    sql("select", "lines"),
-                    {"buffer_id": buf_id, "lo": lo, "hi": hi},
-                )
-                rows = cursor.fetchall()
-                lines = (row["line"] for row in rows)
-                return count, lines
+                rope = self._ropes.get(buf_id, Rope())
+                end = hi if hi > 0 else len(rope)
+
+                def c1() -> Iterator[str]:
+                    for line_id in rope[lo:end]:
+                        cursor.execute(sql("select", "lines"), {"rowid": line_id})
+                        row = cursor.fetchone()
+                        yield row["line"] if row else ""
+
+                return len(rope), iter(tuple(c1()))
 
         return self._ex.submit(cont)
 
     async def words(
         self, opts: Options, filetype: Optional[str], word: str, limitless: int
     ) -> Iterator[str]:
-        def cont() -> Iterator[str]:
+        def cont(conn: Connection) -> Iterator[str]:
             try:
-                with with_transaction(self._conn.cursor()) as cursor:
+                with with_transaction(conn.cursor()) as cursor:
                     cursor.execute(
                         sql("select", "words"),
                         {
@@ -185,13 +256,4 @@ class BDB:
             except OperationalError:
                 return iter(())
 
-        def step() -> Iterator[str]:
-            self._interrupt()
-            return self._ex.submit(cont)
-
-        try:
-            return await run_in_executor(step)
-        except CancelledError:
-            with timeit("INTERRUPT !! BUFFERS"):
-                await run_in_executor(self._interrupt)
-            raise
+        return await self._readers.run(cont)
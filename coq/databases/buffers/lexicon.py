@@ -0,0 +1,252 @@
+from bisect import bisect_left, insort
+from collections import Counter
+from dataclasses import dataclass
+from threading import Lock
+from typing import (
+    AbstractSet,
+    Iterator,
+    MutableMapping,
+    MutableSequence,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from ...consts import DEBUG
+from ...shared.executor import Lane, SingleThreadExecutor
+from ...shared.fuzzy import quick_ratio
+from ...shared.parse import coalesce, lower
+from ...shared.rope import Rope
+from ...shared.settings import Options
+from ...shared.sql import BIGGEST_INT
+from .database import BDB
+
+_MAX_CHAR = chr(0x10FFFF)
+
+
+@dataclass(frozen=True)
+class _Line:
+    line: str
+    words: AbstractSet[str]
+
+
+@dataclass
+class _Buf:
+    filetype: str
+    lines: Rope[_Line]
+    counts: Counter
+
+
+class Lexicon:
+    """
+    Sorted, interned lexicon of buffer words
+
+    Each word is reference counted per line within its buffer,
+    and per buffer within its filetype & overall,
+    so editing a line only touches the words on that line
+    """
+
+    def __init__(self) -> None:
+        self._bufs: MutableMapping[int, _Buf] = {}
+        self._counts: Counter = Counter()
+        self._ft_counts: MutableMapping[str, Counter] = {}
+        self._interned: MutableMapping[str, str] = {}
+        self._sorted: MutableSequence[Tuple[str, str]] = []
+
+    def _acquire(self, filetype: str, word: str) -> None:
+        self._ft_counts.setdefault(filetype, Counter())[word] += 1
+        self._counts[word] += 1
+        if self._counts[word] == 1:
+            insort(self._sorted, (lower(word), word))
+
+    def _release(self, filetype: str, word: str) -> None:
+        ft_counts = self._ft_counts.setdefault(filetype, Counter())
+        ft_counts[word] -= 1
+        if ft_counts[word] <= 0:
+            del ft_counts[word]
+        self._counts[word] -= 1
+        if self._counts[word] <= 0:
+            del self._counts[word]
+            self._interned.pop(word, None)
+            key = (lower(word), word)
+            idx = bisect_left(self._sorted, key)
+            if idx < len(self._sorted) and self._sorted[idx] == key:
+                del self._sorted[idx]
+
+    def _inc(self, buf: _Buf, words: AbstractSet[str]) -> None:
+        for word in words:
+            buf.counts[word] += 1
+            if buf.counts[word] == 1:
+                self._acquire(buf.filetype, word=word)
+
+    def _dec(self, buf: _Buf, words: AbstractSet[str]) -> None:
+        for word in words:
+            buf.counts[word] -= 1
+            if buf.counts[word] <= 0:
+                del buf.counts[word]
+                self._release(buf.filetype, word=word)
+
+    def _intern(self, words: AbstractSet[str]) -> AbstractSet[str]:
+        return frozenset(self._interned.setdefault(word, word) for word in words)
+
+    def _buf(self, buf_id: int, filetype: str) -> _Buf:
+        buf = self._bufs.get(buf_id)
+        if not buf:
+            buf = self._bufs[buf_id] = _Buf(
+                filetype=filetype, lines=Rope(), counts=Counter()
+            )
+        elif buf.filetype != filetype:
+            for word in buf.counts:
+                self._release(buf.filetype, word=word)
+                self._acquire(filetype, word=word)
+            buf.filetype = filetype
+        return buf
+
+    def retain(self, buf_ids: AbstractSet[int]) -> None:
+        self.drop(self._bufs.keys() - buf_ids)
+
+    def drop(self, buf_ids: AbstractSet[int]) -> None:
+        for buf_id in buf_ids:
+            buf = self._bufs.pop(buf_id, None)
+            if buf:
+                for word in buf.counts:
+                    self._release(buf.filetype, word=word)
+
+    def ft_update(self, buf_id: int, filetype: str) -> None:
+        self._buf(buf_id, filetype=filetype)
+
+    def set_lines(
+        self,
+        buf_id: int,
+        filetype: str,
+        lo: int,
+        hi: int,
+        lines: Sequence[str],
+        unifying_chars: AbstractSet[str],
+    ) -> None:
+        buf = self._buf(buf_id, filetype=filetype)
+        end = hi if hi >= 0 else len(buf.lines)
+
+        for line in buf.lines[lo:end]:
+            self._dec(buf, words=line.words)
+
+        def cont() -> Iterator[_Line]:
+            for line in lines:
+                words = self._intern({*coalesce(line, unifying_chars=unifying_chars)})
+                self._inc(buf, words=words)
+                yield _Line(line=line if DEBUG else "", words=words)
+
+        buf.lines[lo:end] = tuple(cont())
+        if not buf.lines:
+            buf.lines[0:0] = (_Line(line="", words=frozenset()),)
+
+    def lines(self, buf_id: int, lo: int, hi: int) -> Tuple[int, Sequence[str]]:
+        buf = self._bufs.get(buf_id)
+        if not buf:
+            return 0, ()
+        else:
+            end = hi if hi > 0 else len(buf.lines)
+            return len(buf.lines), tuple(line.line for line in buf.lines[lo:end])
+
+    def words(
+        self, opts: Options, filetype: Optional[str], word: str, limitless: int
+    ) -> Sequence[str]:
+        if not word:
+            return ()
+        else:
+            lword = lower(word)
+            prefix = lword[: opts.exact_matches]
+            lo = bisect_left(self._sorted, (prefix,))
+            hi = bisect_left(self._sorted, (prefix + _MAX_CHAR,))
+            ft_counts = (
+                self._ft_counts.get(filetype, Counter()) if filetype else None
+            )
+            limit = BIGGEST_INT if limitless else opts.max_results
+
+            acc: MutableSequence[str] = []
+            for idx in range(lo, hi):
+                if len(acc) >= limit:
+                    break
+                else:
+                    l_match, match = self._sorted[idx]
+                    if (
+                        match
+                        and len(match) + opts.look_ahead >= len(word)
+                        and (ft_counts is None or match in ft_counts)
+                        and match not in word
+                        and quick_ratio(lword, l_match, look_ahead=opts.look_ahead)
+                        > opts.fuzzy_cutoff
+                    ):
+                        acc.append(match)
+
+            return acc
+
+
+class LBDB(BDB):
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._ex = SingleThreadExecutor()
+        self._lex = Lexicon()
+
+    async def vacuum(self, buf_ids: AbstractSet[int]) -> None:
+        def cont() -> None:
+            with self._lock:
+                self._lex.retain(buf_ids)
+
+        await self._ex.run(cont, lane=Lane.background)
+
+    async def del_bufs(self, buf_ids: AbstractSet[int]) -> None:
+        def cont() -> None:
+            with self._lock:
+                self._lex.drop(buf_ids)
+
+        await self._ex.run(cont, lane=Lane.background)
+
+    async def ft_update(self, buf_id: int, filetype: str) -> None:
+        def cont() -> None:
+            with self._lock:
+                self._lex.ft_update(buf_id, filetype=filetype)
+
+        await self._ex.run(cont, lane=Lane.background)
+
+    async def set_lines(
+        self,
+        buf_id: int,
+        filetype: str,
+        lo: int,
+        hi: int,
+        lines: Sequence[str],
+        unifying_chars: AbstractSet[str],
+    ) -> None:
+        def cont() -> None:
+            with self._lock:
+                self._lex.set_lines(
+                    buf_id,
+                    filetype=filetype,
+                    lo=lo,
+                    hi=hi,
+                    lines=lines,
+                    unifying_chars=unifying_chars,
+                )
+
+        await self._ex.run(cont, lane=Lane.background)
+
+    def lines(self, buf_id: int, lo: int, hi: int) -> Tuple[int, Iterator[str]]:
+        def cont() -> Tuple[int, Iterator[str]]:
+            with self._lock:
+                count, lines = self._lex.lines(buf_id, lo=lo, hi=hi)
+                return count, iter(lines)
+
+        return self._ex.submit(cont)
+
+    async def words(
+        self, opts: Options, filetype: Optional[str], word: str, limitless: int
+    ) -> Iterator[str]:
+        def cont() -> Iterator[str]:
+            with self._lock:
+                words = self._lex.words(
+                    opts, filetype=filetype, word=word, limitless=limitless
+                )
+                return iter(words)
+
+        return await self._ex.run(cont)
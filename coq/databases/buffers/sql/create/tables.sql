@@ -9,26 +9,39 @@ CREATE INDEX IF NOT EXISTS buffers_filetype ON buffers (filetype);
 
 
 CREATE TABLE IF NOT EXISTS lines (
-  rowid     BLOB    NOT NULL PRIMARY KEY,
+  rowid     INTEGER NOT NULL PRIMARY KEY,
   buffer_id INTEGER NOT NULL REFERENCES buffers (rowid) ON UPDATE CASCADE ON DELETE CASCADE,
-  line_num  INTEGER NOT NULL,
   line      TEXT    NOT NULL
-  -- TODO -- How to update line_num from back -> front in a single query
-  -- UNIQUE(filename, line_num)
-) WITHOUT ROWID;
+);
 CREATE INDEX IF NOT EXISTS liness_buffer_id ON lines (buffer_id);
-CREATE INDEX IF NOT EXISTS lines_line_num   ON lines (line_num);
 
 
 CREATE TABLE IF NOT EXISTS words (
-  line_id BLOB NOT NULL REFERENCES lines (rowid) ON UPDATE CASCADE ON DELETE CASCADE,
-  word    TEXT NOT NULL,
-  lword   TEXT NOT NULL,
-  UNIQUE(line_id, word)
+  rowid   INTEGER NOT NULL PRIMARY KEY,
+  word    TEXT    NOT NULL UNIQUE,
+  lword   TEXT    NOT NULL,
+  lmask   INTEGER NOT NULL,
+  llen    INTEGER NOT NULL
 );
-CREATE INDEX IF NOT EXISTS words_line_id ON words (line_id);
-CREATE INDEX IF NOT EXISTS words_word    ON words (word);
-CREATE INDEX IF NOT EXISTS words_lword   ON words (lword);
+CREATE INDEX IF NOT EXISTS words_lword ON words (lword);
+
+
+-- word_id is deliberately not a foreign key:
+-- words are only collected once no line refers to them
+CREATE TABLE IF NOT EXISTS line_words (
+  line_id INTEGER NOT NULL REFERENCES lines (rowid) ON UPDATE CASCADE ON DELETE CASCADE,
+  word_id INTEGER NOT NULL,
+  PRIMARY KEY (line_id, word_id)
+) WITHOUT ROWID;
+
+
+CREATE TABLE IF NOT EXISTS buffer_words (
+  buffer_id INTEGER NOT NULL REFERENCES buffers (rowid) ON UPDATE CASCADE ON DELETE CASCADE,
+  word_id   INTEGER NOT NULL REFERENCES words   (rowid) ON UPDATE CASCADE ON DELETE CASCADE,
+  count     INTEGER NOT NULL,
+  PRIMARY KEY (buffer_id, word_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS buffer_words_word_id ON buffer_words (word_id);
 
 
 END;
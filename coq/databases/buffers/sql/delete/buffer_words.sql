@@ -0,0 +1,7 @@
+DELETE FROM buffer_words
+WHERE
+  buffer_id = :buffer_id
+  AND
+  word_id = :word_id
+  AND
+  count <= 0
@@ -0,0 +1,11 @@
+DELETE FROM words
+WHERE
+  rowid = :word_id
+  AND
+  NOT EXISTS (
+    SELECT
+      1
+    FROM buffer_words
+    WHERE
+      word_id = :word_id
+  )
@@ -0,0 +1,9 @@
+DELETE FROM words
+WHERE
+  NOT EXISTS (
+    SELECT
+      1
+    FROM buffer_words
+    WHERE
+      buffer_words.word_id = words.rowid
+  )
@@ -0,0 +1,8 @@
+INSERT OR IGNORE INTO buffer_words (buffer_id, word_id, count)
+SELECT
+  :buffer_id,
+  rowid,
+  0
+FROM words
+WHERE
+  word = :word
@@ -0,0 +1,7 @@
+INSERT OR IGNORE INTO line_words (line_id, word_id)
+SELECT
+  :line_id,
+  rowid
+FROM words
+WHERE
+  word = :word
@@ -1,2 +1,2 @@
-INSERT OR IGNORE INTO words ( line_id,  word, lword)
-VALUES                      (:line_id, :word, LOWER(:word))
+INSERT OR IGNORE INTO words ( word, lword,         lmask,                     llen)
+VALUES                      (:word, LOWER(:word), X_CHAR_MASK(LOWER(:word)), LENGTH(:word))
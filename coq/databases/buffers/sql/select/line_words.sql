@@ -0,0 +1,5 @@
+SELECT
+  word_id
+FROM line_words
+WHERE
+  line_id = :line_id
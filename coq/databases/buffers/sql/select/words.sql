@@ -1,25 +1,41 @@
-SELECT DISTINCT
+SELECT
   word
 FROM words
-JOIN lines
-ON lines.rowid = words.line_id
-JOIN buffers
-ON buffers.rowid = lines.buffer_id
 WHERE
-  CASE
-    WHEN :filetype <> NULL THEN buffers.filetype = :filetype
-    ELSE 1
-  END
-  AND
   :word <> ''
   AND
   word <> ''
   AND 
-  LENGTH(word) + :look_ahead >= LENGTH(:word)
+  llen + :look_ahead >= LENGTH(:word)
+  AND
+  lword >= SUBSTR(LOWER(:word), 1, :exact)
   AND
-  lword LIKE X_LIKE_ESC(SUBSTR(LOWER(:word), 1, :exact)) ESCAPE '!'
+  lword < SUBSTR(LOWER(:word), 1, :exact) || CHAR(1114111)
   AND
   NOT INSTR(:word, word)
   AND
+  CASE
+    WHEN llen < LENGTH(:word) THEN 1
+    WHEN (X_CHAR_MASK(LOWER(:word)) & ~lmask) = 0 THEN 1
+    WHEN LENGTH(:word) * (1 - :cut_off) <= 1 THEN 0
+    WHEN ((X_CHAR_MASK(LOWER(:word)) & ~lmask) & ((X_CHAR_MASK(LOWER(:word)) & ~lmask) - 1)) = 0 THEN 1
+    ELSE LENGTH(:word) * (1 - :cut_off) > 2
+  END
+  AND
   X_SIMILARITY(LOWER(:word), lword, :look_ahead) > :cut_off
+  AND
+  EXISTS (
+    SELECT
+      1
+    FROM buffer_words
+    JOIN buffers
+    ON buffers.rowid = buffer_words.buffer_id
+    WHERE
+      buffer_words.word_id = words.rowid
+      AND
+      CASE
+        WHEN :filetype IS NOT NULL THEN buffers.filetype = :filetype
+        ELSE 1
+      END
+  )
 LIMIT :limit
@@ -0,0 +1,7 @@
+UPDATE buffer_words
+SET
+  count = count + :delta
+WHERE
+  buffer_id = :buffer_id
+  AND
+  word_id = :word_id
@@ -1,18 +1,14 @@
-from asyncio.exceptions import CancelledError
-from concurrent.futures import Executor
 from dataclasses import dataclass
 from json import loads
 from sqlite3 import Connection, OperationalError
 from threading import Lock
 from typing import Iterator, Mapping, Optional
 
-from std2.asyncio import run_in_executor
 from std2.sqlite3 import with_transaction
 
 from ...consts import INSERT_DB
-from ...shared.executor import SingleThreadExecutor
-from ...shared.sql import init_db
-from ...shared.timeit import timeit
+from ...shared.executor import Lane, SingleThreadExecutor
+from ...shared.sql import Readers, db_uris, init_db
 from .sql import sql
 
 
@@ -33,8 +29,19 @@ class Statistics:
     q100_items: int
 
 
-def _init() -> Connection:
-    conn = Connection(INSERT_DB, isolation_level=None)
+@dataclass(frozen=True)
+class PumStatistics:
+    pums: int
+    refined: int
+
+    avg_first_result: float
+    q50_first_result: float
+    q95_first_result: float
+    q100_first_result: float
+
+
+def _init(uri: str) -> Connection:
+    conn = Connection(uri, uri=True, isolation_level=None)
     init_db(conn)
     conn.executescript(sql("create", "pragma"))
     conn.executescript(sql("create", "tables"))
@@ -42,14 +49,12 @@ def _init() -> Connection:
 
 
 class IDB:
-    def __init__(self, pool: Executor) -> None:
+    def __init__(self) -> None:
+        writer, reader = db_uris(INSERT_DB)
         self._lock = Lock()
-        self._ex = SingleThreadExecutor(pool)
-        self._conn: Connection = self._ex.submit(_init)
-
-    def _interrupt(self) -> None:
-        with self._lock:
-            self._conn.interrupt()
+        self._ex = SingleThreadExecutor()
+        self._conn: Connection = self._ex.submit(_init, writer)
+        self._readers = Readers(reader)
 
     def new_source(self, source: str) -> None:
         def cont() -> None:
@@ -63,7 +68,7 @@ class IDB:
             with self._lock, with_transaction(self._conn.cursor()) as cursor:
                 cursor.execute(sql("insert", "batch"), {"rowid": batch_id})
 
-        await run_in_executor(self._ex.submit, cont)
+        await self._ex.run(cont, lane=Lane.background)
 
     async def new_instance(self, instance: bytes, source: str, batch_id: bytes) -> None:
         def cont() -> None:
@@ -73,7 +78,7 @@ class IDB:
                     {"rowid": instance, "source_id": source, "batch_id": batch_id},
                 )
 
-        await run_in_executor(self._ex.submit, cont)
+        await self._ex.run(cont, lane=Lane.background)
 
     async def new_stat(
         self, instance: bytes, interrupted: bool, duration: float, items: int
@@ -90,12 +95,22 @@ class IDB:
                     },
                 )
 
-        await run_in_executor(self._ex.submit, cont)
+        await self._ex.run(cont, lane=Lane.background)
+
+    async def new_pum_stat(self, first_result: float, refined: bool) -> None:
+        def cont() -> None:
+            with self._lock, with_transaction(self._conn.cursor()) as cursor:
+                cursor.execute(
+                    sql("insert", "pum_stat"),
+                    {"first_result": first_result, "refined": refined},
+                )
+
+        await self._ex.run(cont, lane=Lane.background)
 
     async def insertion_order(self, n_rows: int) -> Mapping[str, int]:
-        def cont() -> Mapping[str, int]:
+        def cont(conn: Connection) -> Mapping[str, int]:
             try:
-                with with_transaction(self._conn.cursor()) as cursor:
+                with with_transaction(conn.cursor()) as cursor:
                     cursor.execute(sql("select", "inserted"), {"limit": n_rows})
                     order = {
                         row["sort_by"]: row["insert_order"] for row in cursor.fetchall()
@@ -104,16 +119,7 @@ class IDB:
             except OperationalError:
                 return {}
 
-        def step() -> Mapping[str, int]:
-            self._interrupt()
-            return self._ex.submit(cont)
-
-        try:
-            return await run_in_executor(step)
-        except CancelledError:
-            with timeit("INTERRUPT !! INSERTED"):
-                await run_in_executor(self._interrupt)
-            raise
+        return await self._readers.run(cont)
 
     def inserted(self, instance_id: bytes, sort_by: str) -> None:
         def cont() -> None:
@@ -153,3 +159,21 @@ class IDB:
             return c1()
 
         return self._ex.submit(cont)
+
+    def pum_stats(self) -> PumStatistics:
+        def cont() -> PumStatistics:
+            with self._lock, with_transaction(self._conn.cursor()) as cursor:
+                cursor.execute(sql("select", "pum_stats"), ())
+                row = cursor.fetchone()
+
+            q_first: Mapping[str, Optional[float]] = loads(row["q_first_result"])
+            return PumStatistics(
+                pums=row["pums"],
+                refined=row["refined"],
+                avg_first_result=row["avg_first_result"],
+                q50_first_result=q_first.get("q50") or 0,
+                q95_first_result=q_first.get("q95") or 0,
+                q100_first_result=q_first.get("q100") or 0,
+            )
+
+        return self._ex.submit(cont)
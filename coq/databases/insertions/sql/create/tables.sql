@@ -39,6 +39,12 @@ CREATE INDEX IF NOT EXISTS inserted_instance_id ON inserted (instance_id);
 CREATE INDEX IF NOT EXISTS inserted_sort_by     ON inserted (sort_by);
 
 
+CREATE TABLE IF NOT EXISTS pum_stats (
+  first_result REAL    NOT NULL,
+  refined      INTEGER NOT NULL
+);
+
+
 --
 -- VIEWS 
 --
@@ -97,4 +103,13 @@ LEFT JOIN stats_inserted_view
 ON stats_inserted_view.source = sources.name;
 
 
+CREATE VIEW IF NOT EXISTS pum_stats_view AS
+SELECT
+  COUNT(*)                                                AS pums,
+  COALESCE(SUM(refined), 0)                               AS refined,
+  COALESCE(AVG(first_result), 0)                          AS avg_first_result,
+  COALESCE(X_QUANTILES(first_result, 0.5, 0.95, 1), '{}') AS q_first_result
+FROM pum_stats;
+
+
 END;
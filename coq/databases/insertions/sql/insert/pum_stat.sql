@@ -0,0 +1,2 @@
+INSERT INTO pum_stats ( first_result,  refined)
+VALUES                (:first_result, :refined)
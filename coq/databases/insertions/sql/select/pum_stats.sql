@@ -0,0 +1,3 @@
+SELECT
+  *
+FROM pum_stats_view
@@ -1,5 +1,3 @@
-from asyncio import CancelledError
-from concurrent.futures import Executor
 from os.path import normcase
 from pathlib import Path, PurePath
 from sqlite3 import Connection, OperationalError
@@ -7,16 +5,16 @@ from threading import Lock
 from typing import AbstractSet, Iterator, Mapping, TypedDict, cast
 from uuid import uuid4
 
-from std2.asyncio import run_in_executor
 from std2.sqlite3 import with_transaction
 
-from ...shared.executor import SingleThreadExecutor
+from ...shared.executor import Lane, SingleThreadExecutor
 from ...shared.settings import Options
-from ...shared.sql import BIGGEST_INT, init_db
-from ...shared.timeit import timeit
+from ...shared.sql import BIGGEST_INT, Readers, db_uris, init_db
 from ...snippets.types import SCHEMA, LoadedSnips
 from .sql import sql
 
+_SCHEMA = "v3"
+
 
 class _Snip(TypedDict):
     grammar: str
@@ -26,8 +24,7 @@ class _Snip(TypedDict):
     doc: str
 
 
-def _init(db_dir: Path) -> Connection:
-    db = (db_dir / SCHEMA).with_suffix(".sqlite3")
+def _init(db: Path) -> Connection:
     db.parent.mkdir(parents=True, exist_ok=True)
     conn = Connection(db, isolation_level=None)
     init_db(conn)
@@ -37,15 +34,15 @@ def _init(db_dir: Path) -> Connection:
 
 
 class SDB:
-    def __init__(self, pool: Executor, vars_dir: Path) -> None:
-        db_dir = vars_dir / "clients" / "snippets"
+    def __init__(self, vars_dir: Path) -> None:
+        db = (vars_dir / "clients" / "snippets" / f"{SCHEMA}-{_SCHEMA}").with_suffix(
+            ".sqlite3"
+        )
         self._lock = Lock()
-        self._ex = SingleThreadExecutor(pool)
-        self._conn: Connection = self._ex.submit(_init, db_dir)
-
-    def _interrupt(self) -> None:
-        with self._lock:
-            self._conn.interrupt()
+        self._ex = SingleThreadExecutor()
+        self._conn: Connection = self._ex.submit(_init, db)
+        _, reader = db_uris(db)
+        self._readers = Readers(reader)
 
     async def clean(self, paths: AbstractSet[PurePath]) -> None:
         def cont() -> None:
@@ -55,7 +52,7 @@ class SDB:
                     ({"filename": normcase(path)} for path in paths),
                 )
 
-        await run_in_executor(self._ex.submit, cont)
+        await self._ex.run(cont, lane=Lane.background)
 
     async def mtimes(self) -> Mapping[PurePath, float]:
         def cont() -> Mapping[PurePath, float]:
@@ -65,7 +62,7 @@ class SDB:
                     PurePath(row["filename"]): row["mtime"] for row in cursor.fetchall()
                 }
 
-        return await run_in_executor(lambda: self._ex.submit(cont))
+        return await self._ex.run(cont, lane=Lane.background)
 
     async def populate(self, path: PurePath, mtime: float, loaded: LoadedSnips) -> None:
         def cont() -> None:
@@ -111,14 +108,14 @@ class SDB:
                             {"snippet_id": snippet_id, "match": match},
                         )
 
-        await run_in_executor(self._ex.submit, cont)
+        await self._ex.run(cont, lane=Lane.background)
 
     async def select(
         self, opts: Options, filetype: str, word: str, limitless: int
     ) -> Iterator[_Snip]:
-        def cont() -> Iterator[_Snip]:
+        def cont(conn: Connection) -> Iterator[_Snip]:
             try:
-                with with_transaction(self._conn.cursor()) as cursor:
+                with with_transaction(conn.cursor()) as cursor:
                     cursor.execute(
                         sql("select", "snippets"),
                         {
@@ -135,13 +132,4 @@ class SDB:
             except OperationalError:
                 return iter(())
 
-        def step() -> Iterator[_Snip]:
-            self._interrupt()
-            return self._ex.submit(cont)
-
-        try:
-            return await run_in_executor(step)
-        except CancelledError:
-            with timeit("INTERRUPT !! SNIPPETS"):
-                await run_in_executor(self._interrupt)
-            raise
+        return await self._readers.run(cont)
@@ -38,8 +38,10 @@ CREATE INDEX IF NOT EXISTS snippets_source_id ON snippets (source_id);
 
 CREATE TABLE IF NOT EXISTS matches (
   snippet_id BLOB NOT NULL REFERENCES snippets (rowid) ON UPDATE CASCADE ON DELETE CASCADE,
-  match      TEXT NOT NULL,
-  lmatch     TEXT NOT NULL,
+  match      TEXT    NOT NULL,
+  lmatch     TEXT    NOT NULL,
+  lmask      INTEGER NOT NULL,
+  llen       INTEGER NOT NULL,
   UNIQUE(snippet_id, match)
 );
 CREATE INDEX IF NOT EXISTS matches_snippet_id ON matches (snippet_id);
@@ -93,6 +95,8 @@ SELECT
   snippets.grammar     AS grammar,
   matches.match        AS prefix,
   matches.lmatch       AS lprefix,
+  matches.lmask        AS lmask,
+  matches.llen         AS llen,
   snippets.content     AS snippet,
   snippets.label       AS label,
   snippets.doc         AS doc,
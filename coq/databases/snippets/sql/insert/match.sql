@@ -1,2 +1,2 @@
-INSERT OR IGNORE INTO matches ( snippet_id,  match, lmatch)
-VALUES                        (:snippet_id, :match, LOWER(:match))
+INSERT OR IGNORE INTO matches ( snippet_id,  match, lmatch,         lmask,                      llen)
+VALUES                        (:snippet_id, :match, LOWER(:match), X_CHAR_MASK(LOWER(:match)), LENGTH(:match))
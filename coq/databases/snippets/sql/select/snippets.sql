@@ -10,11 +10,21 @@ WHERE
   AND
   snippet <> ''
   AND 
-  LENGTH(prefix) + :look_ahead >= LENGTH(:word)
+  llen + :look_ahead >= LENGTH(:word)
   AND
   ft_src = :filetype
   AND
-  lprefix LIKE X_LIKE_ESC(SUBSTR(LOWER(:word), 1, :exact)) ESCAPE '!'
+  lprefix >= SUBSTR(LOWER(:word), 1, :exact)
+  AND
+  lprefix < SUBSTR(LOWER(:word), 1, :exact) || CHAR(1114111)
+  AND
+  CASE
+    WHEN llen < LENGTH(:word) THEN 1
+    WHEN (X_CHAR_MASK(LOWER(:word)) & ~lmask) = 0 THEN 1
+    WHEN LENGTH(:word) * (1 - :cut_off) <= 1 THEN 0
+    WHEN ((X_CHAR_MASK(LOWER(:word)) & ~lmask) & ((X_CHAR_MASK(LOWER(:word)) & ~lmask) - 1)) = 0 THEN 1
+    ELSE LENGTH(:word) * (1 - :cut_off) > 2
+  END
   AND
   X_SIMILARITY(LOWER(:word), lprefix, :look_ahead) > :cut_off
 GROUP BY
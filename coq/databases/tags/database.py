@@ -1,5 +1,3 @@
-from asyncio import CancelledError
-from concurrent.futures import Executor
 from hashlib import md5
 from os.path import normcase
 from pathlib import Path, PurePath
@@ -7,17 +5,15 @@ from sqlite3 import Connection, OperationalError
 from threading import Lock
 from typing import AbstractSet, Iterator, Mapping, cast
 
-from std2.asyncio import run_in_executor
 from std2.sqlite3 import with_transaction
 
-from ...shared.executor import SingleThreadExecutor
+from ...shared.executor import Lane, SingleThreadExecutor
 from ...shared.settings import Options
-from ...shared.sql import BIGGEST_INT, init_db
-from ...shared.timeit import timeit
+from ...shared.sql import BIGGEST_INT, Readers, db_uris, init_db
 from ...tags.types import Tag, Tags
 from .sql import sql
 
-_SCHEMA = "v2"
+_SCHEMA = "v3"
 
 _NIL_TAG = Tag(
     language="",
@@ -33,11 +29,15 @@ _NIL_TAG = Tag(
 )
 
 
-def _init(db_dir: Path, cwd: PurePath) -> Connection:
+def _path(db_dir: Path, cwd: PurePath) -> Path:
     ncwd = normcase(cwd)
     name = f"{md5(ncwd.encode()).hexdigest()}-{_SCHEMA}"
     db = (db_dir / name).with_suffix(".sqlite3")
     db.parent.mkdir(parents=True, exist_ok=True)
+    return db
+
+
+def _init(db: Path) -> Connection:
     conn = Connection(str(db), isolation_level=None)
     init_db(conn)
     conn.executescript(sql("create", "pragma"))
@@ -46,23 +46,26 @@ def _init(db_dir: Path, cwd: PurePath) -> Connection:
 
 
 class CTDB:
-    def __init__(self, pool: Executor, vars_dir: Path, cwd: PurePath) -> None:
+    def __init__(self, vars_dir: Path, cwd: PurePath) -> None:
         self._lock = Lock()
-        self._ex = SingleThreadExecutor(pool)
+        self._ex = SingleThreadExecutor()
         self._vars_dir = vars_dir / "clients" / "tags"
-        self._conn: Connection = self._ex.submit(_init, self._vars_dir, cwd)
-
-    def _interrupt(self) -> None:
-        with self._lock:
-            self._conn.interrupt()
+        db = _path(self._vars_dir, cwd=cwd)
+        self._conn: Connection = self._ex.submit(_init, db)
+        _, reader = db_uris(db)
+        self._readers = Readers(reader)
 
     async def swap(self, cwd: PurePath) -> None:
+        db = _path(self._vars_dir, cwd=cwd)
+
         def cont() -> None:
             with self._lock:
                 self._conn.close()
-                self._conn = _init(self._vars_dir, cwd=cwd)
+                self._conn = _init(db)
 
-        await run_in_executor(self._ex.submit, cont)
+        await self._ex.run(cont, lane=Lane.background)
+        _, reader = db_uris(db)
+        await self._readers.reopen(reader)
 
     async def paths(self) -> Mapping[str, float]:
         def cont() -> Mapping[str, float]:
@@ -71,10 +74,7 @@ class CTDB:
                 files = {row["filename"]: row["mtime"] for row in cursor.fetchall()}
                 return files
 
-        def step() -> Mapping[str, float]:
-            return self._ex.submit(cont)
-
-        return await run_in_executor(step)
+        return await self._ex.run(cont, lane=Lane.background)
 
     async def reconciliate(self, dead: AbstractSet[str], new: Tags) -> None:
         def cont() -> None:
@@ -100,14 +100,14 @@ class CTDB:
                 cursor.executemany(sql("insert", "file"), m1())
                 cursor.executemany(sql("insert", "tag"), m2())
 
-        await run_in_executor(self._ex.submit, cont)
+        await self._ex.run(cont, lane=Lane.background)
 
     async def select(
         self, opts: Options, filename: str, line_num: int, word: str, limitless: int
     ) -> Iterator[Tag]:
-        def cont() -> Iterator[Tag]:
+        def cont(conn: Connection) -> Iterator[Tag]:
             try:
-                with with_transaction(self._conn.cursor()) as cursor:
+                with with_transaction(conn.cursor()) as cursor:
                     cursor.execute(
                         sql("select", "files_filetype"), {"filename": filename}
                     )
@@ -131,13 +131,4 @@ class CTDB:
             except OperationalError:
                 return iter(())
 
-        def step() -> Iterator[Tag]:
-            self._interrupt()
-            return self._ex.submit(cont)
-
-        try:
-            return await run_in_executor(step)
-        except CancelledError:
-            with timeit("INTERRUPT !! TAGS"):
-                await run_in_executor(self._interrupt)
-            raise
+        return await self._readers.run(cont)
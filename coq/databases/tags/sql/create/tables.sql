@@ -17,6 +17,8 @@ CREATE TABLE IF NOT EXISTS tags (
   kind      TEXT    NOT NULL,
   name      TEXT    NOT NULL,
   lname     TEXT    NOT NULL,
+  lmask     INTEGER NOT NULL,
+  llen      INTEGER NOT NULL,
   pattern   TEXT    NOT NULL,
   typeref   TEXT,
   scope     TEXT,
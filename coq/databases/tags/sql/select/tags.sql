@@ -17,13 +17,23 @@ WHERE
   AND
   tags.name <> ''
   AND 
-  LENGTH(tags.name) + :look_ahead >= LENGTH(:word)
+  tags.llen + :look_ahead >= LENGTH(:word)
   AND
-  files.filetype = :filetype
+  +files.filetype = :filetype
   AND
-  tags.lname LIKE X_LIKE_ESC(SUBSTR(LOWER(:word), 1, :exact)) ESCAPE '!'
+  tags.lname >= SUBSTR(LOWER(:word), 1, :exact)
+  AND
+  tags.lname < SUBSTR(LOWER(:word), 1, :exact) || CHAR(1114111)
   AND
   NOT INSTR(:word, tags.name)
   AND
+  CASE
+    WHEN tags.llen < LENGTH(:word) THEN 1
+    WHEN (X_CHAR_MASK(LOWER(:word)) & ~tags.lmask) = 0 THEN 1
+    WHEN LENGTH(:word) * (1 - :cut_off) <= 1 THEN 0
+    WHEN ((X_CHAR_MASK(LOWER(:word)) & ~tags.lmask) & ((X_CHAR_MASK(LOWER(:word)) & ~tags.lmask) - 1)) = 0 THEN 1
+    ELSE LENGTH(:word) * (1 - :cut_off) > 2
+  END
+  AND
   X_SIMILARITY(LOWER(:word), tags.lname, :look_ahead) > :cut_off
 LIMIT :limit
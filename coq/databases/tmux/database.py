@@ -1,22 +1,18 @@
-from asyncio import CancelledError
-from concurrent.futures import Executor
 from sqlite3 import Connection, OperationalError
 from threading import Lock
 from typing import Iterable, Iterator, Mapping
 
-from std2.asyncio import run_in_executor
 from std2.sqlite3 import with_transaction
 
 from ...consts import TMUX_DB
-from ...shared.executor import SingleThreadExecutor
+from ...shared.executor import Lane, SingleThreadExecutor
 from ...shared.settings import Options
-from ...shared.sql import BIGGEST_INT, init_db
-from ...shared.timeit import timeit
+from ...shared.sql import BIGGEST_INT, Readers, db_uris, init_db
 from .sql import sql
 
 
-def _init() -> Connection:
-    conn = Connection(TMUX_DB, isolation_level=None)
+def _init(uri: str) -> Connection:
+    conn = Connection(uri, uri=True, isolation_level=None)
     init_db(conn)
     conn.executescript(sql("create", "pragma"))
     conn.executescript(sql("create", "tables"))
@@ -24,14 +20,12 @@ def _init() -> Connection:
 
 
 class TMDB:
-    def __init__(self, pool: Executor) -> None:
+    def __init__(self) -> None:
+        writer, reader = db_uris(TMUX_DB)
         self._lock = Lock()
-        self._ex = SingleThreadExecutor(pool)
-        self._conn: Connection = self._ex.submit(_init)
-
-    def _interrupt(self) -> None:
-        with self._lock:
-            self._conn.interrupt()
+        self._ex = SingleThreadExecutor()
+        self._conn: Connection = self._ex.submit(_init, writer)
+        self._readers = Readers(reader)
 
     async def periodical(self, panes: Mapping[str, Iterable[str]]) -> None:
         def m1(panes: Iterable[str]) -> Iterator[Mapping]:
@@ -54,14 +48,14 @@ class TMDB:
                 cursor.executemany(sql("insert", "pane"), m1(panes.keys()))
                 cursor.executemany(sql("insert", "word"), m2())
 
-        await run_in_executor(self._ex.submit, cont)
+        await self._ex.run(cont, lane=Lane.background)
 
     async def select(
         self, opts: Options, active_pane: str, word: str, limitless: int
     ) -> Iterator[str]:
-        def cont() -> Iterator[str]:
+        def cont(conn: Connection) -> Iterator[str]:
             try:
-                with with_transaction(self._conn.cursor()) as cursor:
+                with with_transaction(conn.cursor()) as cursor:
                     cursor.execute(
                         sql("select", "words"),
                         {
@@ -78,13 +72,4 @@ class TMDB:
             except OperationalError:
                 return iter(())
 
-        def step() -> Iterator[str]:
-            self._interrupt()
-            return self._ex.submit(cont)
-
-        try:
-            return await run_in_executor(step)
-        except CancelledError:
-            with timeit("INTERRUPT !! TMUX"):
-                await run_in_executor(self._interrupt)
-            raise
+        return await self._readers.run(cont)
@@ -8,8 +8,10 @@ CREATE TABLE IF NOT EXISTS panes (
 
 CREATE TABLE IF NOT EXISTS words (
   pane_id TEXT NOT NULL REFERENCES panes (pane_id) ON UPDATE CASCADE ON DELETE CASCADE,
-  word    TEXT NOT NULL,
-  lword   TEXT NOT NULL,
+  word    TEXT    NOT NULL,
+  lword   TEXT    NOT NULL,
+  lmask   INTEGER NOT NULL,
+  llen    INTEGER NOT NULL,
   UNIQUE (pane_id, word)
 );
 CREATE INDEX IF NOT EXISTS words_pane_id ON words (pane_id);
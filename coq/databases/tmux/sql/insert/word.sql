@@ -1,2 +1,2 @@
-INSERT OR IGNORE INTO words ( pane_id,  word, lword)
-VALUES                      (:pane_id, :word, LOWER(:word))
+INSERT OR IGNORE INTO words ( pane_id,  word, lword,         lmask,                     llen)
+VALUES                      (:pane_id, :word, LOWER(:word), X_CHAR_MASK(LOWER(:word)), LENGTH(:word))
@@ -6,13 +6,23 @@ WHERE
   AND
   word <> ''
   AND 
-  LENGTH(word) + :look_ahead >= LENGTH(:word)
+  llen + :look_ahead >= LENGTH(:word)
   AND
   pane_id <> :pane_id
   AND
-  lword LIKE X_LIKE_ESC(SUBSTR(LOWER(:word), 1, :exact)) ESCAPE '!'
+  lword >= SUBSTR(LOWER(:word), 1, :exact)
+  AND
+  lword < SUBSTR(LOWER(:word), 1, :exact) || CHAR(1114111)
   AND
   NOT INSTR(:word, word)
   AND
+  CASE
+    WHEN llen < LENGTH(:word) THEN 1
+    WHEN (X_CHAR_MASK(LOWER(:word)) & ~lmask) = 0 THEN 1
+    WHEN LENGTH(:word) * (1 - :cut_off) <= 1 THEN 0
+    WHEN ((X_CHAR_MASK(LOWER(:word)) & ~lmask) & ((X_CHAR_MASK(LOWER(:word)) & ~lmask) - 1)) = 0 THEN 1
+    ELSE LENGTH(:word) * (1 - :cut_off) > 2
+  END
+  AND
   X_SIMILARITY(LOWER(:word), lword, :look_ahead) > :cut_off
 LIMIT :limit
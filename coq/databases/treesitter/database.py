@@ -1,23 +1,19 @@
-from asyncio import CancelledError
-from concurrent.futures import Executor
 from sqlite3 import Connection, OperationalError
 from threading import Lock
 from typing import Iterable, Iterator, Mapping
 
-from std2.asyncio import run_in_executor
 from std2.sqlite3 import with_transaction
 
 from ...consts import TREESITTER_DB
-from ...shared.executor import SingleThreadExecutor
+from ...shared.executor import Lane, SingleThreadExecutor
 from ...shared.settings import Options
-from ...shared.sql import BIGGEST_INT, init_db
-from ...shared.timeit import timeit
+from ...shared.sql import BIGGEST_INT, Readers, db_uris, init_db
 from ...treesitter.types import Payload, SimplePayload
 from .sql import sql
 
 
-def _init() -> Connection:
-    conn = Connection(TREESITTER_DB, isolation_level=None)
+def _init(uri: str) -> Connection:
+    conn = Connection(uri, uri=True, isolation_level=None)
     init_db(conn)
     conn.executescript(sql("create", "pragma"))
     conn.executescript(sql("create", "tables"))
@@ -25,14 +21,12 @@ def _init() -> Connection:
 
 
 class TDB:
-    def __init__(self, pool: Executor) -> None:
+    def __init__(self) -> None:
+        writer, reader = db_uris(TREESITTER_DB)
         self._lock = Lock()
-        self._ex = SingleThreadExecutor(pool)
-        self._conn: Connection = self._ex.submit(_init)
-
-    def _interrupt(self) -> None:
-        with self._lock:
-            self._conn.interrupt()
+        self._ex = SingleThreadExecutor()
+        self._conn: Connection = self._ex.submit(_init, writer)
+        self._readers = Readers(reader)
 
     async def new_nodes(self, nodes: Iterable[Payload]) -> None:
         def m1() -> Iterator[Mapping]:
@@ -51,14 +45,14 @@ class TDB:
                 cursor.execute(sql("delete", "words"))
                 cursor.executemany(sql("insert", "word"), m1())
 
-        await run_in_executor(self._ex.submit, cont)
+        await self._ex.run(cont, lane=Lane.background)
 
     async def select(
         self, opts: Options, word: str, limitless: int
     ) -> Iterator[Payload]:
-        def cont() -> Iterator[Payload]:
+        def cont(conn: Connection) -> Iterator[Payload]:
             try:
-                with with_transaction(self._conn.cursor()) as cursor:
+                with with_transaction(conn.cursor()) as cursor:
                     cursor.execute(
                         sql("select", "words"),
                         {
@@ -94,13 +88,4 @@ class TDB:
             except OperationalError:
                 return iter(())
 
-        def step() -> Iterator[Payload]:
-            self._interrupt()
-            return self._ex.submit(cont)
-
-        try:
-            return await run_in_executor(step)
-        except CancelledError:
-            with timeit("INTERRUPT !! TREESITTER"):
-                await run_in_executor(self._interrupt)
-            raise
+        return await self._readers.run(cont)
@@ -2,9 +2,11 @@ BEGIN;
 
 
 CREATE TABLE IF NOT EXISTS words (
-  word   TEXT NOT NULL PRIMARY KEY,
-  lword  TEXT NOT NULL,
-  kind   TEXT NOT NULL,
+  word   TEXT    NOT NULL PRIMARY KEY,
+  lword  TEXT    NOT NULL,
+  lmask  INTEGER NOT NULL,
+  llen   INTEGER NOT NULL,
+  kind   TEXT    NOT NULL,
   pword  TEXT,
   pkind  TEXT,
   gpword TEXT,
@@ -1,2 +1,2 @@
-INSERT OR IGNORE INTO words ( word, lword,         kind,  pword,  pkind,  gpword,  gpkind)
-VALUES                      (:word, LOWER(:word), :kind, :pword, :pkind, :gpword, :gpkind)
+INSERT OR IGNORE INTO words ( word, lword,         lmask,                     llen,          kind,  pword,  pkind,  gpword,  gpkind)
+VALUES                      (:word, LOWER(:word), X_CHAR_MASK(LOWER(:word)), LENGTH(:word), :kind, :pword, :pkind, :gpword, :gpkind)
@@ -1,5 +1,15 @@
 from random import shuffle
-from typing import Any, Mapping, MutableSequence, Optional, Sequence, cast
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    Mapping,
+    MutableSequence,
+    Optional,
+    Sequence,
+    cast,
+)
 
 from pynvim_pp.logging import log
 
@@ -78,6 +88,23 @@ def _primary(item: CompletionItem) -> Edit:
         return Edit(new_text=fall_back)
 
 
+def _sort_by(item: CompletionItem) -> str:
+    """
+    Same as `Completion.sort_by`, without building the rest of it
+    """
+
+    if filter_text := item.get("filterText"):
+        return filter_text
+    else:
+        text_edit = item.get("textEdit")
+        fall_back = item.get("insertText") or item.get("label") or ""
+        if isinstance(text_edit, Mapping) and "range" in text_edit:
+            re = _range_edit(cast(TextEdit, text_edit))
+            return re.new_text if re else fall_back
+        else:
+            return fall_back
+
+
 def _doc(item: CompletionItem) -> Optional[Doc]:
     doc = item.get("documentation")
     detail = item.get("detail")
@@ -123,36 +150,74 @@ def parse_item(
         return cmp
 
 
-def parse(short_name: str, weight_adjust: float, resp: CompletionResponse) -> LSPcomp:
+def _parse_items(
+    short_name: str,
+    weight_adjust: float,
+    keep: Callable[[str], bool],
+    limit: int,
+    local_cache: bool,
+    items: MutableSequence[CompletionItem],
+) -> LSPcomp:
+    def cont(items: Iterable[CompletionItem]) -> Iterator[Completion]:
+        for item in items:
+            if comp := parse_item(short_name, weight_adjust=weight_adjust, item=item):
+                yield comp
+
+    shuffle(items)
+    survivors: MutableSequence[CompletionItem] = []
+    rest: MutableSequence[CompletionItem] = []
+    for item in items:
+        if len(survivors) >= limit and not local_cache:
+            break
+        elif not item.get("label"):
+            pass
+        elif len(survivors) < limit and keep(_sort_by(item)):
+            survivors.append(item)
+        else:
+            rest.append(item)
+
+    return LSPcomp(
+        local_cache=local_cache,
+        items=cont(survivors),
+        rest=cont(rest) if local_cache else iter(()),
+    )
+
+
+def parse(
+    short_name: str,
+    weight_adjust: float,
+    keep: Callable[[str], bool],
+    limit: int,
+    resp: CompletionResponse,
+) -> LSPcomp:
+    """
+    Only items whose raw sort key passes `keep` are parsed into `items`, up to `limit`
+
+    The others are parsed lazily into `rest`, and only if the response can be cached
+    """
+
     if _falsy(resp):
         return LSPcomp(local_cache=False, items=iter(()))
 
     elif isinstance(resp, Mapping):
-        is_complete = _falsy(resp.get("isIncomplete"))
-        items = resp.get("items", [])
-        shuffle(cast(MutableSequence, items))
-        comps = (
-            c
-            for c in (
-                parse_item(short_name, weight_adjust=weight_adjust, item=item)
-                for item in items
-            )
-            if c
+        return _parse_items(
+            short_name,
+            weight_adjust=weight_adjust,
+            keep=keep,
+            limit=limit,
+            local_cache=_falsy(resp.get("isIncomplete")),
+            items=cast(MutableSequence, resp.get("items", [])),
         )
-        lc = LSPcomp(local_cache=is_complete, items=comps)
-        return lc
 
     elif isinstance(resp, Sequence) and not isinstance(cast(Any, resp), str):
-        shuffle(cast(MutableSequence, resp))
-        comps = (
-            c
-            for c in (
-                parse_item(short_name, weight_adjust=weight_adjust, item=item)
-                for item in resp
-            )
-            if c
+        return _parse_items(
+            short_name,
+            weight_adjust=weight_adjust,
+            keep=keep,
+            limit=limit,
+            local_cache=True,
+            items=cast(MutableSequence, resp),
         )
-        return LSPcomp(local_cache=True, items=comps)
 
     else:
         msg = f"Unknown LSP resp -- {type(resp)}"
@@ -1,20 +1,123 @@
 (function(...)
   local cancel, cur_session = nil, nil
 
-  COQlsp_comp = function(name, session_id, pos)
+  -- heavy fields of trimmed items, fetched back on resolve
+  local stash, lo, hi = {}, 1, 0
+  local stash_size = 50000
+  local stash_key = "_coq_stash"
+  local heavy = {"documentation", "data"}
+
+  local put = function(item)
+    local fields = {}
+    for _, key in ipairs(heavy) do
+      fields[key] = item[key]
+      item[key] = nil
+    end
+    hi = hi + 1
+    stash[hi] = fields
+    while hi - lo >= stash_size do
+      stash[lo] = nil
+      lo = lo + 1
+    end
+    item[stash_key] = hi
+  end
+
+  COQlsp_unstash = function(item)
+    local idx = item[stash_key]
+    if idx == nil then
+      return item
+    else
+      local fields = stash[idx] or {}
+      local restored = {}
+      for key, val in pairs(item) do
+        restored[key] = val
+      end
+      for key, val in pairs(fields) do
+        restored[key] = val
+      end
+      restored[stash_key] = nil
+      return restored
+    end
+  end
+
+  local str = function(s)
+    return type(s) == "string" and s or nil
+  end
+
+  local sort_key = function(item)
+    local text_edit = item.textEdit
+    return str(item.filterText) or
+      (type(text_edit) == "table" and str(text_edit.newText)) or
+      str(item.insertText) or
+      str(item.label) or
+      ""
+  end
+
+  -- lossy: keeps items whose sort key contains the first char of the prefix
+  local prefiltered = function(items, chars)
+    if #chars == 0 then
+      return items
+    else
+      local acc = {}
+      for _, item in ipairs(items) do
+        local key = string.lower(sort_key(item))
+        for _, char in ipairs(chars) do
+          if string.find(key, char, 1, true) then
+            table.insert(acc, item)
+            break
+          end
+        end
+      end
+      return acc
+    end
+  end
+
+  local trim = function(resp, opts)
+    if type(resp) ~= "table" then
+      return resp
+    else
+      local items = resp.items or resp
+      if opts.prefilter then
+        items = prefiltered(items, opts.chars)
+        if resp.items then
+          resp.items = items
+        else
+          resp = items
+        end
+      end
+      if opts.trim then
+        for _, item in ipairs(items) do
+          put(item)
+        end
+      end
+      return resp
+    end
+  end
+
+  COQlsp_comp = function(name, session_id, pos, opts)
     cur_session = session_id
 
     if cancel then
       pcall(cancel)
     end
 
-    local n_clients = 0
-    for _ in pairs(vim.lsp.buf_get_clients(0)) do
-      n_clients = n_clients + 1
+    local skip = {}
+    for _, client_name in ipairs(opts.skip) do
+      skip[client_name] = true
+    end
+
+    local clients = {}
+    for _, client in pairs(vim.lsp.buf_get_clients(0)) do
+      if not skip[client.name] then
+        table.insert(clients, client)
+      end
     end
 
+    local n_clients = #clients
+    local empty = {client = vim.NIL, reply = vim.NIL}
+
     if n_clients == 0 then
-      COQlsp_notify(name, session_id, true, vim.NIL)
+      COQlsp_notify(name, session_id, true, empty)
     else
       local row, col = unpack(pos)
       local position = {line = row, character = col}
@@ -25,28 +128,55 @@
         context = {triggerKind = vim.lsp.protocol.CompletionTriggerKind.Invoked}
       }
 
-      local on_resp_old = function(err, _, resp, client_id)
-        if session_id == cur_session then
-          n_clients = n_clients - 1
-          COQlsp_notify(name, session_id, n_clients == 0, resp or vim.NIL)
+      local cancels = {}
+      cancel = function()
+        for _, c in ipairs(cancels) do
+          pcall(c)
         end
       end
 
-      local on_resp_new = function(err, resp, ctx)
-        on_resp_old(err, nil, resp, ctx.client_id)
-      end
+      for _, client in ipairs(clients) do
+        local on_resp_old = function(err, _, resp, client_id)
+          if session_id == cur_session then
+            n_clients = n_clients - 1
+            COQlsp_notify(
+              name,
+              session_id,
+              n_clients == 0,
+              {client = client.name, reply = trim(resp, opts) or vim.NIL}
+            )
+          end
+        end
+
+        local on_resp_new = function(err, resp, ctx)
+          on_resp_old(err, nil, resp, ctx.client_id)
+        end
+
+        local on_resp = function(...)
+          if type(({...})[2]) ~= "string" then
+            on_resp_new(...)
+          else
+            on_resp_old(...)
+          end
+        end
 
-      local on_resp = function(...)
-        if type(({...})[2]) ~= "string" then
-          on_resp_new(...)
+        local ok, request_id =
+          client.request("textDocument/completion", params, on_resp, 0)
+        if ok then
+          table.insert(
+            cancels,
+            function()
+              client.cancel_request(request_id)
+            end
+          )
         else
-          on_resp_old(...)
+          n_clients = n_clients - 1
         end
       end
 
-      local ids = {}
-      ids, cancel =
-        vim.lsp.buf_request(0, "textDocument/completion", params, on_resp)
+      if n_clients == 0 then
+        COQlsp_notify(name, session_id, true, empty)
+      end
     end
   end
 end)(...)
@@ -1,9 +1,11 @@
+from dataclasses import replace
 from pathlib import Path
-from typing import AsyncIterator, cast
+from typing import AbstractSet, Any, AsyncIterator, Callable, Mapping, cast
 
 from pynvim.api.nvim import Nvim
 
 from ...registry import atomic
+from ...shared.parse import lower
 from ...shared.types import UTF16, Context
 from ..parse import parse
 from ..types import CompletionResponse, LSPcomp
@@ -18,11 +20,34 @@ async def request(
     nvim: Nvim,
     short_name: str,
     weight_adjust: float,
+    keep: Callable[[str], bool],
+    limit: int,
+    trim_payload: bool,
+    prefilter: bool,
+    skip: AbstractSet[str],
     context: Context,
 ) -> AsyncIterator[LSPcomp]:
+    """
+    One `LSPcomp` per language server, except for those in `skip`
+    """
+
     row, c = context.position
     col = len(context.line_before[:c].encode(UTF16)) // 2
+    chars = {lower(context.words_before[:1]), lower(context.syms_before[:1])}
+    opts = {
+        "trim": trim_payload,
+        "prefilter": prefilter,
+        "chars": tuple(char for char in chars if char),
+        "skip": tuple(skip),
+    }
 
-    async for reply in async_request(nvim, "COQlsp_comp", (row, col)):
-        resp = cast(CompletionResponse, reply)
-        yield parse(short_name, weight_adjust=weight_adjust, resp=resp)
+    async for reply in async_request(nvim, "COQlsp_comp", (row, col), opts):
+        payload = cast(Mapping[str, Any], reply)
+        lc = parse(
+            short_name,
+            weight_adjust=weight_adjust,
+            keep=keep,
+            limit=limit,
+            resp=cast(CompletionResponse, payload.get("reply")),
+        )
+        yield replace(lc, client=payload.get("client"))
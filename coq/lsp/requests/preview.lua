@@ -3,6 +3,7 @@
 
   COQlsp_preview = function(name, session_id, item)
     cur_session = session_id
+    item = COQlsp_unstash(item)
 
     if cancel then
       pcall(cancel)
@@ -14,12 +15,15 @@
     end
 
     if n_clients == 0 then
-      COQlsp_notify(name, session_id, true, vim.NIL)
+      COQlsp_notify(name, session_id, true, item)
     else
       local on_resp_old = function(err, _, resp, client_id)
         if session_id == cur_session then
           n_clients = n_clients - 1
-          COQlsp_notify(name, session_id, n_clients == 0, resp or vim.NIL)
+          if type(resp) == "table" and resp.documentation == nil then
+            resp.documentation = item.documentation
+          end
+          COQlsp_notify(name, session_id, n_clients == 0, resp or item)
         end
       end
 
@@ -1,60 +1,33 @@
-from asyncio import Condition
 from collections import defaultdict
-from itertools import count
-from typing import Any, AsyncIterator, MutableMapping, Sequence, Tuple
+from typing import Any, AsyncIterator, MutableMapping
 
 from pynvim.api.nvim import Nvim
 from pynvim_pp.lib import async_call, go
 
 from ...registry import rpc
 from ...server.rt_types import Stack
+from ...shared.channel import Channel
 from ...shared.timeit import timeit
 
-_UIDS = count()
-_CONDS: MutableMapping[str, Condition] = {}
-_STATE: MutableMapping[str, Tuple[int, bool, Sequence[Any]]] = defaultdict(
-    lambda: (-1, True, ())
-)
+_CHANS: MutableMapping[str, Channel[Any]] = defaultdict(Channel)
 
 
 @rpc(blocking=False)
 def _lsp_notify(
     nvim: Nvim, stack: Stack, method: str, ses: int, done: bool, reply: Any
 ) -> None:
-    async def cont() -> None:
-        cond = _CONDS.setdefault(method, Condition())
-        session, _, acc = _STATE[method]
-        if ses == session:
-            _STATE[method] = (ses, done, (*acc, reply))
-        async with cond:
-            cond.notify_all()
-
-    go(nvim, aw=cont())
+    go(nvim, aw=_CHANS[method].send(ses, item=reply, done=done))
 
 
 async def async_request(nvim: Nvim, method: str, *args: Any) -> AsyncIterator[Any]:
     with timeit(f"LSP :: {method}"):
-        session, done = next(_UIDS), False
-        cond = _CONDS.setdefault(method, Condition())
-
-        _STATE[method] = (session, done, ())
-        async with cond:
-            cond.notify_all()
+        chan = _CHANS[method]
+        session = await chan.open()
 
         def cont() -> None:
             nvim.api.exec_lua(f"{method}(...)", (method, session, *args))
 
         await async_call(nvim, cont)
 
-        while True:
-            ses, done, acc = _STATE[method]
-            if ses == session:
-                for a in acc:
-                    yield a
-                if done:
-                    break
-            elif ses > session:
-                break
-
-            async with cond:
-                await cond.wait()
+        async for reply in chan.recv(session):
+            yield reply
@@ -64,3 +64,5 @@ CompletionResponse = Union[
 class LSPcomp:
     local_cache: bool
     items: Iterator[Completion]
+    rest: Iterator[Completion] = iter(())
+    client: Optional[str] = None
@@ -0,0 +1,191 @@
+from asyncio import Lock, sleep
+from dataclasses import dataclass
+from typing import (
+    AbstractSet,
+    MutableMapping,
+    MutableSequence,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from pynvim import Nvim
+from pynvim_pp.api import list_bufs
+from pynvim_pp.lib import async_call
+
+from ..databases.buffers.database import BDB
+from ..shared.rope import Rope
+from ..shared.runtime import Supervisor
+from .state import state
+
+_WINDOW = 512
+
+Span = Tuple[int, int, Sequence[str]]
+
+
+def merge(lhs: Span, rhs: Span) -> Optional[Span]:
+    """
+    Fold two consecutive line events into one, if `rhs` touches what `lhs` wrote
+
+    `hi < 0` means until the end of the buffer
+    """
+
+    lo1, hi1, lines1 = lhs
+    lo2, hi2, lines2 = rhs
+    end1 = lo1 + len(lines1)
+
+    if lo2 > end1 or 0 <= hi2 < lo1:
+        return None
+    else:
+        head = lines1[: max(0, lo2 - lo1)]
+        tail = lines1[hi2 - lo1 :] if 0 <= hi2 < end1 else ()
+        lo = min(lo1, lo2)
+        if hi1 < 0 or hi2 < 0:
+            hi = -1
+        else:
+            hi = max(hi1, hi2 - (len(lines1) - (hi1 - lo1)))
+        return lo, hi, (*head, *lines2, *tail)
+
+
+@dataclass
+class _Job:
+    filetype: str
+    cursor: int
+    pending: int
+    shadow: Rope[Optional[str]]
+
+
+class Indexer:
+    """
+    Buffer edits above `index_cutoff` are indexed in chunks, during idle time
+
+    Pending lines go into the db as blanks, so line numbers stay in sync,
+    and are kept in `shadow`, a prefix of the buffer where `None` means indexed
+    """
+
+    def __init__(
+        self,
+        supervisor: Supervisor,
+        bdb: BDB,
+        cutoff: int,
+        unifying_chars: AbstractSet[str],
+    ) -> None:
+        self._supervisor, self._bdb = supervisor, bdb
+        self._cutoff, self._chunk = cutoff, max(1, cutoff // 10)
+        self._unifying_chars = unifying_chars
+        self._lock = Lock()
+        self._jobs: MutableMapping[int, _Job] = {}
+
+    async def set_lines(
+        self, buf_id: int, filetype: str, lo: int, hi: int, lines: Sequence[str]
+    ) -> bool:
+        """
+        Returns `True` if indexing is deferred
+        """
+
+        heavy = sum(map(len, lines)) > self._cutoff
+        async with self._lock:
+            job = self._jobs.get(buf_id)
+            await self._bdb.set_lines(
+                buf_id,
+                filetype=filetype,
+                lo=lo,
+                hi=hi,
+                lines=tuple("" for _ in lines) if heavy else lines,
+                unifying_chars=self._unifying_chars,
+            )
+
+            if not job and not heavy:
+                return False
+            else:
+                if not job:
+                    job = self._jobs[buf_id] = _Job(
+                        filetype=filetype, cursor=lo, pending=0, shadow=Rope()
+                    )
+                job.filetype = filetype
+
+                shadow = job.shadow
+                if lo > len(shadow):
+                    shadow[len(shadow) :] = (None for _ in range(lo - len(shadow)))
+                end = min(hi, len(shadow)) if hi >= 0 else len(shadow)
+                job.pending -= sum(line is not None for line in shadow[lo:end])
+
+                if heavy:
+                    shadow[lo:end] = lines
+                    job.pending += len(lines)
+                    job.cursor = min(job.cursor, lo)
+                else:
+                    shadow[lo:end] = (None for _ in lines)
+                    if 0 <= hi <= job.cursor:
+                        job.cursor += len(lines) - (hi - lo)
+                    else:
+                        job.cursor = min(job.cursor, lo)
+
+                if job.pending <= 0:
+                    self._jobs.pop(buf_id)
+                return heavy
+
+    def _seek(self, job: _Job) -> int:
+        lo = job.cursor
+        while True:
+            window = job.shadow[lo : lo + _WINDOW]
+            if not window:
+                return lo
+            for idx, line in enumerate(window, start=lo):
+                if line is not None:
+                    return idx
+            else:
+                lo += len(window)
+
+    async def step(self) -> bool:
+        """
+        Index one chunk, returns `False` once there is nothing left to do
+        """
+
+        async with self._lock:
+            for buf_id, job in self._jobs.items():
+                lo = self._seek(job)
+                chunk: MutableSequence[str] = []
+                size = 0
+                for line in job.shadow[lo : lo + self._chunk]:
+                    if line is None or size >= self._chunk:
+                        break
+                    else:
+                        # cap token work, ie. for minified single line files
+                        capped = line[: self._chunk]
+                        size += len(capped)
+                        chunk.append(capped)
+
+                if chunk:
+                    hi = lo + len(chunk)
+                    await self._bdb.set_lines(
+                        buf_id,
+                        filetype=job.filetype,
+                        lo=lo,
+                        hi=hi,
+                        lines=chunk,
+                        unifying_chars=self._unifying_chars,
+                    )
+                    job.shadow[lo:hi] = (None for _ in chunk)
+                    job.cursor, job.pending = hi, job.pending - len(chunk)
+
+                if not chunk or job.pending <= 0:
+                    self._jobs.pop(buf_id)
+                break
+
+            return bool(self._jobs)
+
+    async def run(self, nvim: Nvim) -> None:
+        while True:
+            async with self._supervisor.idling:
+                await self._supervisor.idling.wait()
+
+            if self._jobs:
+                bufs = await async_call(nvim, list_bufs, nvim, listed=True)
+                async with self._lock:
+                    for buf_id in self._jobs.keys() - {buf.number for buf in bufs}:
+                        self._jobs.pop(buf_id)
+
+            change_id = state().change_id
+            while state().change_id == change_id and await self.step():
+                await sleep(0)
@@ -1,7 +1,7 @@
 from contextlib import suppress
-from dataclasses import dataclass
-from queue import SimpleQueue
-from typing import Sequence, Tuple
+from dataclasses import dataclass, replace
+from queue import Empty, SimpleQueue
+from typing import Iterator, MutableSequence, MutableSet, Sequence, Tuple
 from uuid import uuid4
 
 from pynvim import Nvim
@@ -13,6 +13,7 @@ from std2.asyncio import run_in_executor
 
 from ...lang import LANG
 from ...registry import atomic, autocmd, rpc
+from ..indexer import Indexer, merge
 from ..rt_types import Stack
 from ..state import state
 from .omnifunc import comp_func
@@ -45,45 +46,80 @@ class _Qmsg:
     filetype: str
 
 
+def _drain() -> Iterator[_Qmsg]:
+    with suppress(Empty):
+        while True:
+            yield q.get_nowait()
+
+
+def _coalesce(qmsgs: Sequence[_Qmsg]) -> Sequence[_Qmsg]:
+    """
+    Collapse a burst of line events into as few edits as possible, per buffer
+    """
+
+    acc: MutableSequence[_Qmsg] = []
+    for qmsg in qmsgs:
+        for idx in reversed(range(len(acc))):
+            prev = acc[idx]
+            if prev.buf.number == qmsg.buf.number:
+                merged = merge(
+                    (*prev.range, prev.lines), (*qmsg.range, qmsg.lines)
+                )
+                if merged:
+                    lo, hi, lines = merged
+                    acc[idx] = replace(qmsg, range=(lo, hi), lines=lines)
+                else:
+                    acc.append(qmsg)
+                break
+        else:
+            acc.append(qmsg)
+
+    return acc
+
+
 @rpc(blocking=True)
 def _listener(nvim: Nvim, stack: Stack) -> None:
+    indexer = Indexer(
+        stack.supervisor,
+        bdb=stack.bdb,
+        cutoff=stack.settings.limits.index_cutoff,
+        unifying_chars=stack.settings.match.unifying_chars,
+    )
+    heavy_bufs: MutableSet[int] = set()
+
     async def cont() -> None:
         while True:
             with with_suppress():
                 qmsg: _Qmsg = await run_in_executor(q.get)
-                lo, hi = qmsg.range
+                qmsgs = (qmsg, *_drain())
                 await stack.supervisor.interrupt()
+                s = state(change_id=uuid4())
 
-                size = sum(map(len, qmsg.lines))
-                heavy_bufs = (
-                    {qmsg.buf.number}
-                    if size > stack.settings.limits.index_cutoff
-                    else set()
-                )
-                os = state()
-                s = state(change_id=uuid4(), nono_bufs=heavy_bufs)
-
-                if qmsg.buf.number not in s.nono_bufs:
-                    await stack.bdb.set_lines(
-                        qmsg.buf.number,
-                        filetype=qmsg.filetype,
-                        lo=lo,
-                        hi=hi,
-                        lines=qmsg.lines,
-                        unifying_chars=stack.settings.match.unifying_chars,
+                for edit in _coalesce(qmsgs):
+                    lo, hi = edit.range
+                    stack.proximity.edit(
+                        edit.buf.number, lo=lo, hi=hi, lines=edit.lines
                     )
-
-                if (
-                    qmsg.buf.number in s.nono_bufs
-                    and qmsg.buf.number not in os.nono_bufs
-                ):
-                    msg = LANG(
-                        "buf 2 fat",
-                        size=size,
-                        limit=stack.settings.limits.index_cutoff,
-                    )
-                    await awrite(nvim, msg)
-
+                    deferred = False
+                    if edit.buf.number not in s.nono_bufs:
+                        deferred = await indexer.set_lines(
+                            edit.buf.number,
+                            filetype=edit.filetype,
+                            lo=lo,
+                            hi=hi,
+                            lines=edit.lines,
+                        )
+
+                    if deferred and edit.buf.number not in heavy_bufs:
+                        heavy_bufs.add(edit.buf.number)
+                        msg = LANG(
+                            "buf 2 fat",
+                            size=sum(map(len, edit.lines)),
+                            limit=stack.settings.limits.index_cutoff,
+                        )
+                        await awrite(nvim, msg)
+
+                qmsg = qmsgs[-1]
                 if (
                     not qmsg.pending
                     and qmsg.mode.startswith("i")
@@ -92,6 +128,7 @@ def _listener(nvim: Nvim, stack: Stack) -> None:
                     comp_func(nvim, stack=stack, s=s, manual=False)
 
     go(nvim, aw=cont())
+    go(nvim, aw=indexer.run(nvim))
 
 
 atomic.exec_lua(f"{_listener.name}()", ())
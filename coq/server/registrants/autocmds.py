@@ -1,4 +1,4 @@
-from asyncio import Handle, get_running_loop
+from asyncio import CancelledError, Handle, get_running_loop
 from asyncio.tasks import gather
 from typing import Optional
 
@@ -67,20 +67,29 @@ def _insert_enter(nvim: Nvim, stack: Stack) -> None:
 
     async def c2() -> None:
         if ts.enabled:
-            payloads, elapsed = (
-                ((), 0)
-                if buf.number in nono_bufs
-                else await async_request(nvim, lines_around=ts.search_context)
-            )
-            await stack.tdb.new_nodes(payloads)
-            if elapsed > ts.slow_threshold:
-                state(nono_bufs={buf.number})
-                msg = LANG(
-                    "source slow",
-                    source=ts.short_name,
-                    elapsed=si_prefixed_smol(elapsed, precision=0),
-                )
-                await awrite(nvim, msg, error=True)
+            breaker, key = stack.supervisor.breaker, (ts.short_name, buf.number)
+            if buf.number in nono_bufs or not breaker.allow(key):
+                await stack.tdb.new_nodes(())
+            else:
+                try:
+                    payloads, elapsed = await async_request(
+                        nvim, lines_around=ts.search_context
+                    )
+                except CancelledError:
+                    breaker.release(key)
+                    raise
+                except Exception:
+                    breaker.record(key, ok=False)
+                    raise
+
+                await stack.tdb.new_nodes(payloads)
+                if breaker.record(key, ok=elapsed <= ts.slow_threshold):
+                    msg = LANG(
+                        "source slow",
+                        source=ts.short_name,
+                        elapsed=si_prefixed_smol(elapsed, precision=0),
+                    )
+                    await awrite(nvim, msg, error=True)
 
     go(nvim, aw=gather(c1(), c2()))
 
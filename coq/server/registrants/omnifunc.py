@@ -2,6 +2,7 @@ from asyncio import Event, Lock, Task, gather, sleep, wait
 from asyncio.events import AbstractEventLoop
 from dataclasses import replace
 from queue import SimpleQueue
+from time import monotonic
 from typing import Any, Literal, Mapping, Optional, Sequence, Tuple, Union
 from uuid import uuid4
 
@@ -22,11 +23,12 @@ from std2.pickle import DecodeError, new_decoder
 
 from ...lsp.requests.preview import request
 from ...registry import atomic, autocmd, rpc
+from ...shared.runtime import Collected
 from ...shared.timeit import timeit
 from ...shared.types import UTF8, Context, Extern, NvimPos
 from ..context import context
 from ..edit import NS, edit
-from ..nvim.completions import UserData, complete
+from ..nvim.completions import UserData, VimCompletion, complete
 from ..rt_types import Stack
 from ..state import State, state
 from ..trans import trans
@@ -48,6 +50,26 @@ def _should_cont(inserted: Optional[NvimPos], prev: Context, cur: Context) -> bo
         return bool(stripped) and len(cur.line_before) - len(stripped) <= 1
 
 
+def _refine(
+    shown: Sequence[VimCompletion], comps: Sequence[VimCompletion], height: int
+) -> bool:
+    """
+    Redraw an early pum only if its length or visible part would change
+    """
+
+    def key(comps: Sequence[VimCompletion]) -> Sequence[Tuple[Any, ...]]:
+        return tuple(
+            (
+                comp.abbr,
+                comp.menu,
+                comp.user_data.uid if comp.user_data else None,
+            )
+            for comp in comps[:height]
+        )
+
+    return not shown or len(shown) != len(comps) or key(shown) != key(comps)
+
+
 @rpc(blocking=True)
 def _launch_loop(nvim: Nvim, stack: Stack) -> None:
     task: Optional[Task] = None
@@ -61,6 +83,7 @@ def _launch_loop(nvim: Nvim, stack: Stack) -> None:
                 if lock.locked():
                     log.warn("%s", "SHOULD NOT BE LOCKED <><> OODA")
                 async with lock:
+                    t0 = monotonic()
                     ctx = await async_call(
                         nvim,
                         lambda: context(
@@ -81,8 +104,22 @@ def _launch_loop(nvim: Nvim, stack: Stack) -> None:
                     if should:
                         state(context=ctx)
                         await stack.supervisor.interrupt()
-                        metrics, _ = await gather(
-                            stack.supervisor.collect(ctx),
+                        shown: Sequence[VimCompletion] = ()
+                        first_result = 0.0
+
+                        async def early(collected: Collected) -> None:
+                            nonlocal shown, first_result
+                            if state().change_id == ctx.change_id:
+                                shown = tuple(
+                                    trans(stack, context=ctx, collected=collected)
+                                )
+                                await async_call(
+                                    nvim, lambda: complete(nvim, col=col, comp=shown)
+                                )
+                                first_result = monotonic() - t0
+
+                        collected, _ = await gather(
+                            stack.supervisor.collect(ctx, early=early),
                             async_call(nvim, lambda: complete(nvim, col=col, comp=()))
                             if stack.settings.display.pum.fast_close
                             else sleep(0),
@@ -90,11 +127,23 @@ def _launch_loop(nvim: Nvim, stack: Stack) -> None:
                         s = state()
                         if s.change_id == ctx.change_id:
                             vim_comps = tuple(
-                                trans(stack, context=ctx, metrics=metrics)
+                                trans(stack, context=ctx, collected=collected)
                             )
-                            await async_call(
-                                nvim, lambda: complete(nvim, col=col, comp=vim_comps)
+                            refine = _refine(
+                                shown,
+                                comps=vim_comps,
+                                height=stack.settings.display.pum.y_max_len,
                             )
+                            if refine:
+                                await async_call(
+                                    nvim,
+                                    lambda: complete(nvim, col=col, comp=vim_comps),
+                                )
+                            if shown or vim_comps:
+                                await stack.idb.new_pum_stat(
+                                    first_result=first_result or monotonic() - t0,
+                                    refined=bool(shown) and refine,
+                                )
                     else:
                         await async_call(nvim, lambda: complete(nvim, col=col, comp=()))
                         state(inserted=(-1, -1))
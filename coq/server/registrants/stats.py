@@ -2,7 +2,7 @@ from itertools import chain
 from locale import strxfrm
 from os import linesep
 from string import Template
-from typing import Iterable, Iterator, Mapping, Sequence, Tuple
+from typing import Hashable, Iterable, Iterator, Mapping, Sequence, Tuple
 
 from pynvim import Nvim
 from pynvim_pp.api import buf_set_lines, buf_set_option, create_buf, win_close
@@ -10,10 +10,13 @@ from pynvim_pp.float_win import list_floatwins, open_float_win
 from pynvim_pp.lib import display_width
 from std2.locale import si_prefixed_smol
 
+from ...clients.lsp.worker import Worker as LspWorker
 from ...consts import MD_STATS
-from ...databases.insertions.database import Statistics
+from ...databases.insertions.database import PumStatistics, Statistics
 from ...lang import LANG
 from ...registry import rpc
+from ...shared.lru import LRU
+from ...shared.runtime import Fuse, budget, quantile
 from ..rt_types import Stack
 
 _TAB_SIZE = 2
@@ -29,6 +32,16 @@ ${{chart2}}
 
 ${{chart3}}
 
+${{chart4}}
+
+${{chart5}}
+
+${{chart6}}
+
+${{chart7}}
+
+${{chart8}}
+
 ${{desc}}
 """.lstrip()
 
@@ -110,14 +123,114 @@ def _pprn(stats: Iterable[Statistics]) -> Iterator[str]:
             yield table
 
 
+def _secs(t: float) -> str:
+    return f"{si_prefixed_smol(t, precision=0)}s"
+
+
+def _pum(stat: PumStatistics) -> str:
+    row = {
+        "Keystrokes": str(stat.pums),
+        "Refined": str(stat.refined),
+        "Avg First Result": _secs(stat.avg_first_result),
+        "Q50 First Result": _secs(stat.q50_first_result),
+        "Q95 First Result": _secs(stat.q95_first_result),
+        "Q100 First Result": _secs(stat.q100_first_result),
+    }
+    return _table(tuple(row), rows={LANG("pum"): row})
+
+
+def _budgets(
+    latencies: Mapping[Tuple[str, str], Sequence[float]], timeout: float
+) -> str:
+    def cont() -> Iterator[Tuple[str, Mapping[str, str]]]:
+        for (source, filetype), samples in latencies.items():
+            ordered = sorted(samples)
+            row = {
+                "Samples": str(len(ordered)),
+                "Q50 Latency": _secs(ordered[len(ordered) // 2] if ordered else 0),
+                "Budget": _secs(budget(ordered, timeout=timeout)),
+            }
+            yield f"{source} ({filetype})" if filetype else source, row
+
+    rows = {key: row for key, row in cont()}
+    return _table(("Samples", "Q50 Latency", "Budget"), rows=rows) if rows else ""
+
+
+def _servers(latencies: Mapping[str, Sequence[float]]) -> str:
+    def cont() -> Iterator[Tuple[str, Mapping[str, str]]]:
+        for server, samples in latencies.items():
+            ordered = sorted(samples)
+            row = {
+                "Samples": str(len(ordered)),
+                "Q50 Latency": _secs(quantile(ordered, q=0.5)),
+                "Q95 Latency": _secs(quantile(ordered, q=0.95)),
+            }
+            yield server, row
+
+    rows = {key: row for key, row in cont()}
+    return _table(("Samples", "Q50 Latency", "Q95 Latency"), rows=rows) if rows else ""
+
+
+def _circuits(fuses: Mapping[Hashable, Fuse]) -> str:
+    def cont() -> Iterator[Tuple[str, Mapping[str, str]]]:
+        for key, fuse in fuses.items():
+            source, where = key if isinstance(key, tuple) else (key, "")
+            row = {
+                "Circuit": fuse.circuit.name,
+                "Misses": str(fuse.misses),
+                "Trips": str(fuse.trips),
+                "Retry In": _secs(fuse.retry_in),
+            }
+            yield f"{source} ({where})" if where != "" else str(source), row
+
+    rows = {key: row for key, row in cont()}
+    return _table(("Circuit", "Misses", "Trips", "Retry In"), rows=rows) if rows else ""
+
+
+def _cache(lru: LRU) -> str:
+    total = lru.hits + lru.misses
+    row = {
+        "Hits": str(lru.hits),
+        "Misses": str(lru.misses),
+        "Hit Rate": f"{round(lru.hits / total * 100)}%" if total else "0%",
+        "Entries": str(len(lru)),
+    }
+    return _table(tuple(row), rows={"Transforms": row}) if total else ""
+
+
 @rpc(blocking=True)
 def stats(nvim: Nvim, stack: Stack, *_: str) -> None:
     stats = stack.idb.stats()
     chart1, chart2, chart3 = _pprn(stats)
+    chart4 = _pum(stack.idb.pum_stats())
+    chart5 = _budgets(
+        stack.supervisor.latencies(),
+        timeout=stack.settings.limits.completion_auto_timeout,
+    )
+    chart6 = _circuits(stack.supervisor.breaker.fuses())
+    chart7 = _cache(stack.derived)
+    chart8 = _servers(
+        {
+            server: samples
+            for worker in stack.workers
+            if isinstance(worker, LspWorker)
+            for server, samples in worker.latencies().items()
+        }
+    )
     desc = MD_STATS.read_text()
     lines = (
         Template(_TPL)
-        .substitute(chart1=chart1, chart2=chart2, chart3=chart3, desc=desc)
+        .substitute(
+            chart1=chart1,
+            chart2=chart2,
+            chart3=chart3,
+            chart4=chart4,
+            chart5=chart5,
+            chart6=chart6,
+            chart7=chart7,
+            chart8=chart8,
+            desc=desc,
+        )
         .splitlines()
     )
     for win in list_floatwins(nvim):
@@ -1,15 +1,25 @@
 from collections import Counter
-from dataclasses import dataclass
-from itertools import chain
+from dataclasses import dataclass, replace
 from math import e
-from typing import Mapping
+from types import MappingProxyType
+from typing import (
+    AbstractSet,
+    Iterable,
+    Iterator,
+    Mapping,
+    MutableSequence,
+    Optional,
+    Sequence,
+    Tuple,
+)
 from uuid import UUID, uuid4
 
 from pynvim_pp.lib import display_width
 
 from ..databases.insertions.database import IDB
 from ..shared.context import EMPTY_CONTEXT
-from ..shared.fuzzy import MatchMetrics, metrics
+from ..shared.fuzzy import FuzzyMemo, MatchMetrics
+from ..shared.lru import LRU
 from ..shared.parse import coalesce, is_word, lower
 from ..shared.runtime import Metric, PReviewer
 from ..shared.settings import BaseClient, Icons, Options, Weights
@@ -17,6 +27,22 @@ from ..shared.types import Completion, Context
 from .icons import iconify
 
 
+@dataclass(frozen=True)
+class Derived:
+    """
+    Per candidate transforms that only depend on the candidate itself
+    """
+
+    kind: str
+    label_width: int
+    l_sort_by: str
+    is_word: bool
+
+
+# label, kind, icon_match, sort_by, tabstop
+DerivedKey = Tuple[str, str, Optional[str], str, int]
+
+
 @dataclass(frozen=True)
 class _ReviewCtx:
     batch: UUID
@@ -27,18 +53,9 @@ class _ReviewCtx:
     is_lower: bool
 
 
-def _metric(
-    options: Options,
-    ctx: _ReviewCtx,
-    completion: Completion,
-) -> MatchMetrics:
-    match = lower(completion.sort_by) if ctx.is_lower else completion.sort_by
-    cword = (
-        ctx.context.words_before
-        if is_word(match[:1], unifying_chars=options.unifying_chars)
-        else ctx.context.syms_before
-    )
-    return metrics(cword, match, look_ahead=options.look_ahead)
+def _metric(memo: FuzzyMemo, ctx: _ReviewCtx, word: bool, match: str) -> MatchMetrics:
+    cword = ctx.context.words_before if word else ctx.context.syms_before
+    return memo.metrics(cword, match)
 
 
 def sigmoid(x: float) -> float:
@@ -53,6 +70,7 @@ def _join(
     ctx: _ReviewCtx,
     instance: UUID,
     completion: Completion,
+    label_width: int,
     match_metrics: MatchMetrics,
 ) -> Metric:
     weight = Weights(
@@ -61,7 +79,6 @@ def _join(
         recency=ctx.inserted.get(completion.sort_by, 0),
         proximity=ctx.proximity.get(completion.sort_by, 0),
     )
-    label_width = display_width(completion.label, tabsize=ctx.context.tabstop)
     # !! WARN
     # Use UTF8 len for icon support
     # !! WARN
@@ -71,15 +88,135 @@ def _join(
         comp=completion,
         weight_adjust=sigmoid(completion.weight_adjust),
         weight=weight,
+        vector=(
+            weight.prefix_matches,
+            weight.edit_distance,
+            weight.recency,
+            weight.proximity,
+        ),
         label_width=label_width,
         kind_width=kind_width,
     )
     return metric
 
 
+_Row = Tuple[str, Sequence[str]]
+
+
+class Proximity:
+    """
+    Word counts over the lines about the cursor
+
+    Kept for a run of consecutive rows of one buffer,
+    spliced by line events & slid along as the cursor moves,
+    so only lines that were edited, or scrolled into it, get tokenized
+    """
+
+    def __init__(self, unifying_chars: AbstractSet[str], size: int) -> None:
+        self._unifying_chars, self._size = unifying_chars, max(1, size)
+        self._buf_id: Optional[int] = None
+        self._lo = 0
+        self._rows: MutableSequence[_Row] = []
+        self._counts: Counter = Counter()
+        self._view: Mapping[str, int] = MappingProxyType(self._counts)
+
+    def _tokenize(self, lines: Iterable[str]) -> MutableSequence[_Row]:
+        rows: MutableSequence[_Row] = [
+            (line, tuple(coalesce(line, unifying_chars=self._unifying_chars)))
+            for line in lines
+        ]
+        for _, words in rows:
+            for word in words:
+                self._counts[word] += 1
+        return rows
+
+    def _forget(self, rows: Iterable[_Row]) -> None:
+        for _, words in rows:
+            for word in words:
+                self._counts[word] -= 1
+                if self._counts[word] <= 0:
+                    del self._counts[word]
+
+    def edit(self, buf_id: int, lo: int, hi: int, lines: Sequence[str]) -> None:
+        """
+        Line event, `hi < 0` means until the end of the buffer
+        """
+
+        if buf_id != self._buf_id or not self._rows:
+            return
+
+        r_lo = self._lo
+        r_hi = r_lo + len(self._rows)
+        end = hi if hi >= 0 else max(lo, r_hi)
+
+        if lo >= r_hi:
+            pass
+        elif end <= r_lo:
+            self._lo += len(lines) - (end - lo)
+        else:
+            a, b = max(0, lo - r_lo), min(len(self._rows), end - r_lo)
+            self._forget(self._rows[a:b])
+            head, tail = self._rows[:a], self._rows[b:]
+            if lo < r_lo:
+                kept = lines[max(0, len(lines) - self._size) :]
+                self._lo = lo + len(lines) - len(kept)
+            else:
+                kept = lines[: self._size]
+                if len(kept) < len(lines):
+                    self._forget(tail)
+                    tail = []
+            self._rows = [*head, *self._tokenize(kept), *tail]
+
+    def update(self, context: Context) -> Mapping[str, int]:
+        """
+        Read only view, valid until the next `edit` or `update`
+        """
+
+        lines = context.lines
+        row, _ = context.position
+        lo = row - len(context.lines_before)
+        hi = lo + len(lines)
+
+        r_hi = self._lo + len(self._rows)
+        if context.buf_id != self._buf_id or hi <= self._lo or lo >= r_hi:
+            self._buf_id, self._lo = context.buf_id, lo
+            self._rows = []
+            self._counts.clear()
+        else:
+            if r_hi > hi:
+                self._forget(self._rows[hi - self._lo :])
+                del self._rows[hi - self._lo :]
+            if self._lo < lo:
+                self._forget(self._rows[: lo - self._lo])
+                del self._rows[: lo - self._lo]
+                self._lo = lo
+
+        above = self._tokenize(lines[: self._lo - lo])
+        below = self._tokenize(lines[self._lo + len(self._rows) - lo :])
+        self._rows = [*above, *self._rows, *below]
+        self._lo = lo
+
+        # line events can go missing, ie. for unlisted buffers
+        idx = row - lo
+        if self._rows[idx][0] != lines[idx]:
+            self._forget(self._rows[idx : idx + 1])
+            self._rows[idx : idx + 1] = self._tokenize(lines[idx : idx + 1])
+
+        return self._view
+
+
 class Reviewer(PReviewer):
-    def __init__(self, options: Options, icons: Icons, db: IDB) -> None:
+    def __init__(
+        self,
+        options: Options,
+        icons: Icons,
+        db: IDB,
+        cache: LRU[DerivedKey, Derived],
+        proximity: Proximity,
+    ) -> None:
         self._options, self._icons, self._db = options, icons, db
+        self._cache, self._proximity = cache, proximity
+        self._memo = FuzzyMemo(look_ahead=options.look_ahead)
         self._ctx = _ReviewCtx(
             batch=uuid4(),
             context=EMPTY_CONTEXT,
@@ -93,11 +230,7 @@ class Reviewer(PReviewer):
 
     async def begin(self, context: Context) -> None:
         inserted = await self._db.insertion_order(n_rows=100)
-        words = coalesce(
-            chain.from_iterable(context.lines),
-            unifying_chars=self._options.unifying_chars,
-        )
-        proximity = Counter(words)
+        proximity = self._proximity.update(context)
 
         ctx = _ReviewCtx(
             batch=uuid4(),
@@ -107,6 +240,7 @@ class Reviewer(PReviewer):
             is_lower=lower(context.words_before) == context.words_before,
         )
         self._ctx = ctx
+        self._memo.generation(context.change_id)
         await self._db.new_batch(ctx.batch.bytes)
 
     async def s_begin(self, assoc: BaseClient, instance: UUID) -> None:
@@ -114,20 +248,51 @@ class Reviewer(PReviewer):
             instance.bytes, source=assoc.short_name, batch_id=self._ctx.batch.bytes
         )
 
-    def trans(self, instance: UUID, completion: Completion) -> Metric:
-        new_completion = iconify(self._icons, completion=completion)
-        match_metrics = _metric(
-            self._options,
-            ctx=self._ctx,
-            completion=new_completion,
-        )
-        metric = _join(
-            self._ctx,
-            instance=instance,
-            completion=new_completion,
-            match_metrics=match_metrics,
+    def _derive(self, completion: Completion, tabstop: int) -> Derived:
+        key = (
+            completion.label,
+            completion.kind,
+            completion.icon_match,
+            completion.sort_by,
+            tabstop,
         )
-        return metric
+        derived = self._cache.get(key)
+        if not derived:
+            iconified = iconify(self._icons, completion=completion)
+            derived = self._cache[key] = Derived(
+                kind=iconified.kind,
+                label_width=display_width(completion.label, tabsize=tabstop),
+                l_sort_by=lower(completion.sort_by),
+                is_word=is_word(
+                    completion.sort_by[:1],
+                    unifying_chars=self._options.unifying_chars,
+                ),
+            )
+        return derived
+
+    def trans_many(
+        self, instance: UUID, completions: Sequence[Completion]
+    ) -> Iterator[Metric]:
+        ctx = self._ctx
+        for completion in completions:
+            derived = self._derive(completion, tabstop=ctx.context.tabstop)
+            new_completion = (
+                completion
+                if derived.kind == completion.kind
+                else replace(completion, kind=derived.kind)
+            )
+            match = derived.l_sort_by if ctx.is_lower else completion.sort_by
+            match_metrics = _metric(
+                self._memo, ctx=ctx, word=derived.is_word, match=match
+            )
+
+            yield _join(
+                ctx,
+                instance=instance,
+                completion=new_completion,
+                label_width=derived.label_width,
+                match_metrics=match_metrics,
+            )
 
     async def s_end(
         self, instance: UUID, interrupted: bool, elapsed: float, items: int
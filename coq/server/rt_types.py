@@ -8,15 +8,19 @@ from ..databases.snippets.database import SDB
 from ..databases.tags.database import CTDB
 from ..databases.tmux.database import TMDB
 from ..databases.treesitter.database import TDB
+from ..shared.lru import LRU
 from ..shared.runtime import Supervisor, Worker
 from ..shared.settings import Settings
 from ..shared.types import Completion
+from .reviewer import Derived, DerivedKey, Proximity
 
 
 @dataclass(frozen=True)
 class Stack:
     settings: Settings
     lru: MutableMapping[UUID, Completion]
+    derived: LRU[DerivedKey, Derived]
+    proximity: Proximity
     bdb: BDB
     idb: IDB
     tdb: TDB
@@ -18,7 +18,8 @@ from ..clients.tags.worker import Worker as TagsWorker
 from ..clients.tmux.worker import Worker as TmuxWorker
 from ..clients.tree_sitter.worker import Worker as TreeWorker
 from ..consts import CONFIG_YML, SETTINGS_VAR, VARS
-from ..databases.buffers.database import BDB
+from ..databases.buffers.database import BDB, SQLBDB
+from ..databases.buffers.lexicon import LBDB
 from ..databases.insertions.database import IDB
 from ..databases.snippets.database import SDB
 from ..databases.tags.database import CTDB
@@ -26,11 +27,13 @@ from ..databases.tmux.database import TMDB
 from ..databases.treesitter.database import TDB
 from ..shared.lru import LRU
 from ..shared.runtime import Supervisor, Worker
-from ..shared.settings import Settings
-from .reviewer import Reviewer
+from ..shared.settings import BuffersEngine, Settings
+from .reviewer import Derived, DerivedKey, Proximity, Reviewer
 from .rt_types import Stack
 from .state import state
 
+_DERIVED_SIZE = 9999
+
 
 def _settings(nvim: Nvim) -> Settings:
     user_config = nvim.vars.get(SETTINGS_VAR, {})
@@ -85,17 +88,27 @@ def stack(pool: Executor, nvim: Nvim) -> Stack:
     vars_dir = Path(nvim.funcs.stdpath("cache")) / "coq" if settings.xdg else VARS
     s = state(cwd=get_cwd(nvim))
     bdb, sdb, idb, tdb, ctdb, tmdb = (
-        BDB(pool),
-        SDB(pool, vars_dir=vars_dir),
-        IDB(pool),
-        TDB(pool),
-        CTDB(pool, vars_dir=vars_dir, cwd=s.cwd),
-        TMDB(pool),
+        (
+            LBDB()
+            if settings.clients.buffers.engine is BuffersEngine.memory
+            else SQLBDB()
+        ),
+        SDB(vars_dir=vars_dir),
+        IDB(),
+        TDB(),
+        CTDB(vars_dir=vars_dir, cwd=s.cwd),
+        TMDB(),
+    )
+    derived: LRU[DerivedKey, Derived] = LRU(size=_DERIVED_SIZE)
+    proximity = Proximity(
+        settings.match.unifying_chars, size=settings.match.proximate_lines * 2 + 1
     )
     reviewer = Reviewer(
         icons=settings.display.icons,
         options=settings.match,
         db=idb,
+        cache=derived,
+        proximity=proximity,
     )
     supervisor = Supervisor(
         pool=pool,
@@ -103,6 +116,7 @@ def stack(pool: Executor, nvim: Nvim) -> Stack:
         vars_dir=vars_dir,
         options=settings.match,
         limits=settings.limits,
+        weights=settings.weights,
         reviewer=reviewer,
     )
     workers = {
@@ -119,6 +133,8 @@ def stack(pool: Executor, nvim: Nvim) -> Stack:
     stack = Stack(
         settings=settings,
         lru=LRU(size=settings.match.max_results),
+        derived=derived,
+        proximity=proximity,
         bdb=bdb,
         sdb=sdb,
         idb=idb,
@@ -1,4 +1,5 @@
-from dataclasses import asdict
+from dataclasses import astuple
+from functools import lru_cache
 from itertools import chain
 from locale import strxfrm
 from typing import Any, Callable, Iterable, Iterator, MutableSet, Sequence
@@ -7,50 +8,29 @@ from pynvim_pp.lib import display_width
 from std2 import clamp
 
 from ..shared.parse import lower
-from ..shared.runtime import Metric
-from ..shared.settings import PumDisplay, Weights
+from ..shared.runtime import Collected, Metric, coefficients
+from ..shared.settings import PumDisplay
 from ..shared.types import Context, SnippetEdit
 from .nvim.completions import UserData, VimCompletion
 from .rt_types import Stack
 from .state import state
 
 
-def _cum(adjustment: Weights, metrics: Iterable[Metric]) -> Weights:
-    zero = Weights(
-        prefix_matches=0,
-        edit_distance=0,
-        recency=0,
-        proximity=0,
-    )
-    acc = asdict(zero)
-    for metric in metrics:
-        for key, val in asdict(metric.weight).items():
-            acc[key] += val
-    for key, val in asdict(adjustment).items():
-        if val:
-            acc[key] /= val
-        else:
-            acc[key] = 0
-    return Weights(**acc)
-
+@lru_cache(maxsize=8192)
+def _collate(sort_by: str, is_lower: bool) -> str:
+    return strxfrm(sort_by.swapcase() if is_lower else sort_by)
 
-def _sort_by(is_lower: bool, adjustment: Weights) -> Callable[[Metric], Any]:
-    adjust = asdict(adjustment)
 
+def _sort_by(is_lower: bool, coeffs: Sequence[float]) -> Callable[[Metric], Any]:
     def key_by(metric: Metric) -> Any:
-        tot = sum(
-            val / adjust[key] if adjust[key] else 0
-            for key, val in asdict(metric.weight).items()
-        )
+        tot = sum(val * coeff for val, coeff in zip(metric.vector, coeffs))
         key = (
             -round(tot * metric.weight_adjust * 1000),
             -len(metric.comp.secondary_edits),
             -(metric.comp.kind != ""),
             -(metric.comp.doc is not None),
             -metric.comp.sort_by[:1].isalnum(),
-            strxfrm(
-                metric.comp.sort_by.swapcase() if is_lower else metric.comp.sort_by
-            ),
+            _collate(metric.comp.sort_by, is_lower),
         )
         return key
 
@@ -133,7 +113,7 @@ def _cmp_to_vcmp(
 
 
 def trans(
-    stack: Stack, context: Context, metrics: Sequence[Metric]
+    stack: Stack, context: Context, collected: Collected
 ) -> Iterator[VimCompletion]:
     s = state()
     scr_width, _ = s.screen
@@ -147,9 +127,11 @@ def trans(
     ellipsis_width = display_width(display.pum.ellipsis, tabsize=context.tabstop)
     truncate = clamp(1, scr_width - context.scr_col, display.pum.x_max_len)
 
-    w_adjust = _cum(stack.settings.weights, metrics=metrics)
-    sortby = _sort_by(is_lower, adjustment=w_adjust)
-    ranked = sorted(metrics, key=sortby)
+    coeffs = coefficients(
+        astuple(stack.settings.weights), totals=astuple(collected.totals)
+    )
+    sortby = _sort_by(is_lower, coeffs=coeffs)
+    ranked = sorted(collected.metrics, key=sortby)
     pruned = tuple(_prune(stack, context=context, ranked=ranked))
     max_width = _max_width(pruned)
     for metric in pruned:
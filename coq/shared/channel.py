@@ -0,0 +1,88 @@
+from asyncio import Condition
+from collections import deque
+from dataclasses import dataclass, field
+from itertools import count
+from typing import AsyncIterator, Deque, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class _Session(Generic[T]):
+    uid: int
+    buf: Deque[T] = field(default_factory=deque)
+    done: bool = False
+    closed: bool = False
+
+
+class Channel(Generic[T]):
+    """
+    Replies to the latest request session, each delivered exactly once
+
+    Opening a session tears down the previous one, late replies to it are dropped
+
+    At most `maxsize` replies are buffered, further `send`s wait for `recv`
+    """
+
+    def __init__(self, maxsize: int = 64) -> None:
+        assert maxsize > 0
+        self._maxsize = maxsize
+        self._uids = count()
+        self._cond: Optional[Condition] = None
+        self._ses: _Session[T] = _Session(uid=-1, done=True, closed=True)
+
+    def _condition(self) -> Condition:
+        # created lazily, to bind to the running loop
+        self._cond = self._cond or Condition()
+        return self._cond
+
+    async def open(self) -> int:
+        cond = self._condition()
+        async with cond:
+            self._ses.closed = True
+            self._ses = _Session(uid=next(self._uids))
+            cond.notify_all()
+            return self._ses.uid
+
+    async def close(self, uid: int) -> None:
+        cond = self._condition()
+        async with cond:
+            if self._ses.uid == uid:
+                self._ses.closed = True
+                self._ses.buf.clear()
+            cond.notify_all()
+
+    async def send(self, uid: int, item: T, done: bool) -> None:
+        cond = self._condition()
+        async with cond:
+            ses = self._ses
+            await cond.wait_for(
+                lambda: ses.closed or ses.uid != uid or len(ses.buf) < self._maxsize
+            )
+            if not ses.closed and ses.uid == uid:
+                ses.buf.append(item)
+                ses.done = ses.done or done
+            cond.notify_all()
+
+    async def recv(self, uid: int) -> AsyncIterator[T]:
+        cond = self._condition()
+        ses = self._ses
+        if ses.uid != uid:
+            return
+
+        try:
+            while True:
+                async with cond:
+                    await cond.wait_for(lambda: ses.closed or ses.buf or ses.done)
+                    if ses.closed:
+                        return
+                    items, done = tuple(ses.buf), ses.done
+                    ses.buf.clear()
+                    cond.notify_all()
+
+                for item in items:
+                    yield item
+                if done:
+                    return
+        finally:
+            await self.close(uid)
@@ -1,33 +1,66 @@
-from concurrent.futures import Executor, Future, InvalidStateError
-from contextlib import suppress
-from queue import SimpleQueue
-from typing import Any, Callable, TypeVar, cast
+from asyncio import Future as AFuture
+from asyncio import wrap_future
+from concurrent.futures import Future
+from enum import IntEnum
+from itertools import count
+from queue import PriorityQueue
+from threading import Thread
+from typing import Any, Callable, TypeVar
 
 T = TypeVar("T")
 
 
+class Lane(IntEnum):
+    interactive = 0
+    background = 1
+
+
 class SingleThreadExecutor:
-    def __init__(self, pool: Executor) -> None:
-        self._q: SimpleQueue = SimpleQueue()
-        pool.submit(self._forever)
+    """
+    Actor owning one daemon thread
+
+    Queued `interactive` work jumps ahead of queued `background` work
+    """
+
+    def __init__(self) -> None:
+        self._q: PriorityQueue = PriorityQueue()
+        self._seq = count()
+        Thread(target=self._forever, daemon=True).start()
 
     def _forever(self) -> None:
         while True:
-            f = self._q.get()
+            _, _, f = self._q.get()
             f()
 
-    def submit(self, f: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    def _put(
+        self, lane: Lane, f: Callable[..., T], *args: Any, **kwargs: Any
+    ) -> "Future[T]":
         fut: Future = Future()
 
         def cont() -> None:
-            try:
-                ret = f(*args, **kwargs)
-            except Exception as e:
-                with suppress(InvalidStateError):
+            if fut.set_running_or_notify_cancel():
+                try:
+                    ret = f(*args, **kwargs)
+                except Exception as e:
                     fut.set_exception(e)
-            else:
-                with suppress(InvalidStateError):
+                else:
                     fut.set_result(ret)
 
-        self._q.put(cont)
-        return cast(T, fut.result())
+        self._q.put((lane, next(self._seq), cont))
+        return fut
+
+    def submit(self, f: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Blocks the calling thread
+        """
+
+        return self._put(Lane.interactive, f, *args, **kwargs).result()
+
+    def run(
+        self, f: Callable[..., T], *args: Any, lane: Lane = Lane.interactive
+    ) -> "AFuture[T]":
+        """
+        Awaitable from the event loop, cancelling it drops work that has not started
+        """
+
+        return wrap_future(self._put(lane, f, *args))
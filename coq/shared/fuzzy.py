@@ -1,6 +1,7 @@
 from collections import Counter
 from dataclasses import dataclass
-from typing import Iterable, MutableMapping
+from typing import Callable, Iterable, MutableMapping, Optional, Tuple
+from uuid import UUID
 
 
 @dataclass(frozen=True)
@@ -9,6 +10,17 @@ class MatchMetrics:
     edit_distance: float
 
 
+def char_mask(text: str) -> int:
+    """
+    Char presence bitmap, folded into 63 bits to fit a signed SQLite INTEGER
+    """
+
+    mask = 0
+    for char in text:
+        mask |= 1 << (ord(char) % 63)
+    return mask
+
+
 def _p_matches(lhs: Iterable[str], rhs: Iterable[str]) -> int:
     p_matches = 0
     for l, r in zip(lhs, rhs):
@@ -102,6 +114,46 @@ def dl_distance(lhs: str, rhs: str) -> int:
     return d[len_l + 1][len_r + 1]
 
 
+def osa_distance(lhs: str, rhs: str) -> int:
+    """
+    Restricted Damerau-Levenshtein (optimal string alignment)
+
+    Bit parallel, after Hyyrö 2002, with `lhs` as the pattern:
+    the whole column is carried as one int, one step per char of `rhs`
+    """
+
+    len_l = len(lhs)
+    if not len_l:
+        return len(rhs)
+    else:
+        peq: MutableMapping[str, int] = {}
+        for idx, char in enumerate(lhs):
+            peq[char] = peq.get(char, 0) | 1 << idx
+
+        full, top = (1 << len_l) - 1, 1 << (len_l - 1)
+        vp, vn, d0, prev_pm, dist = full, 0, 0, 0, len_l
+
+        for char in rhs:
+            pm = peq.get(char, 0)
+            tr = (((~d0 & pm) << 1) & prev_pm) & full
+            d0 = ((((pm & vp) + vp) & full) ^ vp) | pm | vn | tr
+            hp = vn | (~(d0 | vp) & full)
+            hn = d0 & vp
+
+            if hp & top:
+                dist += 1
+            elif hn & top:
+                dist -= 1
+
+            hp = ((hp << 1) | 1) & full
+            hn = (hn << 1) & full
+            vp = hn | (~(d0 | hp) & full)
+            vn = d0 & hp
+            prev_pm = pm
+
+        return dist
+
+
 def metrics(lhs: str, rhs: str, look_ahead: int) -> MatchMetrics:
     """
     Front end bias
@@ -116,6 +168,51 @@ def metrics(lhs: str, rhs: str, look_ahead: int) -> MatchMetrics:
         more = cutoff - shorter
         l, r = lhs[p_matches:cutoff], rhs[p_matches:cutoff]
 
-        dist = dl_distance(l, r)
+        dist = osa_distance(l, r)
         edit_dist = 1 - (dist - more) / shorter
         return MatchMetrics(prefix_matches=p_matches, edit_distance=edit_dist)
+
+
+class FuzzyMemo:
+    """
+    Memoize across keystrokes, keyed on (needle, candidate)
+
+    Entries live for the current & previous generation (`Context.change_id`),
+    so backtracking by a keystroke is still free
+
+    No narrowing: a candidate rejected for needle `N` can pass for `N+c`
+    """
+
+    def __init__(self, look_ahead: int) -> None:
+        self._look_ahead = look_ahead
+        self._gen: Optional[UUID] = None
+        self._metrics: Tuple[
+            MutableMapping[Tuple[str, str], MatchMetrics], ...
+        ] = ({}, {})
+        self._kept: Tuple[MutableMapping[Tuple[str, str], bool], ...] = ({}, {})
+
+    def generation(self, gen: UUID) -> None:
+        if gen != self._gen:
+            self._gen = gen
+            (m_cur, *_), (k_cur, *_) = self._metrics, self._kept
+            self._metrics, self._kept = ({}, m_cur), ({}, k_cur)
+
+    def metrics(self, lhs: str, rhs: str) -> MatchMetrics:
+        key = (lhs, rhs)
+        cur, prev = self._metrics
+        m = cur.get(key) or prev.get(key)
+        if not m:
+            m = metrics(lhs, rhs, look_ahead=self._look_ahead)
+        cur[key] = m
+        return m
+
+    def keep(self, needle: str, candidate: str, pred: Callable[[], bool]) -> bool:
+        key = (needle, candidate)
+        cur, prev = self._kept
+        kept = cur.get(key)
+        if kept is None:
+            kept = prev.get(key)
+        if kept is None:
+            kept = pred()
+        cur[key] = kept
+        return kept
@@ -1,17 +1,36 @@
 from collections import OrderedDict, UserDict
-from typing import Generic, TypeVar, cast
+from typing import Generic, Optional, TypeVar, Union, cast
 
 K = TypeVar("K")
 V = TypeVar("V")
+T = TypeVar("T")
 
 
 class LRU(UserDict, Generic[K, V]):
     def __init__(self, size: int) -> None:
         assert size > 0
         self._size = size
+        self.hits, self.misses = 0, 0
         self.data = OrderedDict()
 
     def __setitem__(self, key: K, item: V) -> None:
-        if len(self) >= self._size:
+        if key in self.data:
+            cast(OrderedDict, self.data).move_to_end(key)
+        elif len(self) >= self._size:
             cast(OrderedDict, self.data).popitem(last=False)
         return super().__setitem__(key, item)
+
+    def get(self, key: K, default: Optional[T] = None) -> Union[V, Optional[T]]:
+        """
+        Refreshes recency, unlike `[]`, which is also used to iterate
+        """
+
+        try:
+            item = self.data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        else:
+            self.hits += 1
+            cast(OrderedDict, self.data).move_to_end(key)
+            return cast(V, item)
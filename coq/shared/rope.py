@@ -0,0 +1,140 @@
+from itertools import chain, islice
+from typing import (
+    Iterable,
+    Iterator,
+    MutableSequence,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+    overload,
+)
+
+T = TypeVar("T")
+
+_CHUNK = 512
+
+
+class Rope(Sequence[T]):
+    """
+    List of chunks, indexed by a Fenwick tree over chunk lengths
+
+    Replacing a slice costs O(log n + chunk + k) instead of shifting every element after it
+    """
+
+    def __init__(self, items: Iterable[T] = ()) -> None:
+        self._chunks: MutableSequence[MutableSequence[T]] = []
+        self._tree: MutableSequence[int] = []
+        self._len = 0
+        self._rebuild(items)
+
+    def _rebuild(self, items: Iterable[T]) -> None:
+        flat = [*items]
+        self._chunks = [flat[i : i + _CHUNK] for i in range(0, len(flat), _CHUNK)]
+        self._index()
+
+    def _index(self) -> None:
+        m = len(self._chunks)
+        tree = [0, *map(len, self._chunks)]
+        for i in range(1, m + 1):
+            j = i + (i & -i)
+            if j <= m:
+                tree[j] += tree[i]
+        self._tree = tree
+        self._len = sum(map(len, self._chunks))
+
+    def _add(self, chunk: int, delta: int) -> None:
+        i, m = chunk + 1, len(self._chunks)
+        while i <= m:
+            self._tree[i] += delta
+            i += i & -i
+        self._len += delta
+
+    def _locate(self, pos: int) -> Tuple[int, int]:
+        m = len(self._chunks)
+        idx, rem, step = 0, pos, 1 << m.bit_length()
+        while step:
+            nxt = idx + step
+            if nxt <= m and self._tree[nxt] <= rem:
+                idx, rem = nxt, rem - self._tree[nxt]
+            step >>= 1
+        return idx, rem
+
+    def _delete(self, lo: int, hi: int) -> None:
+        hollow = False
+        while hi > lo:
+            c, off = self._locate(lo)
+            chunk = self._chunks[c]
+            n = min(len(chunk) - off, hi - lo)
+            del chunk[off : off + n]
+            self._add(c, -n)
+            hi -= n
+            hollow |= not chunk
+
+        if hollow:
+            self._chunks = [chunk for chunk in self._chunks if chunk]
+            self._index()
+
+    def _insert(self, pos: int, items: Sequence[T]) -> None:
+        if not items:
+            pass
+        elif not self._chunks:
+            self._rebuild(items)
+        else:
+            c, off = self._locate(pos)
+            if c >= len(self._chunks):
+                c = len(self._chunks) - 1
+                off = len(self._chunks[c])
+
+            chunk = self._chunks[c]
+            chunk[off:off] = items
+            if len(chunk) <= 2 * _CHUNK:
+                self._add(c, len(items))
+            else:
+                self._chunks[c : c + 1] = [
+                    chunk[i : i + _CHUNK] for i in range(0, len(chunk), _CHUNK)
+                ]
+                self._index()
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[T]:
+        return chain.from_iterable(self._chunks)
+
+    @overload
+    def __getitem__(self, key: int) -> T:
+        ...
+
+    @overload
+    def __getitem__(self, key: slice) -> Sequence[T]:
+        ...
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[T, Sequence[T]]:
+        if isinstance(key, slice):
+            lo, hi, step = key.indices(self._len)
+            assert step == 1
+            if hi <= lo:
+                return ()
+            else:
+                c, off = self._locate(lo)
+                it = chain.from_iterable(
+                    chain((self._chunks[c][off:],), islice(self._chunks, c + 1, None))
+                )
+                return tuple(islice(it, hi - lo))
+        else:
+            idx = key + self._len if key < 0 else key
+            if not 0 <= idx < self._len:
+                raise IndexError(key)
+            else:
+                c, off = self._locate(idx)
+                return self._chunks[c][off]
+
+    def __setitem__(self, key: slice, items: Iterable[T]) -> None:
+        lo, hi, step = key.indices(self._len)
+        assert step == 1
+        new = tuple(items)
+        self._delete(lo, max(lo, hi))
+        self._insert(lo, new)
+        if len(self._chunks) > 4 + 2 * self._len // _CHUNK:
+            self._rebuild(iter(self))
@@ -2,7 +2,9 @@ from __future__ import annotations
 
 from abc import abstractmethod
 from asyncio import (
+    FIRST_COMPLETED,
     AbstractEventLoop,
+    CancelledError,
     Condition,
     Lock,
     Task,
@@ -11,21 +13,32 @@ from asyncio import (
     sleep,
     wait,
 )
+from collections import deque
 from concurrent.futures import Executor
-from dataclasses import dataclass
+from dataclasses import astuple, dataclass
+from enum import Enum, auto
+from heapq import nlargest
 from itertools import chain
+from math import ceil
 from pathlib import Path
 from time import monotonic
 from typing import (
     AbstractSet,
     AsyncIterator,
     Awaitable,
+    Callable,
+    Deque,
     Generic,
+    Hashable,
+    Iterable,
+    Iterator,
+    Mapping,
     MutableMapping,
     MutableSequence,
     Optional,
     Protocol,
     Sequence,
+    Tuple,
     TypeVar,
 )
 from uuid import UUID, uuid4
@@ -43,6 +56,13 @@ from .types import Completion, Context
 T_co = TypeVar("T_co", contravariant=True)
 O_co = TypeVar("O_co", contravariant=True, bound=BaseClient)
 
+_TOP_K = 4
+_TOP_K_MANUAL = 20
+
+_SAMPLES = 100
+_MIN_SAMPLES = 10
+_SLACK = 1.2
+
 
 @dataclass(frozen=True)
 class Metric:
@@ -50,10 +70,169 @@ class Metric:
     comp: Completion
     weight_adjust: float
     weight: Weights
+    # `weight` as a tuple, in field order
+    vector: Tuple[float, ...]
     label_width: int
     kind_width: int
 
 
+def coefficients(
+    adjustment: Sequence[float], totals: Sequence[float]
+) -> Tuple[float, ...]:
+    """
+    Per weight multiplier, normalizing each by its total, then scaling it by `adjustment`
+    """
+
+    return tuple(
+        adjust / total if adjust and total else 0
+        for adjust, total in zip(adjustment, totals)
+    )
+
+
+@dataclass(frozen=True)
+class Collected:
+    metrics: Sequence[Metric]
+    # unnormalized sums over every metric, not just `metrics`
+    totals: Weights
+
+
+class TopK:
+    """
+    Best `k` metrics out of however many are pushed, by a cheap score
+
+    Like `trans`, the score normalizes each weight by its total, at the time of pruning,
+    survivors are then ranked exactly by `trans`, using the final totals
+    """
+
+    def __init__(self, k: int, adjustment: Weights) -> None:
+        self._k = k
+        self._adjust = astuple(adjustment)
+        self._totals = [0.0 for _ in self._adjust]
+        self._acc: MutableSequence[Metric] = []
+
+    def __len__(self) -> int:
+        return len(self._acc)
+
+    def _prune(self) -> None:
+        coeffs = coefficients(self._adjust, totals=self._totals)
+
+        def key_by(metric: Metric) -> float:
+            score = sum(val * coeff for val, coeff in zip(metric.vector, coeffs))
+            return score * metric.weight_adjust
+
+        self._acc = nlargest(self._k, self._acc, key=key_by)
+
+    def push(self, metrics: Iterable[Metric]) -> None:
+        totals = self._totals
+        for metric in metrics:
+            for idx, val in enumerate(metric.vector):
+                totals[idx] += val
+            self._acc.append(metric)
+            if len(self._acc) >= 2 * self._k:
+                self._prune()
+
+    def collected(self) -> Collected:
+        return Collected(metrics=tuple(self._acc), totals=Weights(*self._totals))
+
+
+class Circuit(Enum):
+    closed = auto()
+    open = auto()
+    half_open = auto()
+
+
+@dataclass(frozen=True)
+class Fuse:
+    circuit: Circuit
+    misses: int
+    trips: int
+    retry_in: float
+
+
+@dataclass
+class _Fuse:
+    misses: int = 0
+    trips: int = 0
+    until: float = 0
+    probing: bool = False
+
+
+class Breaker:
+    """
+    Circuit breaker, per key
+
+    `threshold` consecutive misses trips it open, each trip backs off twice as long,
+    after which one request is let through as a probe, its outcome closes or re-trips it
+    """
+
+    def __init__(
+        self, threshold: int = 3, backoff: float = 1.0, max_backoff: float = 60.0
+    ) -> None:
+        self._threshold = threshold
+        self._backoff, self._max_backoff = backoff, max_backoff
+        self._fuses: MutableMapping[Hashable, _Fuse] = {}
+
+    def allow(self, key: Hashable) -> bool:
+        fuse = self._fuses.get(key)
+        if not fuse or not fuse.trips:
+            return True
+        elif fuse.probing or monotonic() < fuse.until:
+            return False
+        else:
+            fuse.probing = True
+            return True
+
+    def release(self, key: Hashable) -> None:
+        """
+        Request went nowhere, ie. cancelled, let another probe through
+        """
+
+        fuse = self._fuses.get(key)
+        if fuse:
+            fuse.probing = False
+
+    def record(self, key: Hashable, ok: bool) -> bool:
+        """
+        Returns `True` if this trips the breaker
+        """
+
+        fuse = self._fuses.setdefault(key, _Fuse())
+        probing, fuse.probing = fuse.probing, False
+        if ok:
+            if not fuse.trips or probing:
+                fuse.misses, fuse.trips = 0, 0
+            return False
+        else:
+            fuse.misses += 1
+            if probing or (not fuse.trips and fuse.misses >= self._threshold):
+                fuse.trips += 1
+                backoff = self._backoff * 2 ** (fuse.trips - 1)
+                fuse.until = monotonic() + min(self._max_backoff, backoff)
+                return True
+            else:
+                return False
+
+    def fuses(self) -> Mapping[Hashable, Fuse]:
+        now = monotonic()
+
+        def cont(fuse: _Fuse) -> Fuse:
+            circuit = (
+                Circuit.closed
+                if not fuse.trips
+                else Circuit.half_open
+                if fuse.probing or now >= fuse.until
+                else Circuit.open
+            )
+            return Fuse(
+                circuit=circuit,
+                misses=fuse.misses,
+                trips=fuse.trips,
+                retry_in=max(0, fuse.until - now) if fuse.trips else 0,
+            )
+
+        return {key: cont(fuse) for key, fuse in self._fuses.items() if fuse.misses}
+
+
 class PReviewer(Protocol):
     def register(self, assoc: BaseClient) -> None:
         ...
@@ -64,7 +243,9 @@ class PReviewer(Protocol):
     async def s_begin(self, assoc: BaseClient, instance: UUID) -> None:
         ...
 
-    def trans(self, instance: UUID, completion: Completion) -> Metric:
+    def trans_many(
+        self, instance: UUID, completions: Sequence[Completion]
+    ) -> Iterator[Metric]:
         ...
 
     async def s_end(
@@ -73,6 +254,66 @@ class PReviewer(Protocol):
         ...
 
 
+async def _quorum(
+    tasks: AbstractSet[Task], n: int, timeout: float
+) -> AbstractSet[Task]:
+    """
+    Wait until `n` tasks are done, or until `timeout`, returns the pending ones
+    """
+
+    deadline, pending = monotonic() + timeout, {*tasks}
+    while pending and len(tasks) - len(pending) < n:
+        done, pending = await wait(
+            pending,
+            timeout=max(0, deadline - monotonic()),
+            return_when=FIRST_COMPLETED,
+        )
+        if not done:
+            break
+    return pending
+
+
+async def _budgeted(tasks: Mapping[Task, float], t1: float) -> AbstractSet[Task]:
+    """
+    Wait on each task until `t1 + <its budget>`, returns the pending ones
+    """
+
+    pending = {*tasks}
+    while pending:
+        timeout = t1 + max(tasks[task] for task in pending) - monotonic()
+        if timeout <= 0:
+            break
+        else:
+            _, pending = await wait(
+                pending, timeout=timeout, return_when=FIRST_COMPLETED
+            )
+    return pending
+
+
+def quantile(ordered: Sequence[float], q: float) -> float:
+    """
+    Nearest rank, `ordered` has to be sorted
+    """
+
+    return ordered[round((len(ordered) - 1) * q)] if ordered else 0
+
+
+def budget(samples: Sequence[float], timeout: float) -> float:
+    """
+    How long a batch waits on a source, given its recent latencies
+
+    Sources that usually make the deadline are waited on until their q95,
+    those that usually miss it are not waited on at all
+    """
+
+    if len(samples) < _MIN_SAMPLES:
+        return timeout
+    else:
+        ordered = sorted(samples)
+        q50, q95 = quantile(ordered, q=0.5), quantile(ordered, q=0.95)
+        return 0 if q50 > timeout else min(timeout, q95 * _SLACK)
+
+
 class Supervisor:
     def __init__(
         self,
@@ -81,19 +322,22 @@ class Supervisor:
         vars_dir: Path,
         options: Options,
         limits: Limits,
+        weights: Weights,
         reviewer: PReviewer,
     ) -> None:
         self.pool = pool
         self.vars_dir = vars_dir
-        self.options, self.limits = options, limits
+        self.options, self.limits, self.weights = options, limits, weights
         self.nvim, self._reviewer = nvim, reviewer
 
         self.idling = Condition()
+        self.breaker = Breaker()
         self._workers: MutableMapping[Worker, BaseClient] = WeakKeyDictionary()
 
         self._lock = Lock()
         self._task: Optional[Task] = None
         self._tasks: Sequence[Task] = ()
+        self._latencies: MutableMapping[Tuple[str, str], Deque[float]] = {}
 
     @property
     def clients(self) -> AbstractSet[BaseClient]:
@@ -103,6 +347,13 @@ class Supervisor:
         self._reviewer.register(assoc)
         self._workers[worker] = assoc
 
+    def latencies(self) -> Mapping[Tuple[str, str], Sequence[float]]:
+        """
+        Recent latencies by `(source, filetype)`
+        """
+
+        return self._latencies
+
     def notify_idle(self) -> None:
         async def cont() -> None:
             async with self.idling:
@@ -115,7 +366,15 @@ class Supervisor:
         self._task, self._tasks = None, ()
         await cancel(g)
 
-    def collect(self, context: Context) -> Awaitable[Sequence[Metric]]:
+    def collect(
+        self,
+        context: Context,
+        early: Optional[Callable[[Collected], Awaitable[None]]] = None,
+    ) -> Awaitable[Collected]:
+        """
+        `early` receives what is in by the first deadline, if sources are still running
+        """
+
         loop: AbstractEventLoop = self.nvim.loop
         t1, done = monotonic(), False
         timeout = (
@@ -124,25 +383,63 @@ class Supervisor:
             else self.limits.completion_auto_timeout
         )
 
-        acc: MutableSequence[Metric] = []
+        acc = TopK(
+            self.options.max_results * (_TOP_K_MANUAL if context.manual else _TOP_K),
+            adjustment=self.weights,
+        )
+        chunks: MutableMapping[UUID, MutableSequence[Completion]] = {}
+
+        def flush(instance: UUID) -> None:
+            chunk = chunks.get(instance)
+            if chunk:
+                acc.push(self._reviewer.trans_many(instance, completions=chunk))
+                chunk.clear()
+
+        def flush_all() -> None:
+            for instance in chunks:
+                flush(instance)
+
+        def latencies(assoc: BaseClient) -> Deque[float]:
+            key = (assoc.short_name, context.filetype)
+            return self._latencies.setdefault(key, deque(maxlen=_SAMPLES))
 
         async def supervise(worker: Worker, assoc: BaseClient) -> None:
-            instance, items = uuid4(), 0
+            key = (assoc.short_name, context.filetype)
+            instance, items, cancelled, failed = uuid4(), 0, False, False
+            chunk: MutableSequence[Completion] = []
+            chunks[instance] = chunk
 
             with with_suppress(), timeit(f"WORKER -- {assoc.short_name}"):
                 await self._reviewer.s_begin(assoc, instance=instance)
                 try:
                     async for completion in worker.work(context):
                         if not done and completion:
-                            metric = self._reviewer.trans(
-                                instance, completion=completion
-                            )
-                            acc.append(metric)
+                            chunk.append(completion)
                             items += 1
+                            if len(chunk) >= self.options.max_results:
+                                flush(instance)
                         else:
+                            if not done:
+                                flush(instance)
                             await sleep(0)
+                except CancelledError:
+                    cancelled = True
+                    raise
+                except Exception:
+                    failed = True
+                    raise
                 finally:
+                    if not done:
+                        flush(instance)
                     elapsed = monotonic() - t1
+                    slo = self.limits.completion_manual_timeout
+                    # cancelled runs only tell how long a source took at least
+                    if not cancelled or elapsed >= timeout:
+                        latencies(assoc).append(elapsed)
+                    if not cancelled or elapsed >= slo:
+                        self.breaker.record(key, ok=not failed and elapsed < slo)
+                    else:
+                        self.breaker.release(key)
                     await self._reviewer.s_end(
                         instance,
                         interrupted=done,
@@ -150,7 +447,7 @@ class Supervisor:
                         items=items,
                     )
 
-        async def cont() -> Sequence[Metric]:
+        async def cont() -> Collected:
             nonlocal done
 
             with with_suppress(), timeit("COLLECTED -- ALL"):
@@ -158,21 +455,40 @@ class Supervisor:
                     log.warn("%s", "SHOULD NOT BE LOCKED <><> supervisor")
                 async with self._lock:
                     await self._reviewer.begin(context)
-                    self._tasks = tasks = tuple(
-                        loop.create_task(supervise(worker, assoc=assoc))
+                    budgets = {
+                        loop.create_task(supervise(worker, assoc=assoc)): budget(
+                            latencies(assoc), timeout=timeout
+                        )
                         for worker, assoc in self._workers.items()
-                    )
+                        if self.breaker.allow((assoc.short_name, context.filetype))
+                    }
+                    self._tasks = tasks = tuple(budgets)
                     try:
                         if not tasks:
-                            return ()
+                            return acc.collected()
                         else:
-                            _, pending = await wait(tasks, timeout=timeout)
+                            pending = await _quorum(
+                                {*tasks},
+                                n=ceil(len(tasks) * self.limits.completion_quorum),
+                                timeout=min(
+                                    timeout, self.limits.completion_first_timeout
+                                ),
+                            )
+                            if pending and early:
+                                flush_all()
+                                if acc:
+                                    await early(acc.collected())
+                            pending = await _budgeted(
+                                {task: budgets[task] for task in pending}, t1=t1
+                            )
+                            flush_all()
                             if not acc:
                                 for fut in as_completed(pending):
                                     await fut
+                                    flush_all()
                                     if acc:
                                         break
-                            return acc
+                            return acc.collected()
                     finally:
                         done = True
 
@@ -12,6 +12,8 @@ class Limits:
     index_cutoff: int
     completion_auto_timeout: float
     completion_manual_timeout: float
+    completion_first_timeout: float
+    completion_quorum: float
     download_retries: int
     download_timeout: float
 
@@ -130,9 +132,15 @@ class WordbankClient(BaseClient):
     match_syms: bool
 
 
+class BuffersEngine(Enum):
+    sqlite = auto()
+    memory = auto()
+
+
 @dataclass(frozen=True)
 class BuffersClient(WordbankClient):
     same_filetype: bool
+    engine: BuffersEngine
 
 
 @dataclass(frozen=True)
@@ -156,6 +164,8 @@ class SnippetClient(BaseClient):
 @dataclass(frozen=True)
 class LSPClient(BaseClient):
     resolve_timeout: float
+    trim_payload: bool
+    prefilter: bool
 
 
 @dataclass(frozen=True)
@@ -1,3 +1,4 @@
+from asyncio import CancelledError
 from functools import lru_cache
 from json import dumps
 from os.path import normcase
@@ -5,19 +6,28 @@ from pathlib import Path
 from sqlite3.dbapi2 import Connection
 from typing import (
     Any,
+    Callable,
     Iterator,
     MutableSequence,
     MutableSet,
     Optional,
     Protocol,
     Tuple,
+    TypeVar,
     cast,
 )
+from uuid import uuid4
 
 from std2.pathlib import AnyPath
-from std2.sqlite3 import add_functions, escape
+from std2.sqlite3 import add_functions
 
-from .fuzzy import quick_ratio
+from .executor import SingleThreadExecutor
+from .fuzzy import char_mask, quick_ratio
+
+T = TypeVar("T")
+
+# virtual machine ops between cancellation checks
+_PROGRESS_OPS = 1000
 
 BIGGEST_INT = 2 ** 63 - 1
 
@@ -36,11 +46,6 @@ def loader(base: Path) -> _Loader:
     return cast(_Loader, cont)
 
 
-def _like_esc(like: str) -> str:
-    escaped = escape(nono={"%", "_", "["}, escape="!", param=like)
-    return f"{escaped}%"
-
-
 class _Quantiles:
     def __init__(self) -> None:
         self._qs: MutableSet[float] = set()
@@ -72,9 +77,93 @@ class _Quantiles:
 
 def init_db(conn: Connection) -> None:
     add_functions(conn)
-    conn.create_function("X_LIKE_ESC", narg=1, func=_like_esc, deterministic=True)
     conn.create_function("X_SIMILARITY", narg=3, func=quick_ratio, deterministic=True)
+    conn.create_function("X_CHAR_MASK", narg=1, func=char_mask, deterministic=True)
     conn.create_function("X_NORM_CASE", narg=1, func=normcase, deterministic=True)
     conn.create_aggregate(
         "X_QUANTILES", n_arg=-1, aggregate_class=cast(Any, _Quantiles)
     )
+
+
+def db_uris(db: AnyPath) -> Tuple[str, str]:
+    """
+    `(writer, reader)` uris
+
+    `:memory:` becomes a named shared cache, so that readers can see it
+    """
+
+    if str(db) == ":memory:":
+        uri = f"file:{uuid4().hex}?mode=memory&cache=shared"
+        return uri, uri
+    else:
+        uri = Path(db).resolve().as_uri()
+        return uri, f"{uri}?mode=ro"
+
+
+def _reader(uri: str) -> Connection:
+    conn = Connection(uri, uri=True, isolation_level=None)
+    init_db(conn)
+    # shared cache readers would otherwise queue on the writer's table locks
+    conn.execute("PRAGMA read_uncommitted = ON")
+    conn.execute("PRAGMA query_only = ON")
+    return conn
+
+
+async def cancellable(
+    ex: SingleThreadExecutor,
+    conn: Callable[[], Connection],
+    f: Callable[[Connection], T],
+) -> T:
+    """
+    Run `f` on `ex`, cancelling it only aborts the statements of `f`
+
+    The flag is polled by sqlite's progress handler,
+    so whatever else runs on the connection is never touched
+    """
+
+    cancelled = False
+
+    def cont() -> T:
+        c = conn()
+        c.set_progress_handler(lambda: cancelled, _PROGRESS_OPS)
+        try:
+            return f(c)
+        finally:
+            c.set_progress_handler(None, 0)
+
+    try:
+        return await ex.run(cont)
+    except CancelledError:
+        cancelled = True
+        raise
+
+
+class Readers:
+    """
+    Read only connections, each on its own thread
+
+    Selects run in parallel with each other, and with the single writer
+    """
+
+    def __init__(self, uri: str, size: int = 2) -> None:
+        self._exs = tuple(SingleThreadExecutor() for _ in range(size))
+        self._busy = [0 for _ in self._exs]
+        self._conns = tuple(ex.submit(_reader, uri) for ex in self._exs)
+
+    async def reopen(self, uri: str) -> None:
+        def cont(conn: Connection) -> Connection:
+            conn.close()
+            return _reader(uri)
+
+        conns = []
+        for ex, conn in zip(self._exs, self._conns):
+            conns.append(await ex.run(cont, conn))
+        self._conns = tuple(conns)
+
+    async def run(self, f: Callable[[Connection], T]) -> T:
+        idx = min(range(len(self._exs)), key=self._busy.__getitem__)
+        self._busy[idx] += 1
+        try:
+            return await cancellable(self._exs[idx], lambda: self._conns[idx], f)
+        finally:
+            self._busy[idx] -= 1
@@ -1,5 +1,3 @@
-from asyncio import Condition
-from itertools import count
 from pathlib import Path
 from string import capwords
 from typing import Iterator, Optional, Sequence, Tuple
@@ -9,12 +7,11 @@ from pynvim_pp.lib import async_call, go
 
 from ..registry import atomic, rpc
 from ..server.rt_types import Stack
+from ..shared.channel import Channel
 from ..shared.timeit import timeit
 from .types import Payload, RawPayload, SimplePayload, SimpleRawPayload
 
-_UIDS = count()
-_COND: Optional[Condition] = None
-_SESSION: Tuple[int, bool, Sequence[RawPayload], float] = -1, True, (), 0
+_CHAN: Channel[Tuple[Sequence[RawPayload], float]] = Channel(maxsize=1)
 
 
 _LUA = (Path(__file__).resolve().parent / "request.lua").read_text("UTF-8")
@@ -25,18 +22,7 @@ atomic.exec_lua(_LUA, ())
 def _ts_notify(
     nvim: Nvim, stack: Stack, ses: int, reply: Sequence[RawPayload], elapsed: float
 ) -> None:
-    async def cont() -> None:
-        global _COND, _SESSION
-        _COND = _COND or Condition()
-
-        session, _, _, _ = _SESSION
-        if ses == session:
-            _SESSION = ses, True, reply, elapsed
-
-        async with _COND:
-            _COND.notify_all()
-
-    go(nvim, aw=cont())
+    go(nvim, aw=_CHAN.send(ses, item=(reply, elapsed), done=True))
 
 
 def _parse(load: Optional[SimpleRawPayload]) -> Optional[SimplePayload]:
@@ -68,28 +54,15 @@ def _vaildate(resp: Sequence[RawPayload]) -> Iterator[Payload]:
 async def async_request(
     nvim: Nvim, lines_around: int
 ) -> Tuple[Iterator[Payload], float]:
-    global _COND, _SESSION
-    _COND = _COND or Condition()
-
     with timeit("TS"):
-        _SESSION = session, _, _, _ = next(_UIDS), False, (), 0
-
-        async with _COND:
-            _COND.notify_all()
+        session = await _CHAN.open()
 
         def cont() -> None:
             nvim.api.exec_lua("COQts_req(...)", (session, lines_around))
 
         await async_call(nvim, cont)
 
-        while True:
-            ses, done, reply, elapsed = _SESSION
-            if ses == session and done:
-                return _vaildate(reply), elapsed
-
-            elif ses > session:
-                return iter(()), -1
-
-            else:
-                async with _COND:
-                    await _COND.wait()
+        resp: Tuple[Iterator[Payload], float] = iter(()), -1
+        async for reply, elapsed in _CHAN.recv(session):
+            resp = _vaildate(reply), elapsed
+        return resp
@@ -0,0 +1,50 @@
+from random import choice, randint, seed
+from unittest import TestCase
+
+from ....coq.clients.cache.index import Index
+from ....coq.shared.settings import Options
+
+_OPTS = Options(
+    unifying_chars=set(),
+    max_results=50,
+    proximate_lines=0,
+    look_ahead=2,
+    exact_matches=2,
+    fuzzy_cutoff=0.6,
+)
+_ALPHABET = "abcdAB_"
+
+
+def _word(hi: int) -> str:
+    return "".join(choice(_ALPHABET) for _ in range(randint(1, hi)))
+
+
+class Narrow(TestCase):
+    def test_1(self) -> None:
+        index = Index()
+        index.insert(("abc", "abd", "Abe", "xyz", ""))
+        self.assertEqual(
+            sorted(index.select(_OPTS, word="ab", limitless=True)),
+            ["Abe", "abc", "abd"],
+        )
+        self.assertFalse(index.select(_OPTS, word="", limitless=True))
+
+        index.clear()
+        self.assertFalse(index.select(_OPTS, word="ab", limitless=True))
+
+    def test_2(self) -> None:
+        seed(0)
+        words = tuple(_word(10) for _ in range(1000))
+        index = Index()
+        index.insert(words)
+        for _ in range(100):
+            needle = _word(6)
+            for idx in range(1, len(needle) + 1):
+                narrowed = index.select(_OPTS, word=needle[:idx], limitless=True)
+                fresh = Index()
+                fresh.insert(words)
+                self.assertEqual(
+                    narrowed,
+                    fresh.select(_OPTS, word=needle[:idx], limitless=True),
+                    needle[:idx],
+                )
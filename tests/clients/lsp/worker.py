@@ -0,0 +1,159 @@
+from asyncio import run
+from dataclasses import replace
+from types import SimpleNamespace
+from typing import (
+    AbstractSet,
+    Any,
+    AsyncIterator,
+    Mapping,
+    MutableSequence,
+    Sequence,
+)
+from unittest import TestCase
+from unittest.mock import patch
+from uuid import uuid4
+
+from ....coq.clients.lsp import worker as lsp_worker
+from ....coq.lsp.parse import parse
+from ....coq.lsp.types import LSPcomp
+from ....coq.shared.context import EMPTY_CONTEXT
+from ....coq.shared.settings import Options
+from ....coq.shared.types import Context
+
+_OPTS = Options(
+    unifying_chars=set(),
+    max_results=50,
+    proximate_lines=0,
+    look_ahead=2,
+    exact_matches=2,
+    fuzzy_cutoff=0.6,
+)
+
+_CLIENT: Any = SimpleNamespace(
+    short_name="LSP", weight_adjust=0, trim_payload=True, prefilter=False
+)
+
+
+def _context(line_before: str) -> Context:
+    return replace(
+        EMPTY_CONTEXT,
+        manual=False,
+        change_id=uuid4(),
+        line_before=line_before,
+        words_before=line_before,
+        position=(0, len(line_before)),
+    )
+
+
+class Servers(TestCase):
+    def test_1(self) -> None:
+        asked: MutableSequence[AbstractSet[str]] = []
+
+        async def request(
+            nvim: Any,
+            keep: Any,
+            limit: int,
+            skip: AbstractSet[str],
+            **_: Any,
+        ) -> AsyncIterator[LSPcomp]:
+            asked.append(skip)
+            replies: Mapping[str, Any] = {
+                "complete": {"isIncomplete": False, "items": [{"label": "abcd"}]},
+                "incomplete": {"isIncomplete": True, "items": [{"label": "abce"}]},
+            }
+            for client, resp in replies.items():
+                if client not in skip:
+                    lc = parse("", weight_adjust=0, keep=keep, limit=limit, resp=resp)
+                    yield replace(lc, client=client)
+
+        async def cont() -> Sequence[Sequence[str]]:
+            supervisor: Any = SimpleNamespace(
+                options=_OPTS, nvim=None, register=lambda *_, **__: None
+            )
+            worker = lsp_worker.Worker(supervisor, options=_CLIENT, misc=None)
+
+            acc = []
+            for line_before in ("ab", "abc"):
+                comps = [
+                    comp.sort_by
+                    async for comp in worker.work(_context(line_before))
+                    if comp
+                ]
+                acc.append(sorted(comps))
+
+            self.assertEqual(set(worker.latencies()), {"complete", "incomplete"})
+            return acc
+
+        with patch.object(lsp_worker, "request", request):
+            comps = run(cont())
+
+        self.assertEqual(asked, [set(), {"complete"}])
+        self.assertEqual(comps, [["abcd", "abce"], ["abcd", "abce"]])
+
+    def test_2(self) -> None:
+        asked: MutableSequence[AbstractSet[str]] = []
+
+        async def request(
+            nvim: Any,
+            keep: Any,
+            limit: int,
+            skip: AbstractSet[str],
+            **_: Any,
+        ) -> AsyncIterator[LSPcomp]:
+            asked.append(skip)
+            replies: Mapping[str, Any] = {
+                "complete": {"isIncomplete": False, "items": [{"label": "abcd"}]},
+                "late": {"isIncomplete": False, "items": [{"label": "abcde"}]},
+            }
+            for client, resp in replies.items():
+                # `late` misses the first request
+                if client not in skip and (client != "late" or len(asked) > 1):
+                    lc = parse("", weight_adjust=0, keep=keep, limit=limit, resp=resp)
+                    yield replace(lc, client=client)
+
+        async def cont() -> Sequence[Sequence[str]]:
+            supervisor: Any = SimpleNamespace(
+                options=_OPTS, nvim=None, register=lambda *_, **__: None
+            )
+            worker = lsp_worker.Worker(supervisor, options=_CLIENT, misc=None)
+
+            acc = []
+            for line_before in ("ab", "abc", "abcd"):
+                comps = [
+                    comp.sort_by
+                    async for comp in worker.work(_context(line_before))
+                    if comp
+                ]
+                acc.append(sorted(comps))
+            return acc
+
+        with patch.object(lsp_worker, "request", request):
+            comps = run(cont())
+
+        self.assertEqual(asked, [set(), {"complete"}, {"complete", "late"}])
+        self.assertEqual(comps, [["abcd"], ["abcd", "abcde"], ["abcde"]])
+
+    def test_3(self) -> None:
+        async def request(
+            nvim: Any, keep: Any, limit: int, **_: Any
+        ) -> AsyncIterator[LSPcomp]:
+            resp: Any = {
+                "isIncomplete": True,
+                "items": [{"label": "abc"}, {"label": "ABC"}, {"label": "abc"}],
+            }
+            lc = parse("", weight_adjust=0, keep=keep, limit=limit, resp=resp)
+            yield replace(lc, client="client")
+
+        async def cont() -> Sequence[str]:
+            supervisor: Any = SimpleNamespace(
+                options=_OPTS, nvim=None, register=lambda *_, **__: None
+            )
+            worker = lsp_worker.Worker(supervisor, options=_CLIENT, misc=None)
+            return [
+                comp.sort_by async for comp in worker.work(_context("abc")) if comp
+            ]
+
+        with patch.object(lsp_worker, "request", request):
+            comps = run(cont())
+
+        self.assertEqual(comps, ["ABC"])
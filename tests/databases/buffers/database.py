@@ -0,0 +1,55 @@
+from asyncio import run
+from unittest import TestCase
+
+from ....coq.databases.buffers.database import SQLBDB
+from .lexicon import _OPTS, _UNIFYING
+
+
+class RefCount(TestCase):
+    def test_1(self) -> None:
+        async def cont() -> None:
+            db = SQLBDB()
+            await db.set_lines(
+                1,
+                filetype="",
+                lo=0,
+                hi=-1,
+                lines=("abc abd", "abc", "abc"),
+                unifying_chars=_UNIFYING,
+            )
+            words = await db.words(_OPTS, filetype=None, word="ab", limitless=True)
+            self.assertEqual(sorted(words), ["abc", "abd"])
+
+            await db.set_lines(
+                1, filetype="", lo=0, hi=2, lines=(), unifying_chars=_UNIFYING
+            )
+            words = await db.words(_OPTS, filetype=None, word="ab", limitless=True)
+            self.assertEqual(sorted(words), ["abc"])
+
+            await db.set_lines(
+                1, filetype="", lo=0, hi=-1, lines=(), unifying_chars=_UNIFYING
+            )
+            words = await db.words(_OPTS, filetype=None, word="ab", limitless=True)
+            self.assertEqual(sorted(words), [])
+
+        run(cont())
+
+    def test_2(self) -> None:
+        async def cont() -> None:
+            db = SQLBDB()
+            for buf_id in (1, 2):
+                await db.set_lines(
+                    buf_id,
+                    filetype=str(buf_id),
+                    lo=0,
+                    hi=-1,
+                    lines=("abc",),
+                    unifying_chars=_UNIFYING,
+                )
+            await db.del_bufs({1})
+            words = await db.words(_OPTS, filetype="1", word="ab", limitless=True)
+            self.assertEqual(sorted(words), [])
+            words = await db.words(_OPTS, filetype=None, word="ab", limitless=True)
+            self.assertEqual(sorted(words), ["abc"])
+
+        run(cont())
@@ -0,0 +1,145 @@
+from asyncio import run
+from random import choice, randint, seed
+from time import perf_counter
+from typing import Sequence
+from unittest import TestCase
+
+from ....coq.databases.buffers.database import BDB, SQLBDB
+from ....coq.databases.buffers.lexicon import LBDB, Lexicon
+from ....coq.shared.settings import Options
+
+_OPTS = Options(
+    unifying_chars={"-", "_"},
+    max_results=50,
+    proximate_lines=0,
+    look_ahead=2,
+    exact_matches=2,
+    fuzzy_cutoff=0.6,
+)
+_UNIFYING = frozenset(_OPTS.unifying_chars)
+_ALPHABET = "abcde_ "
+
+
+def _rand_lines(n: int) -> Sequence[str]:
+    return tuple(
+        "".join(choice(_ALPHABET) for _ in range(randint(0, 30))) for _ in range(n)
+    )
+
+
+async def _fill(db: BDB) -> None:
+    for buf_id in range(1, 5):
+        filetype = "odd" if buf_id % 2 else "even"
+        await db.set_lines(
+            buf_id,
+            filetype=filetype,
+            lo=0,
+            hi=-1,
+            lines=_rand_lines(200),
+            unifying_chars=_UNIFYING,
+        )
+        for _ in range(20):
+            lo = randint(0, 150)
+            await db.set_lines(
+                buf_id,
+                filetype=filetype,
+                lo=lo,
+                hi=lo + randint(0, 10),
+                lines=_rand_lines(randint(0, 10)),
+                unifying_chars=_UNIFYING,
+            )
+    await db.del_bufs({4})
+    await db.ft_update(3, filetype="even")
+
+
+class Lex(TestCase):
+    def test_1(self) -> None:
+        lex = Lexicon()
+        lex.set_lines(1, "", lo=0, hi=-1, lines=("abc abd",), unifying_chars=_UNIFYING)
+        lex.set_lines(2, "", lo=0, hi=-1, lines=("abc",), unifying_chars=_UNIFYING)
+        self.assertEqual(sorted(lex.words(_OPTS, None, "ab", False)), ["abc", "abd"])
+
+        lex.drop({1})
+        self.assertEqual(sorted(lex.words(_OPTS, None, "ab", False)), ["abc"])
+
+        lex.drop({2})
+        self.assertEqual(sorted(lex.words(_OPTS, None, "ab", False)), [])
+
+    def test_2(self) -> None:
+        lex = Lexicon()
+        lex.set_lines(1, "a", lo=0, hi=-1, lines=("abc",), unifying_chars=_UNIFYING)
+        lex.set_lines(2, "b", lo=0, hi=-1, lines=("abd",), unifying_chars=_UNIFYING)
+        self.assertEqual(sorted(lex.words(_OPTS, "a", "ab", False)), ["abc"])
+
+        lex.ft_update(2, filetype="a")
+        self.assertEqual(sorted(lex.words(_OPTS, "a", "ab", False)), ["abc", "abd"])
+
+    def test_3(self) -> None:
+        lex = Lexicon()
+        lex.set_lines(1, "", lo=0, hi=-1, lines=("abc",), unifying_chars=_UNIFYING)
+        lex.set_lines(1, "", lo=0, hi=1, lines=(), unifying_chars=_UNIFYING)
+        count, _ = lex.lines(1, lo=0, hi=-1)
+        self.assertEqual(count, 1)
+        self.assertEqual(sorted(lex.words(_OPTS, None, "ab", False)), [])
+
+    def test_4(self) -> None:
+        lex = Lexicon()
+        lines = ("abc", "abc abd")
+        lex.set_lines(1, "a", lo=0, hi=-1, lines=lines, unifying_chars=_UNIFYING)
+        lex.set_lines(1, "a", lo=1, hi=2, lines=(), unifying_chars=_UNIFYING)
+        self.assertEqual(sorted(lex.words(_OPTS, "a", "ab", False)), ["abc"])
+
+        lex.ft_update(1, filetype="b")
+        self.assertEqual(sorted(lex.words(_OPTS, "a", "ab", False)), [])
+        self.assertEqual(sorted(lex.words(_OPTS, "b", "ab", False)), ["abc"])
+
+
+class Equivalence(TestCase):
+    def test_1(self) -> None:
+        async def cont() -> None:
+            for rnd in range(3):
+                seed(rnd)
+                sql_db = SQLBDB()
+                await _fill(sql_db)
+                seed(rnd)
+                lex_db = LBDB()
+                await _fill(lex_db)
+
+                for buf_id in range(1, 5):
+                    l_count, _ = sql_db.lines(buf_id, lo=0, hi=-1)
+                    r_count, _ = lex_db.lines(buf_id, lo=0, hi=-1)
+                    self.assertEqual(l_count, r_count)
+
+                for _ in range(100):
+                    word = "".join(choice(_ALPHABET[:-1]) for _ in range(randint(1, 6)))
+                    for filetype in (None, "odd", "even"):
+                        lhs = await sql_db.words(
+                            _OPTS, filetype=filetype, word=word, limitless=True
+                        )
+                        rhs = await lex_db.words(
+                            _OPTS, filetype=filetype, word=word, limitless=True
+                        )
+                        self.assertEqual(sorted(lhs), sorted(rhs), (word, filetype))
+
+        run(cont())
+
+
+class Bench(TestCase):
+    def test_1(self) -> None:
+        async def cont() -> None:
+            seed(0)
+            queries = tuple(
+                "".join(choice(_ALPHABET[:-1]) for _ in range(randint(1, 6)))
+                for _ in range(300)
+            )
+            for db in (SQLBDB(), LBDB()):
+                seed(0)
+                t1 = perf_counter()
+                await _fill(db)
+                t2 = perf_counter()
+                for word in queries:
+                    await db.words(_OPTS, filetype=None, word=word, limitless=False)
+                t3 = perf_counter()
+                name = type(db).__name__.ljust(6)
+                print(f"{name} :: fill {t2 - t1:.3f}s :: query {t3 - t2:.3f}s")
+
+        run(cont())
@@ -0,0 +1,68 @@
+from typing import Any, MutableSequence
+from unittest import TestCase
+
+from ...coq.lsp.parse import parse
+
+
+def _item(label: str, **kwargs: Any) -> Any:
+    return {"label": label, **kwargs}
+
+
+def _resp(incomplete: bool) -> Any:
+    return {
+        "isIncomplete": incomplete,
+        "items": [
+            _item("abc"),
+            _item("xyz", filterText="abd"),
+            _item(
+                "qrs",
+                textEdit={
+                    "newText": "abe",
+                    "range": {
+                        "start": {"line": 0, "character": 0},
+                        "end": {"line": 0, "character": 1},
+                    },
+                },
+            ),
+            _item("def"),
+            _item(""),
+        ],
+    }
+
+
+class Parse(TestCase):
+    def test_1(self) -> None:
+        seen: MutableSequence[str] = []
+
+        def keep(sort_by: str) -> bool:
+            seen.append(sort_by)
+            return sort_by.startswith("ab")
+
+        lc = parse("", weight_adjust=0, keep=keep, limit=10, resp=_resp(True))
+        self.assertFalse(lc.local_cache)
+        self.assertEqual(sorted(c.sort_by for c in lc.items), ["abc", "abd", "abe"])
+        self.assertEqual(tuple(lc.rest), ())
+        self.assertEqual(sorted(seen), ["abc", "abd", "abe", "def"])
+
+    def test_2(self) -> None:
+        lc = parse(
+            "",
+            weight_adjust=0,
+            keep=lambda s: s.startswith("ab"),
+            limit=2,
+            resp=_resp(False),
+        )
+        self.assertTrue(lc.local_cache)
+        self.assertEqual(len(tuple(lc.items)), 2)
+        self.assertEqual(len(tuple(lc.rest)), 2)
+
+    def test_3(self) -> None:
+        lc = parse(
+            "",
+            weight_adjust=0,
+            keep=lambda _: True,
+            limit=1,
+            resp=_resp(True),
+        )
+        self.assertEqual(len(tuple(lc.items)), 1)
+        self.assertEqual(tuple(lc.rest), ())
@@ -0,0 +1,144 @@
+from asyncio import run
+from random import choice, randint, seed
+from typing import Any, MutableSequence, Sequence, cast
+from unittest import TestCase
+
+from ...coq.databases.buffers.lexicon import LBDB
+from ...coq.server.indexer import Indexer, Span, merge
+from ...coq.shared.settings import Options
+
+_OPTS = Options(
+    unifying_chars={"-", "_"},
+    max_results=50,
+    proximate_lines=0,
+    look_ahead=2,
+    exact_matches=2,
+    fuzzy_cutoff=0.6,
+)
+_UNIFYING = frozenset(_OPTS.unifying_chars)
+_ALPHABET = "abcde_ "
+_CUTOFF = 300
+
+
+def _rand_lines(n: int, hi: int) -> Sequence[str]:
+    return tuple(
+        "".join(choice(_ALPHABET) for _ in range(randint(0, hi))) for _ in range(n)
+    )
+
+
+def _apply(buf: Sequence[str], span: Span) -> Sequence[str]:
+    lo, hi, lines = span
+    return (*buf[:lo], *lines, *buf[hi if hi >= 0 else len(buf) :])
+
+
+def _rand_span(buf: Sequence[str], tag: str) -> Span:
+    lo = randint(0, len(buf))
+    hi = -1 if randint(0, 6) == 0 else randint(lo, len(buf))
+    return lo, hi, tuple(f"{tag}{idx}" for idx in range(randint(0, 4)))
+
+
+class Merge(TestCase):
+    def test_1(self) -> None:
+        merged = merge((1, 2, ("a",)), (2, 2, ("b",)))
+        self.assertEqual(merged, (1, 2, ("a", "b")))
+
+    def test_2(self) -> None:
+        merged = merge((5, 6, ("a",)), (1, 2, ("b",)))
+        self.assertIsNone(merged)
+
+    def test_3(self) -> None:
+        merges: MutableSequence[Span] = []
+        for rnd in range(5000):
+            seed(rnd)
+            buf = tuple(f"o{idx}" for idx in range(randint(0, 12)))
+            lhs = _rand_span(buf, tag="l")
+            mid = _apply(buf, lhs)
+            rhs = _rand_span(mid, tag="r")
+            merged = merge(lhs, rhs)
+            if merged:
+                merges.append(merged)
+                self.assertEqual(_apply(buf, merged), _apply(mid, rhs))
+        self.assertTrue(merges)
+
+
+class Chunked(TestCase):
+    def test_1(self) -> None:
+        async def cont() -> None:
+            for rnd in range(20):
+                seed(rnd)
+                direct, deferred = LBDB(), LBDB()
+                indexer = Indexer(
+                    cast(Any, None),
+                    bdb=deferred,
+                    cutoff=_CUTOFF,
+                    unifying_chars=_UNIFYING,
+                )
+                lines = _rand_lines(50, hi=10)
+                for db in (direct, deferred):
+                    await db.set_lines(
+                        1,
+                        filetype="",
+                        lo=0,
+                        hi=-1,
+                        lines=lines,
+                        unifying_chars=_UNIFYING,
+                    )
+
+                for _ in range(50):
+                    count, _ = direct.lines(1, lo=0, hi=-1)
+                    lo = randint(0, count)
+                    hi = -1 if randint(0, 9) == 0 else min(count, lo + randint(0, 5))
+                    lines = _rand_lines(randint(0, 60), hi=randint(1, 30))
+
+                    await direct.set_lines(
+                        1,
+                        filetype="",
+                        lo=lo,
+                        hi=hi,
+                        lines=lines,
+                        unifying_chars=_UNIFYING,
+                    )
+                    await indexer.set_lines(1, filetype="", lo=lo, hi=hi, lines=lines)
+                    for _ in range(randint(0, 2)):
+                        await indexer.step()
+
+                    l_count, _ = direct.lines(1, lo=0, hi=-1)
+                    r_count, _ = deferred.lines(1, lo=0, hi=-1)
+                    self.assertEqual(l_count, r_count)
+
+                while await indexer.step():
+                    pass
+
+                for _ in range(50):
+                    word = "".join(choice(_ALPHABET[:-1]) for _ in range(randint(1, 4)))
+                    lhs = await direct.words(
+                        _OPTS, filetype=None, word=word, limitless=True
+                    )
+                    rhs = await deferred.words(
+                        _OPTS, filetype=None, word=word, limitless=True
+                    )
+                    self.assertEqual(sorted(lhs), sorted(rhs), word)
+
+        run(cont())
+
+    def test_2(self) -> None:
+        async def cont() -> None:
+            db = LBDB()
+            indexer = Indexer(
+                cast(Any, None), bdb=db, cutoff=600, unifying_chars=_UNIFYING
+            )
+            line = " ".join(f"w{idx}" for idx in range(1000))
+            deferred = await indexer.set_lines(
+                1, filetype="", lo=0, hi=-1, lines=(line,)
+            )
+            self.assertTrue(deferred)
+            words = await db.words(_OPTS, filetype=None, word="w1", limitless=True)
+            self.assertEqual(tuple(words), ())
+
+            self.assertFalse(await indexer.step())
+            words = await db.words(_OPTS, filetype=None, word="w1", limitless=True)
+            self.assertIn("w10", tuple(words))
+            words = await db.words(_OPTS, filetype=None, word="w99", limitless=True)
+            self.assertNotIn("w999", tuple(words))
+
+        run(cont())
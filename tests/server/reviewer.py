@@ -1,7 +1,31 @@
-from random import uniform
+from collections import Counter
+from dataclasses import replace
+from random import choice, randint, seed, uniform
+from typing import Any, Sequence
 from unittest import TestCase
+from uuid import UUID
 
-from ...coq.server.reviewer import sigmoid
+from ...coq.server.reviewer import Derived, DerivedKey, Proximity, Reviewer, sigmoid
+from ...coq.shared.context import EMPTY_CONTEXT
+from ...coq.shared.lru import LRU
+from ...coq.shared.parse import coalesce
+from ...coq.shared.settings import IconMode, Icons, Options
+from ...coq.shared.types import Completion, Edit
+
+_OPTS = Options(
+    unifying_chars={"_"},
+    max_results=50,
+    proximate_lines=0,
+    look_ahead=2,
+    exact_matches=2,
+    fuzzy_cutoff=0.6,
+)
+_ICONS = Icons(
+    mode=IconMode.short,
+    spacing=1,
+    aliases={},
+    mappings={"Function": "F"},
+)
 
 
 class Sigmoid(TestCase):
@@ -13,3 +37,99 @@ class Sigmoid(TestCase):
         for _ in range(0, 10000):
             y = sigmoid(uniform(-10, 10))
             self.assertTrue(y >= 0.5 and y <= 1.5)
+
+
+class Window(TestCase):
+    def test_1(self) -> None:
+        seed(0)
+        unifying_chars, radius = {"_"}, 16
+
+        def line() -> str:
+            return "".join(choice("ab_ .") for _ in range(randint(0, 20)))
+
+        def edit(lo: int, hi: int, lines: Sequence[str]) -> None:
+            end = hi if hi >= 0 else len(buf)
+            buf[lo:end] = lines
+            proximity.edit(1, lo=lo, hi=hi, lines=lines)
+
+        buf = [line() for _ in range(200)]
+        proximity = Proximity(unifying_chars, size=radius * 2 + 1)
+
+        for _ in range(300):
+            row = randint(0, len(buf) - 1)
+            op = randint(0, 5)
+            if op == 0:
+                edit(row, row, lines=("a_b",))
+            elif op == 1 and len(buf) > 50:
+                edit(row, min(len(buf), row + randint(1, 3)), lines=())
+            elif op == 2:
+                edit(row, -1, lines=[line() for _ in range(randint(0, 50))])
+            elif op == 3:
+                edit(0, row, lines=[line() for _ in range(randint(0, 50))])
+            else:
+                edit(row, row + 1, lines=(line(),))
+
+            buf = buf or [""]
+            row = min(row, len(buf) - 1)
+            if randint(0, 5) == 0:
+                # missed event on the cursor line
+                buf[row] = line()
+
+            lo = max(0, row - radius)
+            context = replace(
+                EMPTY_CONTEXT,
+                buf_id=1,
+                position=(row, 0),
+                lines=buf[lo : row + radius + 1],
+                lines_before=buf[lo:row],
+            )
+            expected = Counter(
+                word
+                for line in context.lines
+                for word in coalesce(line, unifying_chars=unifying_chars)
+            )
+            self.assertEqual(proximity.update(context), expected)
+
+    def test_2(self) -> None:
+        proximity = Proximity({"_"}, size=3)
+        context = replace(
+            EMPTY_CONTEXT,
+            buf_id=1,
+            position=(0, 0),
+            lines=("a b",),
+            lines_before=(),
+        )
+        counts = proximity.update(context)
+        with self.assertRaises(TypeError):
+            counts["a"] = 2  # type: ignore
+
+        context = replace(context, buf_id=2, lines=("c",))
+        self.assertEqual(proximity.update(context), {"c": 1})
+
+
+class Transforms(TestCase):
+    def test_1(self) -> None:
+        cache: LRU[DerivedKey, Derived] = LRU(size=10)
+        db: Any = None
+        proximity = Proximity(_OPTS.unifying_chars, size=1)
+        reviewer = Reviewer(
+            _OPTS, icons=_ICONS, db=db, cache=cache, proximity=proximity
+        )
+        comps = tuple(
+            Completion(
+                source="",
+                weight_adjust=0,
+                label=word,
+                sort_by=word,
+                primary_edit=Edit(new_text=word),
+                icon_match="Function",
+            )
+            for word in ("Abc", "_d")
+        )
+
+        for _ in range(3):
+            metrics = tuple(reviewer.trans_many(UUID(int=0), completions=comps))
+            self.assertEqual([metric.comp.kind for metric in metrics], ["F", "F"])
+
+        self.assertEqual((cache.hits, cache.misses), (4, 2))
+        self.assertEqual(cache[("Abc", "", "Function", "Abc", 2)].l_sort_by, "abc")
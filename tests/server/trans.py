@@ -0,0 +1,122 @@
+from dataclasses import asdict, replace
+from locale import strxfrm
+from random import choice, randint, seed, uniform
+from time import perf_counter
+from types import SimpleNamespace
+from typing import Any, Sequence
+from unittest import TestCase
+from uuid import UUID
+
+from ...coq.server.trans import trans
+from ...coq.shared.context import EMPTY_CONTEXT
+from ...coq.shared.runtime import Collected, Metric, TopK
+from ...coq.shared.settings import PumDisplay, Weights
+from ...coq.shared.types import Completion, Edit
+
+_WEIGHTS = Weights(prefix_matches=2, edit_distance=1.5, recency=1, proximity=0.5)
+
+_STACK: Any = SimpleNamespace(
+    settings=SimpleNamespace(
+        display=SimpleNamespace(
+            pum=PumDisplay(
+                fast_close=True,
+                y_ratio=0.3,
+                y_max_len=16,
+                x_max_len=66,
+                x_truncate_len=12,
+                ellipsis="…",
+                kind_context=(" [", "]"),
+                source_context=("「", "」"),
+            )
+        ),
+        match=SimpleNamespace(max_results=33),
+        weights=_WEIGHTS,
+    )
+)
+
+
+def _metrics(n: int) -> Sequence[Metric]:
+    def cont(idx: int) -> Metric:
+        word = "".join(choice("abcAB_") for _ in range(randint(1, 8))) + str(idx)
+        weight = Weights(
+            prefix_matches=randint(0, 4),
+            edit_distance=uniform(0, 1),
+            recency=randint(0, 3),
+            proximity=randint(0, 9),
+        )
+        return Metric(
+            instance=UUID(int=0),
+            comp=Completion(
+                source="",
+                weight_adjust=0,
+                label=word,
+                sort_by=word,
+                primary_edit=Edit(new_text=word),
+                icon_match=None,
+            ),
+            weight_adjust=uniform(0.5, 1.5),
+            weight=weight,
+            vector=(
+                weight.prefix_matches,
+                weight.edit_distance,
+                weight.recency,
+                weight.proximity,
+            ),
+            label_width=len(word),
+            kind_width=0,
+        )
+
+    return tuple(cont(idx) for idx in range(n))
+
+
+def _collected(metrics: Sequence[Metric]) -> Collected:
+    top = TopK(len(metrics), adjustment=_WEIGHTS)
+    top.push(metrics)
+    return top.collected()
+
+
+def _reference(metrics: Sequence[Metric]) -> Sequence[str]:
+    totals = {
+        key: sum(asdict(metric.weight)[key] for metric in metrics)
+        for key in asdict(_WEIGHTS)
+    }
+    adjust = {
+        key: totals[key] / val if val else 0 for key, val in asdict(_WEIGHTS).items()
+    }
+
+    def key_by(metric: Metric) -> Any:
+        tot = sum(
+            val / adjust[key] if adjust[key] else 0
+            for key, val in asdict(metric.weight).items()
+        )
+        return (
+            -round(tot * metric.weight_adjust * 1000),
+            -metric.comp.sort_by[:1].isalnum(),
+            strxfrm(metric.comp.sort_by),
+        )
+
+    return tuple(metric.comp.sort_by for metric in sorted(metrics, key=key_by))
+
+
+class Rank(TestCase):
+    def test_1(self) -> None:
+        seed(0)
+        metrics = _metrics(500)
+        context = replace(EMPTY_CONTEXT, manual=True, words_before="A")
+        ranked = tuple(
+            comp.user_data.sort_by if comp.user_data else ""
+            for comp in trans(_STACK, context=context, collected=_collected(metrics))
+        )
+        self.assertEqual(ranked, _reference(metrics))
+
+
+class Bench(TestCase):
+    def test_1(self) -> None:
+        seed(0)
+        collected = _collected(_metrics(5000))
+        context = replace(EMPTY_CONTEXT, manual=True)
+        for _ in range(2):
+            t1 = perf_counter()
+            comps = tuple(trans(_STACK, context=context, collected=collected))
+            t2 = perf_counter()
+            print(f"trans :: {len(comps)} metrics :: {t2 - t1:.3f}s")
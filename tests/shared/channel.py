@@ -0,0 +1,64 @@
+from asyncio import create_task, run, sleep, wait_for
+from typing import MutableSequence
+from unittest import TestCase
+
+from ...coq.shared.channel import Channel
+
+
+class Stream(TestCase):
+    def test_1(self) -> None:
+        async def cont() -> None:
+            chan: Channel[int] = Channel()
+            uid = await chan.open()
+            await chan.send(uid, item=1, done=False)
+            await chan.send(uid, item=2, done=False)
+            await chan.send(uid, item=3, done=True)
+            self.assertEqual([i async for i in chan.recv(uid)], [1, 2, 3])
+
+        run(cont())
+
+    def test_2(self) -> None:
+        async def cont() -> None:
+            chan: Channel[int] = Channel()
+            stale = await chan.open()
+            uid = await chan.open()
+            await chan.send(stale, item=1, done=True)
+            await chan.send(uid, item=2, done=True)
+            self.assertEqual([i async for i in chan.recv(stale)], [])
+            self.assertEqual([i async for i in chan.recv(uid)], [2])
+
+        run(cont())
+
+    def test_3(self) -> None:
+        async def cont() -> None:
+            chan: Channel[int] = Channel(maxsize=1)
+            uid = await chan.open()
+            acc: MutableSequence[int] = []
+
+            async def recv() -> None:
+                async for i in chan.recv(uid):
+                    acc.append(i)
+                    await sleep(0)
+
+            await chan.send(uid, item=1, done=False)
+            blocked = create_task(chan.send(uid, item=2, done=True))
+            await sleep(0)
+            self.assertFalse(blocked.done())
+
+            await wait_for(recv(), timeout=1)
+            await blocked
+            self.assertEqual(acc, [1, 2])
+
+        run(cont())
+
+    def test_4(self) -> None:
+        async def cont() -> None:
+            chan: Channel[int] = Channel(maxsize=1)
+            uid = await chan.open()
+            await chan.send(uid, item=1, done=False)
+            blocked = create_task(chan.send(uid, item=2, done=False))
+            await sleep(0)
+            await chan.open()
+            await wait_for(blocked, timeout=1)
+
+        run(cont())
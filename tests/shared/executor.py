@@ -0,0 +1,58 @@
+from asyncio import CancelledError, gather, run, sleep
+from threading import Event
+from typing import MutableSequence
+from unittest import TestCase
+
+from ...coq.shared.executor import Lane, SingleThreadExecutor
+
+
+class Lanes(TestCase):
+    def test_1(self) -> None:
+        ex = SingleThreadExecutor()
+        self.assertEqual(ex.submit(lambda x: x + 1, 1), 2)
+
+    def test_2(self) -> None:
+        async def cont() -> None:
+            ex = SingleThreadExecutor()
+            gate = Event()
+            acc: MutableSequence[str] = []
+
+            blocked = ex.run(gate.wait, lane=Lane.background)
+            bg = ex.run(lambda: acc.append("bg"), lane=Lane.background)
+            fg = ex.run(lambda: acc.append("fg"))
+            gate.set()
+            await gather(blocked, bg, fg)
+            self.assertEqual(acc, ["fg", "bg"])
+
+        run(cont())
+
+    def test_3(self) -> None:
+        async def cont() -> None:
+            ex = SingleThreadExecutor()
+            gate = Event()
+            acc: MutableSequence[int] = []
+
+            blocked = ex.run(gate.wait)
+            dropped = ex.run(lambda: acc.append(1))
+            dropped.cancel()
+            gate.set()
+            await blocked
+            await ex.run(lambda: None)
+            with self.assertRaises(CancelledError):
+                await dropped
+            self.assertEqual(acc, [])
+
+        run(cont())
+
+    def test_4(self) -> None:
+        def boom() -> None:
+            raise ValueError()
+
+        async def cont() -> None:
+            ex = SingleThreadExecutor()
+            with self.assertRaises(ValueError):
+                await ex.run(boom)
+            await sleep(0)
+            self.assertEqual(await ex.run(lambda: 1), 1)
+
+        run(cont())
@@ -1,8 +1,50 @@
+from random import choice, randint
+from typing import Callable, MutableSequence
 from unittest import TestCase
+from uuid import uuid4
 
-from ...coq.shared.fuzzy import dl_distance, metrics, multi_set_ratio, quick_ratio
+from ...coq.shared.fuzzy import (
+    FuzzyMemo,
+    char_mask,
+    dl_distance,
+    metrics,
+    multi_set_ratio,
+    osa_distance,
+    quick_ratio,
+)
 
 _LOOK_AHEAD = 2
+_ALPHABET = "abcd_"
+_ROUNDS = 3000
+
+
+def _rand_str(hi: int) -> str:
+    return "".join(choice(_ALPHABET) for _ in range(randint(0, hi)))
+
+
+def _osa_ref(lhs: str, rhs: str) -> int:
+    len_l, len_r = len(lhs), len(rhs)
+    d: MutableSequence[MutableSequence[int]] = [
+        [0 for _ in range(len_r + 1)] for _ in range(len_l + 1)
+    ]
+    for i in range(len_l + 1):
+        d[i][0] = i
+    for j in range(len_r + 1):
+        d[0][j] = j
+
+    for i in range(1, len_l + 1):
+        for j in range(1, len_r + 1):
+            cost = 0 if lhs[i - 1] == rhs[j - 1] else 1
+            d[i][j] = min(d[i - 1][j] + 1, d[i][j - 1] + 1, d[i - 1][j - 1] + cost)
+            if (
+                i > 1
+                and j > 1
+                and lhs[i - 1] == rhs[j - 2]
+                and lhs[i - 2] == rhs[j - 1]
+            ):
+                d[i][j] = min(d[i][j], d[i - 2][j - 2] + 1)
+
+    return d[len_l][len_r]
 
 
 class MultiSetRatio(TestCase):
@@ -69,6 +111,33 @@ class QuickRatio(TestCase):
         self.assertAlmostEqual(ratio, 1 / 2)
 
 
+class CharMask(TestCase):
+    def test_1(self) -> None:
+        self.assertEqual(char_mask(""), 0)
+
+    def test_2(self) -> None:
+        self.assertEqual(char_mask("abba"), char_mask("ab"))
+
+    def test_3(self) -> None:
+        for _ in range(_ROUNDS):
+            self.assertLess(char_mask(_rand_str(20)), 2 ** 63)
+
+    def test_4(self) -> None:
+        """
+        Prefilter in `select/*.sql` is only sound under this bound
+        """
+
+        for _ in range(_ROUNDS):
+            cword = _rand_str(10)
+            match = cword[: randint(0, len(cword))] + _rand_str(10)
+            if cword and len(match) >= len(cword):
+                missing = bin(char_mask(cword) & ~char_mask(match)).count("1")
+                ratio = quick_ratio(cword, match, look_ahead=_LOOK_AHEAD)
+                self.assertLessEqual(
+                    ratio, 1 - missing / len(cword) + 1e-9, (cword, match)
+                )
+
+
 class EditD(TestCase):
     def test_1(self) -> None:
         lhs = ""
@@ -125,6 +194,57 @@ class EditD(TestCase):
         self.assertEqual(d, 2)
 
 
+class OSA(TestCase):
+    def test_1(self) -> None:
+        lhs = ""
+        rhs = "abc"
+        d = osa_distance(lhs, rhs)
+        self.assertEqual(d, 3)
+
+    def test_2(self) -> None:
+        lhs = "abc"
+        rhs = ""
+        d = osa_distance(lhs, rhs)
+        self.assertEqual(d, 3)
+
+    def test_3(self) -> None:
+        lhs = "badc"
+        rhs = "abcd"
+        d = osa_distance(lhs, rhs)
+        self.assertEqual(d, 2)
+
+    def test_4(self) -> None:
+        lhs = "ca"
+        rhs = "abc"
+        d = osa_distance(lhs, rhs)
+        self.assertEqual(d, 3)
+
+    def test_5(self) -> None:
+        lhs = "supervisor"
+        rhs = "pervisor"
+        d = osa_distance(lhs, rhs)
+        self.assertEqual(d, 2)
+
+    def test_6(self) -> None:
+        for _ in range(_ROUNDS):
+            lhs, rhs = _rand_str(12), _rand_str(12)
+            d = osa_distance(lhs, rhs)
+            self.assertEqual(d, _osa_ref(lhs, rhs), (lhs, rhs))
+
+    def test_7(self) -> None:
+        for _ in range(_ROUNDS // 10):
+            lhs, rhs = _rand_str(100), _rand_str(100)
+            d = osa_distance(lhs, rhs)
+            self.assertEqual(d, _osa_ref(lhs, rhs), (lhs, rhs))
+
+    def test_8(self) -> None:
+        for _ in range(_ROUNDS):
+            lhs, rhs = _rand_str(12), _rand_str(12)
+            d = osa_distance(lhs, rhs)
+            self.assertEqual(d, osa_distance(rhs, lhs), (lhs, rhs))
+            self.assertLessEqual(dl_distance(lhs, rhs), d, (lhs, rhs))
+
+
 class Metrics(TestCase):
     def test_1(self) -> None:
         cword = "ab"
@@ -167,3 +287,79 @@ class Metrics(TestCase):
         m = metrics(cword, match, look_ahead=_LOOK_AHEAD)
         self.assertEqual(m.prefix_matches, 0)
         self.assertAlmostEqual(m.edit_distance, 0)
+
+    def test_7(self) -> None:
+        for _ in range(_ROUNDS):
+            cword, match = _rand_str(8), _rand_str(12)
+            m = metrics(cword, match, look_ahead=_LOOK_AHEAD)
+            shorter = min(len(cword), len(match))
+            if shorter:
+                p = m.prefix_matches
+                cutoff = min(max(len(cword), len(match)), shorter + _LOOK_AHEAD)
+                more = cutoff - shorter
+                dist = _osa_ref(cword[p:cutoff], match[p:cutoff])
+                self.assertAlmostEqual(
+                    m.edit_distance, 1 - (dist - more) / shorter, msg=(cword, match)
+                )
+
+
+class Memo(TestCase):
+    def test_1(self) -> None:
+        memo = FuzzyMemo(look_ahead=_LOOK_AHEAD)
+        memo.generation(uuid4())
+        for _ in range(_ROUNDS):
+            cword, match = _rand_str(8), _rand_str(12)
+            m = metrics(cword, match, look_ahead=_LOOK_AHEAD)
+            self.assertEqual(memo.metrics(cword, match), m)
+            self.assertEqual(memo.metrics(cword, match), m)
+
+    def test_2(self) -> None:
+        memo = FuzzyMemo(look_ahead=_LOOK_AHEAD)
+        calls = 0
+
+        def pred() -> bool:
+            nonlocal calls
+            calls += 1
+            return False
+
+        memo.generation(uuid4())
+        self.assertFalse(memo.keep("ab", "xyz", pred=pred))
+        memo.generation(uuid4())
+        self.assertFalse(memo.keep("ab", "xyz", pred=pred))
+        self.assertEqual(calls, 1)
+
+    def test_3(self) -> None:
+        memo = FuzzyMemo(look_ahead=_LOOK_AHEAD)
+        memo.generation(uuid4())
+        self.assertFalse(memo.keep("ab", "xyz", pred=lambda: False))
+        memo.generation(uuid4())
+        memo.generation(uuid4())
+        self.assertTrue(memo.keep("abc", "xyz", pred=lambda: True))
+
+    def test_4(self) -> None:
+        memo = FuzzyMemo(look_ahead=_LOOK_AHEAD)
+        memo.generation(uuid4())
+        self.assertTrue(memo.keep("ab", "abc", pred=lambda: True))
+        memo.generation(uuid4())
+        self.assertFalse(memo.keep("abc", "abc", pred=lambda: False))
+        self.assertTrue(memo.keep("abc", "abd", pred=lambda: True))
+
+
+class MemoGrowth(TestCase):
+    def test_1(self) -> None:
+        def pred(needle: str, candidate: str) -> Callable[[], bool]:
+            return lambda: (
+                multi_set_ratio(needle, candidate, look_ahead=_LOOK_AHEAD) >= 0.6
+            )
+
+        memo = FuzzyMemo(look_ahead=_LOOK_AHEAD)
+        memo.generation(uuid4())
+        for stem, needle, candidate in (
+            ("da", "daf", "efde"),
+            ("ca", "caf", "debaf"),
+            ("ef", "eff", "facfa"),
+        ):
+            self.assertFalse(memo.keep(stem, candidate, pred=pred(stem, candidate)))
+            self.assertTrue(
+                memo.keep(needle, candidate, pred=pred(needle, candidate))
+            )
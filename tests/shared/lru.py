@@ -0,0 +1,26 @@
+from unittest import TestCase
+
+from ...coq.shared.lru import LRU
+
+
+class Recency(TestCase):
+    def test_1(self) -> None:
+        lru: LRU[str, int] = LRU(size=2)
+        lru["a"], lru["b"] = 1, 2
+        self.assertEqual(lru.get("a"), 1)
+        lru["c"] = 3
+        self.assertEqual(sorted(lru), ["a", "c"])
+
+    def test_2(self) -> None:
+        lru: LRU[str, int] = LRU(size=2)
+        lru["a"], lru["b"] = 1, 2
+        lru["a"] = 3
+        self.assertEqual(sorted(lru.items()), [("a", 3), ("b", 2)])
+
+    def test_3(self) -> None:
+        lru: LRU[str, int] = LRU(size=2)
+        lru["a"] = 1
+        lru.get("a")
+        lru.get("b")
+        self.assertNotIn("b", lru)
+        self.assertEqual((lru.hits, lru.misses), (1, 1))
@@ -0,0 +1,42 @@
+from random import randint
+from unittest import TestCase
+
+from ...coq.shared.rope import Rope
+
+_ROUNDS = 2000
+
+
+class Splice(TestCase):
+    def test_1(self) -> None:
+        rope = Rope(range(10))
+        self.assertEqual(len(rope), 10)
+        self.assertEqual([*rope], [*range(10)])
+        self.assertEqual(rope[3:6], (3, 4, 5))
+        self.assertEqual(rope[-1], 9)
+
+    def test_2(self) -> None:
+        rope: Rope[int] = Rope()
+        rope[0:0] = (1, 2, 3)
+        rope[1:2] = ()
+        self.assertEqual([*rope], [1, 3])
+
+        rope[0:2] = ()
+        self.assertEqual(len(rope), 0)
+        self.assertEqual(rope[0:5], ())
+
+    def test_3(self) -> None:
+        ref = [*range(3000)]
+        rope = Rope(ref)
+        for n in range(_ROUNDS):
+            lo = randint(0, len(ref))
+            hi = lo + randint(0, 700) if randint(0, 1) else -1
+            new = [*range(n * 10_000, n * 10_000 + randint(0, 1500))]
+            ref[lo : hi if hi >= 0 else len(ref)] = new
+            rope[lo : hi if hi >= 0 else len(rope)] = new
+
+            self.assertEqual(len(rope), len(ref))
+            idx = randint(0, len(ref))
+            self.assertEqual(rope[idx : idx + 20], tuple(ref[idx : idx + 20]))
+            if ref:
+                self.assertEqual(rope[idx % len(ref)], ref[idx % len(ref)])
+        self.assertEqual([*rope], ref)
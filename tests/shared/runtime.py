@@ -0,0 +1,230 @@
+from asyncio import get_running_loop, run, sleep
+from collections import deque
+from pathlib import Path
+from time import perf_counter, sleep as block
+from types import SimpleNamespace
+from typing import (
+    Any,
+    AsyncIterator,
+    Iterator,
+    Mapping,
+    MutableSequence,
+    Optional,
+    Sequence,
+)
+from unittest import TestCase
+from uuid import UUID
+
+from ...coq.shared.runtime import (
+    Breaker,
+    Circuit,
+    Collected,
+    Metric,
+    Supervisor,
+    TopK,
+    Worker,
+    budget,
+    quantile,
+)
+from ...coq.shared.settings import Limits, Options, Weights
+
+_WEIGHTS = Weights(prefix_matches=1, edit_distance=1, recency=1, proximity=1)
+
+_OPTS = Options(
+    unifying_chars=set(),
+    max_results=50,
+    proximate_lines=0,
+    look_ahead=2,
+    exact_matches=2,
+    fuzzy_cutoff=0.6,
+)
+
+
+def _limits(quorum: float) -> Limits:
+    return Limits(
+        idle_timeout=0,
+        index_cutoff=0,
+        completion_auto_timeout=0.5,
+        completion_manual_timeout=0.5,
+        completion_first_timeout=0.05,
+        completion_quorum=quorum,
+        download_retries=0,
+        download_timeout=0,
+    )
+
+
+def _metric(comp: Any, prefix_matches: float) -> Metric:
+    return Metric(
+        instance=UUID(int=0),
+        comp=comp,
+        weight_adjust=1,
+        weight=Weights(
+            prefix_matches=prefix_matches, edit_distance=0, recency=0, proximity=0
+        ),
+        vector=(prefix_matches, 0, 0, 0),
+        label_width=0,
+        kind_width=0,
+    )
+
+
+def _comps(collected: Collected) -> Sequence[Any]:
+    return sorted(metric.comp for metric in collected.metrics)
+
+
+class _Reviewer:
+    def register(self, assoc: Any) -> None:
+        pass
+
+    async def begin(self, context: Any) -> None:
+        pass
+
+    async def s_begin(self, assoc: Any, instance: UUID) -> None:
+        pass
+
+    def trans_many(
+        self, instance: UUID, completions: Sequence[Any]
+    ) -> Iterator[Metric]:
+        for completion in completions:
+            yield _metric(completion, prefix_matches=1)
+
+    async def s_end(
+        self, instance: UUID, interrupted: bool, elapsed: float, items: int
+    ) -> None:
+        pass
+
+
+class _Worker(Worker[Any, float]):
+    async def work(self, context: Any) -> AsyncIterator[Optional[Any]]:
+        await sleep(self._misc)
+        yield str(self._misc)
+
+
+def _collect(
+    quorum: float, delays: Sequence[float], history: Mapping[str, float] = {}
+) -> Sequence[Sequence[Any]]:
+    async def cont() -> Sequence[Sequence[Any]]:
+        nvim: Any = SimpleNamespace(loop=get_running_loop())
+        supervisor = Supervisor(
+            pool=None,  # type: ignore
+            nvim=nvim,
+            vars_dir=Path(),
+            options=_OPTS,
+            limits=_limits(quorum),
+            weights=_WEIGHTS,
+            reviewer=_Reviewer(),
+        )
+        latencies = supervisor.latencies()
+        for name, latency in history.items():
+            latencies[(name, "")] = deque(latency for _ in range(100))  # type: ignore
+
+        # supervisor only holds weak refs
+        workers = tuple(
+            _Worker(
+                supervisor, options=SimpleNamespace(short_name=str(delay)), misc=delay
+            )
+            for delay in delays
+        )
+        pums: MutableSequence[Sequence[Any]] = []
+
+        async def early(collected: Collected) -> None:
+            pums.append(_comps(collected))
+
+        collected = await supervisor.collect(
+            SimpleNamespace(manual=False, filetype=""), early=early  # type: ignore
+        )
+        pums.append(_comps(collected))
+        del workers
+        return pums
+
+    return run(cont())
+
+
+class Progressive(TestCase):
+    def test_1(self) -> None:
+        pums = _collect(0.5, delays=(0, 0.2))
+        self.assertEqual(pums, [["0"], ["0", "0.2"]])
+
+    def test_2(self) -> None:
+        pums = _collect(1, delays=(0, 0))
+        self.assertEqual(pums, [["0", "0"]])
+
+    def test_3(self) -> None:
+        pums = _collect(1, delays=(0, 0.2))
+        self.assertEqual(pums, [["0"], ["0", "0.2"]])
+
+
+class Budget(TestCase):
+    def test_1(self) -> None:
+        self.assertEqual(budget((), timeout=0.5), 0.5)
+        self.assertEqual(budget((0.1,) * 10, timeout=0.5), 0.1 * 1.2)
+        self.assertEqual(budget((1,) * 10, timeout=0.5), 0)
+
+    def test_2(self) -> None:
+        t1 = perf_counter()
+        pums = _collect(1, delays=(0, 0.3), history={"0.3": 1})
+        self.assertEqual(pums, [["0"], ["0"]])
+        self.assertLess(perf_counter() - t1, 0.25)
+
+    def test_3(self) -> None:
+        pums = _collect(1, delays=(0, 0.3), history={"0.3": 0.35})
+        self.assertEqual(pums, [["0"], ["0", "0.3"]])
+
+    def test_4(self) -> None:
+        ordered = tuple(range(1, 11))
+        self.assertEqual(quantile((), q=0.95), 0)
+        self.assertEqual(quantile(ordered, q=0.5), 5)
+        self.assertEqual(quantile(ordered, q=0.95), 10)
+        self.assertEqual(
+            budget(ordered, timeout=20), quantile(ordered, q=0.95) * 1.2
+        )
+
+
+class Circuits(TestCase):
+    def test_1(self) -> None:
+        breaker = Breaker(threshold=2, backoff=0.05)
+        self.assertFalse(breaker.record("a", ok=False))
+        self.assertTrue(breaker.allow("a"))
+        self.assertTrue(breaker.record("a", ok=False))
+        self.assertFalse(breaker.allow("a"))
+        self.assertTrue(breaker.allow("b"))
+        self.assertEqual(breaker.fuses()["a"].circuit, Circuit.open)
+
+        block(0.06)
+        self.assertEqual(breaker.fuses()["a"].circuit, Circuit.half_open)
+        self.assertTrue(breaker.allow("a"))
+        self.assertFalse(breaker.allow("a"))
+        self.assertFalse(breaker.record("a", ok=True))
+        self.assertTrue(breaker.allow("a"))
+        self.assertNotIn("a", breaker.fuses())
+
+    def test_2(self) -> None:
+        breaker = Breaker(threshold=1, backoff=0.05)
+        breaker.record("a", ok=False)
+        block(0.06)
+        self.assertTrue(breaker.allow("a"))
+        self.assertTrue(breaker.record("a", ok=False))
+        fuse = breaker.fuses()["a"]
+        self.assertEqual(fuse.trips, 2)
+        self.assertGreater(fuse.retry_in, 0.06)
+
+    def test_3(self) -> None:
+        breaker = Breaker(threshold=1, backoff=0)
+        breaker.record("a", ok=False)
+        self.assertTrue(breaker.allow("a"))
+        breaker.release("a")
+        self.assertTrue(breaker.allow("a"))
+
+
+class Heap(TestCase):
+    def test_1(self) -> None:
+        top = TopK(3, adjustment=_WEIGHTS)
+        top.push(_metric(str(n), prefix_matches=n) for n in range(100))
+        collected = top.collected()
+        self.assertLess(len(collected.metrics), 6)
+        self.assertEqual(_comps(collected)[-3:], ["97", "98", "99"])
+        self.assertEqual(collected.totals.prefix_matches, sum(range(100)))
+
+    def test_2(self) -> None:
+        top = TopK(3, adjustment=_WEIGHTS)
+        top.push(_metric(str(n), prefix_matches=n) for n in range(2))
+        self.assertEqual(_comps(top.collected()), ["0", "1"])
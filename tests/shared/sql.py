@@ -0,0 +1,154 @@
+from asyncio import TimeoutError, create_task, run, sleep, wait_for
+from sqlite3 import Connection
+from tempfile import TemporaryDirectory
+from typing import Any, Callable, Mapping, Sequence
+from unittest import TestCase
+
+from ...coq.databases.buffers.sql import sql as buffers_sql
+from ...coq.databases.snippets.sql import sql as snippets_sql
+from ...coq.databases.tags.sql import sql as tags_sql
+from ...coq.databases.tmux.sql import sql as tmux_sql
+from ...coq.databases.treesitter.sql import sql as treesitter_sql
+from ...coq.shared.executor import SingleThreadExecutor
+from ...coq.shared.sql import Readers, cancellable, db_uris, init_db
+
+_PARAMS: Mapping[str, Any] = {
+    "exact": 2,
+    "cut_off": 0.6,
+    "look_ahead": 2,
+    "limit": 1,
+    "filetype": "",
+    "filename": "",
+    "line_num": 0,
+    "pane_id": "",
+    "word": "ab",
+}
+
+
+def _plan(sql: Callable[..., str], select: str) -> str:
+    conn = Connection(":memory:", isolation_level=None)
+    init_db(conn)
+    conn.executescript(sql("create", "pragma"))
+    conn.executescript(sql("create", "tables"))
+    cursor = conn.execute(f"EXPLAIN QUERY PLAN {sql('select', select)}", _PARAMS)
+    plan = "\n".join(row[3] for row in cursor.fetchall())
+    conn.close()
+    return plan
+
+
+class QueryPlan(TestCase):
+    def test_1(self) -> None:
+        plan = _plan(buffers_sql, select="words")
+        self.assertIn("USING INDEX words_lword (lword>? AND lword<?)", plan)
+
+    def test_2(self) -> None:
+        plan = _plan(tags_sql, select="tags")
+        self.assertIn("USING INDEX tags_lnam (lname>? AND lname<?)", plan)
+
+    def test_3(self) -> None:
+        plan = _plan(tmux_sql, select="words")
+        self.assertIn("USING INDEX words_lword (lword>? AND lword<?)", plan)
+
+    def test_4(self) -> None:
+        plan = _plan(treesitter_sql, select="words")
+        self.assertIn("USING INDEX words_lword (lword>? AND lword<?)", plan)
+
+    def test_5(self) -> None:
+        plan = _plan(snippets_sql, select="snippets")
+        self.assertIn("USING INDEX matches_lmatch (lmatch>? AND lmatch<?)", plan)
+
+
+def _select(conn: Connection) -> Sequence[str]:
+    return tuple(row["word"] for row in conn.execute("SELECT word FROM words"))
+
+
+class Concurrent(TestCase):
+    def _writer(self, uri: str) -> Connection:
+        conn = Connection(uri, uri=True, isolation_level=None)
+        init_db(conn)
+        conn.executescript(buffers_sql("create", "pragma"))
+        conn.executescript(buffers_sql("create", "tables"))
+        conn.execute(
+            "INSERT INTO words (word, lword, lmask, llen) VALUES ('a', 'a', 0, 1)"
+        )
+        return conn
+
+    def _readers(self, db: str) -> None:
+        writer, reader = db_uris(db)
+        conn = self._writer(writer)
+        readers = Readers(reader)
+
+        async def cont() -> Sequence[str]:
+            return await wait_for(readers.run(_select), timeout=5)
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT INTO words (word, lword, lmask, llen) VALUES ('b', 'b', 0, 1)"
+            )
+            self.assertIn("a", run(cont()))
+        finally:
+            conn.execute("COMMIT")
+        self.assertEqual(sorted(run(cont())), ["a", "b"])
+
+    def test_1(self) -> None:
+        self._readers(":memory:")
+
+    def test_2(self) -> None:
+        with TemporaryDirectory() as tmp:
+            writer, _ = db_uris(f"{tmp}/db.sqlite3")
+            conn = Connection(writer, uri=True, isolation_level=None)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.close()
+            self._readers(f"{tmp}/db.sqlite3")
+
+
+_FOREVER = """
+WITH RECURSIVE c(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM c)
+SELECT COUNT(*) FROM c
+"""
+
+_MANY = """
+WITH RECURSIVE c(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM c LIMIT 200000)
+INSERT INTO t SELECT n FROM c
+"""
+
+
+class Cancel(TestCase):
+    def test_1(self) -> None:
+        ex = SingleThreadExecutor()
+        conn = ex.submit(Connection, ":memory:", check_same_thread=False)
+
+        async def cont() -> None:
+            with self.assertRaises(TimeoutError):
+                await wait_for(
+                    cancellable(ex, lambda: conn, lambda c: c.execute(_FOREVER)),
+                    timeout=0.1,
+                )
+            one = await wait_for(
+                cancellable(ex, lambda: conn, lambda c: c.execute("SELECT 1")),
+                timeout=5,
+            )
+            self.assertEqual(one.fetchone(), (1,))
+
+        run(cont())
+
+    def test_2(self) -> None:
+        ex = SingleThreadExecutor()
+        conn = ex.submit(Connection, ":memory:", isolation_level=None)
+        ex.submit(conn.execute, "CREATE TABLE t (n INTEGER)")
+
+        async def cont() -> None:
+            write = ex.run(conn.execute, _MANY)
+            read = create_task(
+                cancellable(ex, lambda: conn, lambda c: c.execute(_FOREVER))
+            )
+            await sleep(0)
+            read.cancel()
+            await write
+            count = await ex.run(
+                lambda: conn.execute("SELECT COUNT(*) FROM t").fetchone()
+            )
+            self.assertEqual(count, (200000,))
+
+        run(cont())